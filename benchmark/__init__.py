@@ -0,0 +1,7 @@
+"""
+Měření výkonu scraperu bez přístupu na volby.cz.
+Stránky ps3, ps32 a ps311 se generují ze souboru karvina.json
+(viz 'benchmark.stranky'), takže měření lze kdykoliv zopakovat
+se stejnými daty. Celé běhy scraperu proti nim měří
+'benchmark.propustnost' s přehrávacím serverem 'benchmark.server'.
+"""
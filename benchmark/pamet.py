@@ -0,0 +1,84 @@
+"""
+Porovnání paměti výsledků v seznamu slovníků a v 'main.TabulkaVysledku'.
+
+Spuštění z kořenového adresáře projektu:
+    python -m benchmark.pamet [--okresy 77] [--obce 81]
+
+Řádky obcí vzniknou z výsledků okresu Karviná (viz
+'benchmark.stranky') a stejně jako po parsování stránek má každý
+řádek vlastní řetězce s názvy stran. Výchozí počet okresů a obcí
+odpovídá velikosti celé republiky. Paměť se měří modulem
+'tracemalloc' jako velikost objektů, které zůstanou po sestavení.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import main
+from benchmark.stranky import nacti_radky
+
+
+def radky_voleb(pocet_okresu: int, obci_v_okrese: int):
+    """
+    Generuje výstupní řádky celých voleb se sloupcem 'Okres'.
+    Řádek se pokaždé znovu načte z JSON, takže názvy stran nejsou
+    sdílené mezi řádky (jako u řádků z 'main.sestav_radek').
+    """
+    vzory = [
+        json.dumps(radek, ensure_ascii=False) for radek in nacti_radky()
+    ]
+    for o in range(pocet_okresu):
+        okres = f"Okres {o + 1}"
+        for i in range(obci_v_okrese):
+            radek = {main.SLOUPEC_OKRES: okres}
+            radek.update(json.loads(vzory[i % len(vzory)]))
+            radek['Číslo obce'] = str(500000 + o * obci_v_okrese + i)
+            yield radek
+
+
+def zmer(vytvor) -> tuple:
+    """
+    Zavolá 'vytvor' a vrátí vytvořený objekt, obsazenou paměť
+    v MB a dobu sestavení v sekundách.
+    """
+    gc.collect()
+    tracemalloc.start()
+    zacatek = time.perf_counter()
+    objekt = vytvor()
+    doba = time.perf_counter() - zacatek
+    velikost, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objekt, velikost / 1024 / 1024, doba
+
+
+def main_benchmark() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--okresy', type=int, default=77)
+    parser.add_argument('--obce', type=int, default=81)
+    argumenty = parser.parse_args()
+
+    seznam, pamet_seznamu, doba_seznamu = zmer(
+        lambda: list(radky_voleb(argumenty.okresy, argumenty.obce))
+    )
+    tabulka, pamet_tabulky, doba_tabulky = zmer(
+        lambda: main.TabulkaVysledku(
+            radky_voleb(argumenty.okresy, argumenty.obce)
+        )
+    )
+    assert list(tabulka) == seznam
+
+    print(f"Obcí: {len(tabulka)}, stran: {len(tabulka.strany)}")
+    print(f"{'úložiště':<18} {'paměť MB':>9} {'sestavení s':>12}")
+    for nazev, pamet, doba in (
+        ('seznam slovníků', pamet_seznamu, doba_seznamu),
+        ('TabulkaVysledku', pamet_tabulky, doba_tabulky)
+    ):
+        print(f"{nazev:<18} {pamet:>9.2f} {doba:>12.2f}")
+    print(f"Úspora paměti: {pamet_seznamu / pamet_tabulky:.1f}×")
+
+
+if __name__ == '__main__':
+    main_benchmark()
@@ -0,0 +1,72 @@
+"""
+Porovnání HTML parserů pro 'parsuj_data_obce' na stránkách
+obcí okresu Karviná (viz 'benchmark.stranky').
+
+Spuštění z kořenového adresáře projektu:
+    python -m benchmark.parsery [--opakovani N]
+
+Pro každý dostupný parser (včetně jednoprůchodového extraktoru)
+ověří výsledek a vypíše průměrnou dobu parsování jedné stránky. Řádek 'html.parser (str)' odpovídá původnímu
+postupu, kdy se parsoval již dekódovaný 'response.text'.
+"""
+
+import argparse
+import logging
+import time
+
+import main
+from benchmark.stranky import ZAKLADNI_SLOUPCE, nacti_radky, stranka_obce
+
+
+def zmer(funkce, stranky: list, opakovani: int) -> float:
+    """Vrátí průměrnou dobu jednoho volání 'funkce' v milisekundách."""
+    zacatek = time.perf_counter()
+    for _ in range(opakovani):
+        for stranka in stranky:
+            funkce(stranka)
+    return (time.perf_counter() - zacatek) / (opakovani * len(stranky)) * 1000
+
+
+def over(data: main.ObecData, radek: dict) -> None:
+    """Ověří, že parser vrátil stejná data, ze kterých stránka vznikla."""
+    strany = {
+        k: v for k, v in radek.items() if k not in ZAKLADNI_SLOUPCE
+    }
+    assert data['obec'] == radek['Název obce']
+    assert data['volici'] == radek['Voliči']
+    assert data['platne_hlasy'] == radek['Platné hlasy']
+    assert {s['strana']: s['hlasy'] for s in data['strany']} == strany
+
+
+def main_benchmark() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--opakovani', type=int, default=20)
+    argumenty = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    radky = nacti_radky()
+    stranky = [stranka_obce(radek) for radek in radky]
+
+    varianty = [
+        ('html.parser (str)', lambda b: main.parsuj_data_obce(
+            b.decode('utf-8'), main.PARSER_HTML
+        ))
+    ]
+    for nazev in main.PODPOROVANE_PARSERY:
+        if nazev == main.PARSER_LXML and main.lxml is None:
+            print(f"{nazev:<22} není nainstalován, přeskakuji")
+            continue
+        varianty.append((
+            f"{nazev} (bytes)",
+            lambda b, nazev=nazev: main.parsuj_data_obce(b, nazev, 'utf-8')
+        ))
+
+    print(f"Stránek: {len(stranky)}, opakování: {argumenty.opakovani}")
+    for nazev, funkce in varianty:
+        for stranka, radek in zip(stranky, radky):
+            over(funkce(stranka), radek)
+        print(f"{nazev:<22} {zmer(funkce, stranky, argumenty.opakovani):8.3f} ms/stránka")
+
+
+if __name__ == '__main__':
+    main_benchmark()
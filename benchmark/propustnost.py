@@ -0,0 +1,210 @@
+"""
+Měření propustnosti celého běhu scraperu proti lokálnímu
+přehrávacímu serveru (viz 'benchmark.server').
+
+Spuštění z kořenového adresáře projektu:
+    python -m benchmark.propustnost [--sady karvina kraj]
+                                    [--workers 1 8 32]
+                                    [--engine requests asyncio]
+                                    [--latence MS] [--rozptyl MS]
+                                    [--chybovost P] [--okrsky]
+
+Každá kombinace sady, enginu a počtu vláken běží v samostatném
+procesu, který spustí 'main.zpracuj_data' od začátku do konce
+(včetně zápisu výstupu), s '--okrsky' v režimu okrsků. Vypíše se
+počet obcí za sekundu, latence stránek (p50/p95/p99), spotřebovaný
+čas CPU a nejvyšší obsazená paměť (RSS) měřeného procesu.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import main
+from benchmark.server import SADY, ReplayServer
+
+KOREN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def mer_latenci(funkce, latence: list):
+    """Obalí stahovací funkci tak, aby ukládala dobu každého volání."""
+    def obalena(*args, **kwargs):
+        zacatek = time.perf_counter()
+        try:
+            return funkce(*args, **kwargs)
+        finally:
+            latence.append(time.perf_counter() - zacatek)
+    return obalena
+
+
+def mer_latenci_async(funkce, latence: list):
+    """Asynchronní obdoba 'mer_latenci'."""
+    async def obalena(*args, **kwargs):
+        zacatek = time.perf_counter()
+        try:
+            return await funkce(*args, **kwargs)
+        finally:
+            latence.append(time.perf_counter() - zacatek)
+    return obalena
+
+
+def cas_cpu() -> float:
+    """Čas CPU tohoto procesu a jeho potomků (pool parserů) v sekundách."""
+    ja = resource.getrusage(resource.RUSAGE_SELF)
+    potomci = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return ja.ru_utime + ja.ru_stime + potomci.ru_utime + potomci.ru_stime
+
+
+def jeden_beh(url: str, argumenty_scraperu: list) -> dict:
+    """
+    Spustí jeden celý běh scraperu v tomto procesu a vrátí
+    naměřené hodnoty. Výstup scraperu se zahodí.
+    """
+    logging.disable(logging.WARNING)
+    latence = []
+    main.stahni_data = mer_latenci(main.stahni_data, latence)
+    main.stahni_data_async = mer_latenci_async(
+        main.stahni_data_async, latence
+    )
+    statistiky = {}
+    puvodni_vypis = main.vypis_statistiky
+    main.vypis_statistiky = lambda stats, *args: (
+        statistiky.update(stats), puvodni_vypis(stats, *args)
+    )
+
+    with tempfile.TemporaryDirectory() as adresar:
+        sys.argv = [
+            'main.py', url, os.path.join(adresar, 'vysledky.csv')
+        ] + argumenty_scraperu
+        cpu = cas_cpu()
+        zacatek = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                main.zpracuj_data()
+            except SystemExit:
+                # Běh s chybami končí kódem 1, počet chyb je ve výsledku
+                pass
+        doba = time.perf_counter() - zacatek
+        cpu = cas_cpu() - cpu
+
+    kvantily = statistics.quantiles(latence, n=100) if len(latence) > 1 \
+        else [latence[0] if latence else 0.0] * 99
+    obce = statistiky.get('zpracovane_obce', 0)
+    return {
+        'obce': obce,
+        'chyby': statistiky.get('chyby', 0),
+        'doba_s': doba,
+        'obce_za_s': obce / doba if doba else 0.0,
+        'p50_ms': kvantily[49] * 1000,
+        'p95_ms': kvantily[94] * 1000,
+        'p99_ms': kvantily[98] * 1000,
+        'cpu_s': cpu,
+        # ru_maxrss je v Linuxu v kilobajtech
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def spust_v_procesu(url: str, argumenty_scraperu: list) -> dict:
+    """
+    Spustí 'jeden_beh' v novém procesu, aby se čas CPU a paměť
+    měřily jen pro daný běh a nezapočítával se do nich server.
+    """
+    vysledek = subprocess.run(
+        [
+            sys.executable, '-m', 'benchmark.propustnost',
+            '--beh', url, '--'
+        ] + argumenty_scraperu,
+        cwd=KOREN, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, check=True
+    )
+    return json.loads(vysledek.stdout.strip().splitlines()[-1])
+
+
+def main_benchmark() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--sady', nargs='+', choices=SADY, default=['karvina', 'kraj']
+    )
+    parser.add_argument(
+        '--workers', nargs='+', type=int, default=[1, 8, 32]
+    )
+    parser.add_argument(
+        '--engine', nargs='+', default=[main.ENGINE_REQUESTS]
+        + ([main.ENGINE_ASYNCIO] if main.aiohttp else []),
+        choices=(main.ENGINE_REQUESTS, main.ENGINE_ASYNCIO)
+    )
+    parser.add_argument('--latence', type=float, default=20, metavar='MS')
+    parser.add_argument('--rozptyl', type=float, default=10, metavar='MS')
+    parser.add_argument('--chybovost', type=float, default=0, metavar='P')
+    parser.add_argument(
+        '--okrsky', action='store_true',
+        help="spustit scraper v režimu okrsků (sada 'okrsky')"
+    )
+    parser.add_argument(
+        '--json', metavar='SOUBOR', help="uložit výsledky také do JSON"
+    )
+    parser.add_argument('--beh', help=argparse.SUPPRESS)
+    parser.add_argument('argumenty', nargs='*', help=argparse.SUPPRESS)
+    argumenty = parser.parse_args()
+
+    if argumenty.beh:
+        # Podřízený proces: jeden běh, výsledek jako JSON na stdout
+        print(json.dumps(jeden_beh(argumenty.beh, argumenty.argumenty)))
+        return
+
+    print(
+        f"Latence {argumenty.latence:g} ± {argumenty.rozptyl:g} ms, "
+        f"chybovost {argumenty.chybovost:g}"
+    )
+    print(
+        f"{'sada':<10} {'engine':<8} {'vlákna':>6} {'obcí':>6} "
+        f"{'obce/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} "
+        f"{'CPU s':>6} {'RSS MB':>7} {'chyby':>5}"
+    )
+    vysledky = []
+    for sada in argumenty.sady:
+        stranky, vstup = SADY[sada]
+        with ReplayServer(
+            stranky(), argumenty.latence, argumenty.rozptyl,
+            argumenty.chybovost
+        ) as server:
+            for engine in argumenty.engine:
+                for workers in argumenty.workers:
+                    vysledek = spust_v_procesu(
+                        server.url(vstup),
+                        ['--engine', engine, '--workers', str(workers)]
+                        + (['--okrsky'] if argumenty.okrsky else [])
+                    )
+                    vysledek.update(
+                        sada=sada, engine=engine, workers=workers
+                    )
+                    vysledky.append(vysledek)
+                    print(
+                        f"{sada:<10} {engine:<8} {workers:>6} "
+                        f"{vysledek['obce']:>6} "
+                        f"{vysledek['obce_za_s']:>8.1f} "
+                        f"{vysledek['p50_ms']:>7.1f} "
+                        f"{vysledek['p95_ms']:>7.1f} "
+                        f"{vysledek['p99_ms']:>7.1f} "
+                        f"{vysledek['cpu_s']:>6.2f} "
+                        f"{vysledek['rss_mb']:>7.1f} "
+                        f"{vysledek['chyby']:>5}",
+                        flush=True
+                    )
+
+    if argumenty.json:
+        with open(argumenty.json, 'w', encoding='utf-8') as f:
+            json.dump(vysledky, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main_benchmark()
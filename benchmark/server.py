@@ -0,0 +1,202 @@
+"""
+Lokální HTTP server, který přehrává stránky volby.cz
+(viz 'benchmark.stranky') s nastavitelnou latencí, rozptylem
+a podílem chybových odpovědí.
+
+Samostatné spuštění z kořenového adresáře projektu:
+    python -m benchmark.server [--sada karvina] [--port 8000]
+                               [--latence MS] [--rozptyl MS]
+                               [--chybovost P]
+
+Stránky se servírují pod cestou '/volby.cz/pls/ps2017nss/', aby
+adresa prošla kontrolou domény ve 'validuj_url'.
+"""
+
+import argparse
+import hashlib
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmark.stranky import stranky_karvine, stranky_voleb
+
+PREFIX = '/volby.cz/pls/ps2017nss/'
+
+# Sady stránek: název -> (funkce vracející stránky, vstupní stránka)
+SADY = {
+    'karvina': (stranky_karvine, 'ps32?xjazyk=CZ&xkraj=14&xnumnuts=8103'),
+    'kraj': (lambda: stranky_voleb(6, 50), 'ps3?xjazyk=CZ'),
+    'republika': (lambda: stranky_voleb(77, 81), 'ps3?xjazyk=CZ'),
+    'okrsky': (lambda: stranky_voleb(6, 50, okrsky=True), 'ps3?xjazyk=CZ'),
+}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Výchozí fronta 5 spojení by při desítkách souběžných
+    # připojení zahazovala SYN a klient by čekal 1 s na opakování
+    request_queue_size = 128
+
+
+class ReplayServer:
+    """
+    Přehrávací server běžící ve vlákně na náhodném volném portu.
+    Každá odpověď se zpozdí o 'latence' ± 'rozptyl' milisekund
+    a s pravděpodobností 'chybovost' server místo stránky vrátí
+    503 (s hlavičkou Retry-After, je-li zadána). S 'etag' posílá
+    ke každé stránce hlavičku ETag a na podmíněný požadavek
+    (If-None-Match) odpoví 304 bez obsahu, jinak se chová jako
+    volby.cz u stránek obcí a validátory neposílá. Server podporuje
+    keep-alive (HTTP/1.1) a počítá odeslané odpovědi, chyby
+    a odpovědi 304.
+
+    Example:
+        >>> with ReplayServer(stranky_karvine(), latence=20) as server:
+        ...     url = server.url('ps32?xjazyk=CZ&xkraj=14&xnumnuts=8103')
+    """
+
+    def __init__(
+        self,
+        stranky: dict,
+        latence: float = 0,
+        rozptyl: float = 0,
+        chybovost: float = 0,
+        retry_after: float = None,
+        port: int = 0,
+        seed: int = None,
+        etag: bool = False
+    ) -> None:
+        self.stranky = {PREFIX + url: obsah for url, obsah in stranky.items()}
+        self.latence = latence
+        self.rozptyl = rozptyl
+        self.chybovost = chybovost
+        self.retry_after = retry_after
+        self.etag = etag
+        self.pozadavky = 0
+        self.chyby = 0
+        self.nezmeneno = 0
+        self._nahoda = random.Random(seed)
+        self._zamek = threading.Lock()
+        self._server = _Server(('127.0.0.1', port), self._handler())
+        self._vlakno = None
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self) -> None:
+                super().setup()
+                # Hlavička a tělo jdou zvlášť, bez TCP_NODELAY by
+                # odpověď zdržel Nagleův algoritmus (~40 ms)
+                self.connection.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+                )
+
+            def do_GET(self) -> None:
+                server._odpovez(self, telo=True)
+
+            def do_HEAD(self) -> None:
+                server._odpovez(self, telo=False)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+    def _odpovez(self, handler: BaseHTTPRequestHandler, telo: bool) -> None:
+        with self._zamek:
+            self.pozadavky += 1
+            zpozdeni = self.latence + self._nahoda.uniform(
+                -self.rozptyl, self.rozptyl
+            )
+            chyba = self._nahoda.random() < self.chybovost
+            if chyba:
+                self.chyby += 1
+        if zpozdeni > 0:
+            time.sleep(zpozdeni / 1000)
+
+        obsah = self.stranky.get(handler.path)
+        if chyba or obsah is None:
+            handler.send_response(503 if chyba else 404)
+            if chyba and self.retry_after is not None:
+                handler.send_header('Retry-After', str(self.retry_after))
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+
+        if self.etag:
+            znacka = '"' + hashlib.sha256(obsah).hexdigest()[:16] + '"'
+            if handler.headers.get('If-None-Match') == znacka:
+                with self._zamek:
+                    self.nezmeneno += 1
+                handler.send_response(304)
+                handler.send_header('ETag', znacka)
+                handler.send_header('Content-Length', '0')
+                handler.end_headers()
+                return
+
+        handler.send_response(200)
+        if self.etag:
+            handler.send_header('ETag', znacka)
+        handler.send_header('Content-Type', 'text/html; charset=UTF-8')
+        handler.send_header('Content-Length', str(len(obsah)))
+        handler.end_headers()
+        if telo:
+            try:
+                handler.wfile.write(obsah)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Klient to vzdal (např. vypršel jeho časový limit)
+
+    def url(self, relativni: str) -> str:
+        """Vrátí úplnou adresu stránky na tomto serveru."""
+        return (
+            f"http://127.0.0.1:{self._server.server_port}{PREFIX}{relativni}"
+        )
+
+    def spust(self) -> "ReplayServer":
+        """Spustí server ve vlákně na pozadí."""
+        self._vlakno = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._vlakno.start()
+        return self
+
+    def zastav(self) -> None:
+        """Zastaví server a uvolní port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.spust()
+
+    def __exit__(self, *_) -> None:
+        self.zastav()
+
+
+def main_server() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sada', choices=SADY, default='karvina')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latence', type=float, default=0, metavar='MS')
+    parser.add_argument('--rozptyl', type=float, default=0, metavar='MS')
+    parser.add_argument('--chybovost', type=float, default=0, metavar='P')
+    argumenty = parser.parse_args()
+
+    stranky, vstup = SADY[argumenty.sada]
+    server = ReplayServer(
+        stranky(), argumenty.latence, argumenty.rozptyl,
+        argumenty.chybovost, port=argumenty.port
+    )
+    print(f"Přehrávám sadu '{argumenty.sada}': {server.url(vstup)}")
+    try:
+        server.spust()._vlakno.join()
+    except KeyboardInterrupt:
+        server.zastav()
+
+
+if __name__ == '__main__':
+    main_server()
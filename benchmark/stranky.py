@@ -0,0 +1,395 @@
+"""
+Generátor stránek ve tvaru volby.cz z uložených výsledků.
+Z řádků ve formátu výstupu scraperu (např. karvina.json) sestaví
+přehled voleb (ps3), stránku okresu (ps32), výsledky okresu (ps33),
+stránky obcí (ps311) a jejich okrsků (výběr okrsků ps34 a stránky
+okrsků ps311) se stejnou strukturou tabulek, jakou čte 'main.py'.
+Parsováním vygenerovaných stránek tak vzniknou opět stejné řádky.
+"""
+
+import json
+import os
+from html import escape
+
+ZAKLADNI_SLOUPCE = (
+    'Číslo obce', 'Název obce', 'Voliči', 'Vydané obálky', 'Platné hlasy'
+)
+
+KARVINA_JSON = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'karvina.json'
+)
+
+# Parametry okresu Karviná v URL volby.cz
+KARVINA_KRAJ = 14
+KARVINA_NUTS = '8103'
+KARVINA_KOD = 'CZ0803'
+
+# Obec se dělí na okrsky po zhruba tolika voličích
+VOLICU_V_OKRSKU = 1000
+
+
+def nacti_radky(cesta: str = KARVINA_JSON) -> list:
+    """Načte výstupní řádky scraperu ze souboru JSON."""
+    with open(cesta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def formatuj_cislo(cislo: int) -> str:
+    """Naformátuje číslo jako volby.cz (tisíce odděluje '\\xa0')."""
+    return f"{cislo:,}".replace(',', '\xa0')
+
+
+def url_obce(cislo_obce: str, kraj: int, nuts: str) -> str:
+    """Relativní odkaz na stránku obce (ps311) (relativní k adresáři voleb)."""
+    return (
+        f"ps311?xjazyk=CZ&xkraj={kraj}&xobec={cislo_obce}&xvyber={nuts}"
+    )
+
+
+def url_okrsku(cislo_obce: str, okrsek: int, kraj: int, nuts: str) -> str:
+    """Relativní odkaz na stránku okrsku (ps311 s parametrem 'xokrsek')."""
+    return (
+        f"ps311?xjazyk=CZ&xkraj={kraj}&xobec={cislo_obce}"
+        f"&xokrsek={okrsek}&xvyber={nuts}"
+    )
+
+
+def url_vyberu_okrsku(cislo_obce: str, kraj: int, nuts: str) -> str:
+    """Relativní odkaz na výběr okrsků obce (ps34)."""
+    return f"ps34?xjazyk=CZ&xkraj={kraj}&xobec={cislo_obce}&xvyber={nuts}"
+
+
+def rozdel_na_okrsky(radek: dict) -> list:
+    """
+    Rozdělí řádek obce na okrsky po zhruba 'VOLICU_V_OKRSKU'
+    voličích. Všechna čísla se rozdělí rovnoměrně (zbytek dostanou
+    první okrsky), takže součet okrsků dává opět řádek obce.
+    """
+    pocet = max(1, radek['Voliči'] // VOLICU_V_OKRSKU)
+    okrsky = []
+    for i in range(pocet):
+        okrsek = {}
+        for sloupec, hodnota in radek.items():
+            if isinstance(hodnota, int):
+                hodnota = hodnota // pocet + (i < hodnota % pocet)
+            okrsek[sloupec] = hodnota
+        okrsky.append(okrsek)
+    return okrsky
+
+
+def odkaz_vyberu_okrsku(radek: dict, kraj: int, nuts: str) -> str:
+    """
+    Odkaz 'Výběr okrsku' na stránce okresu: u obce s jediným
+    okrskem přímo na okrsek, jinak na výběr okrsků (ps34).
+    """
+    if radek['Voliči'] // VOLICU_V_OKRSKU > 1:
+        return url_vyberu_okrsku(radek['Číslo obce'], kraj, nuts)
+    return url_okrsku(radek['Číslo obce'], 1, kraj, nuts)
+
+
+def url_okresu(kraj: int, nuts: str) -> str:
+    """Relativní odkaz na stránku okresu (ps32) (relativní k adresáři voleb)."""
+    return f"ps32?xjazyk=CZ&xkraj={kraj}&xnumnuts={nuts}"
+
+
+def url_vysledku_okresu(kraj: int, nuts: str) -> str:
+    """Relativní odkaz na výsledky okresu (ps33) (relativní k adresáři voleb)."""
+    return f"ps33?xjazyk=CZ&xkraj={kraj}&xnumnuts={nuts}"
+
+
+def url_prehledu() -> str:
+    """Relativní odkaz na přehled voleb za celou republiku (ps3)."""
+    return "ps3?xjazyk=CZ"
+
+
+def formatuj_procenta(hodnota: float) -> str:
+    """Naformátuje procenta s desetinnou čárkou ('61,68')."""
+    return f"{hodnota:.2f}".replace('.', ',')
+
+
+def _stranka(obsah: str) -> bytes:
+    return (
+        '<!DOCTYPE html>\n<html lang="cs">\n<head>\n'
+        '<meta charset="UTF-8">\n<title>Volby.cz</title>\n</head>\n'
+        '<body>\n<div id="publikace">\n'
+        '<h2>Volby do Poslanecké sněmovny Parlamentu České republiky'
+        '</h2>\n' + obsah + '</div>\n</body>\n</html>\n'
+    ).encode('utf-8')
+
+
+def stranka_okresu(
+    radky: list, nazev_okresu: str, kraj: int, nuts: str
+) -> bytes:
+    """
+    Sestaví stránku okresu (ps32) s odkazy na všechny obce.
+    Obce jsou jako na volby.cz rozděleny do tří tabulek.
+    """
+    tabulky = []
+    tretina = max(1, -(-len(radky) // 3))
+    for t in range(0, len(radky), tretina):
+        casti = [
+            f'<table class="table" id="ps32_t{t // tretina + 1}">\n'
+            '<tr><th id="t1sa1" colspan="2">Obec</th>'
+            '<th id="t1sa2" rowspan="2">Výběr okrsku</th></tr>\n'
+            '<tr><th id="t1sb1">číslo</th><th id="t1sb2">název</th></tr>\n'
+        ]
+        for radek in radky[t:t + tretina]:
+            odkaz = escape(
+                url_obce(radek['Číslo obce'], kraj, nuts), quote=True
+            )
+            vyber = escape(
+                odkaz_vyberu_okrsku(radek, kraj, nuts), quote=True
+            )
+            casti.append(
+                '<tr><td class="cislo" headers="t1sa1 t1sb1">'
+                f'<a href="{odkaz}">{radek["Číslo obce"]}</a></td>'
+                '<td class="overflow_name" headers="t1sa1 t1sb2">'
+                f'{escape(radek["Název obce"])}</td>'
+                f'<td class="center" headers="t1sa2"><a href="{vyber}">X'
+                '</a></td></tr>\n'
+            )
+        casti.append('</table>\n')
+        tabulky.append(''.join(casti))
+    return _stranka(
+        f'<h3>Okres: {escape(nazev_okresu)}</h3>\n' + ''.join(tabulky)
+    )
+
+
+def stranka_prehledu(okresy: list) -> bytes:
+    """
+    Sestaví přehled voleb (ps3) s tabulkou okresů pro každý kraj.
+    'okresy' je seznam čtveřic (kód, název okresu, kraj, nuts).
+    """
+    kraje = {}
+    for kod, nazev, kraj, nuts in okresy:
+        kraje.setdefault(kraj, []).append((kod, nazev, nuts))
+
+    tabulky = []
+    for kraj, okresy_kraje in kraje.items():
+        casti = [
+            f'<table class="table" id="ps3_t{kraj}">\n'
+            f'<tr><th id="t{kraj}sa1" colspan="2">Okres</th>'
+            f'<th id="t{kraj}sa2" rowspan="2">Výběr obce</th>'
+            f'<th id="t{kraj}sa3" rowspan="2">Výsledky</th></tr>\n'
+            f'<tr><th id="t{kraj}sb1">kód</th>'
+            f'<th id="t{kraj}sb2">název</th></tr>\n'
+        ]
+        for kod, nazev, nuts in okresy_kraje:
+            odkaz = escape(url_okresu(kraj, nuts), quote=True)
+            casti.append(
+                f'<tr><td class="cislo" headers="t{kraj}sa1 t{kraj}sb1">'
+                f'{kod}</td>'
+                f'<td headers="t{kraj}sa1 t{kraj}sb2">{escape(nazev)}</td>'
+                f'<td class="center" headers="t{kraj}sa2">'
+                f'<a href="{odkaz}">X</a></td>'
+                f'<td class="center" headers="t{kraj}sa3">'
+                f'<a href="{escape(url_vysledku_okresu(kraj, nuts))}">X'
+                '</a></td></tr>\n'
+            )
+        casti.append('</table>\n')
+        tabulky.append(''.join(casti))
+    return _stranka(''.join(tabulky))
+
+
+def _tabulky_vysledku(radek: dict) -> str:
+    """
+    Sestaví hlavičkovou tabulku (voliči, obálky, platné hlasy)
+    a dvě tabulky stran, společné stránkám obce i výsledků okresu.
+    """
+    volici = radek['Voliči']
+    obalky = radek['Vydané obálky']
+    platne = radek['Platné hlasy']
+    ucast = obalky / volici * 100 if volici else 0
+    hlavicka = (
+        '<table class="table" id="ps311_t1">\n'
+        '<tr><th id="sa1" rowspan="2">Okrsky</th>'
+        '<th id="sa2" rowspan="2">Voliči v seznamu</th>'
+        '<th id="sa3" rowspan="2">Vydané obálky</th>'
+        '<th id="sa4" rowspan="2">Volební účast v %</th>'
+        '<th id="sa5" rowspan="2">Odevzdané obálky</th>'
+        '<th id="sa6" rowspan="2">Platné hlasy</th>'
+        '<th id="sa7" rowspan="2">% platných hlasů</th></tr>\n'
+        '<tr></tr>\n'
+        '<tr><td class="cislo" headers="sa1">1</td>'
+        f'<td class="cislo" headers="sa2">{formatuj_cislo(volici)}</td>'
+        f'<td class="cislo" headers="sa3">{formatuj_cislo(obalky)}</td>'
+        f'<td class="cislo" headers="sa4">{formatuj_procenta(ucast)}</td>'
+        f'<td class="cislo" headers="sa5">{formatuj_cislo(obalky)}</td>'
+        f'<td class="cislo" headers="sa6">{formatuj_cislo(platne)}</td>'
+        '<td class="cislo" headers="sa7">99,00</td></tr>\n'
+        '</table>\n'
+    )
+
+    strany = [
+        (nazev, hlasy) for nazev, hlasy in radek.items()
+        if nazev not in ZAKLADNI_SLOUPCE
+    ]
+    polovina = -(-len(strany) // 2)
+    tabulky = []
+    for t, cast in enumerate((strany[:polovina], strany[polovina:]), 1):
+        radky = [
+            f'<div class="t2_470"><table class="table">\n'
+            f'<tr><th id="t{t}sa1" colspan="2">Strana</th>'
+            f'<th id="t{t}sa2" colspan="2">Platné hlasy</th></tr>\n'
+            f'<tr><th id="t{t}sb1">číslo</th><th id="t{t}sb2">název</th>'
+            f'<th id="t{t}sb3">celkem</th><th id="t{t}sb4">v %</th></tr>\n'
+        ]
+        for poradi, (nazev, hlasy) in enumerate(
+            cast, 1 + (polovina if t == 2 else 0)
+        ):
+            podil = hlasy / platne * 100 if platne else 0
+            radky.append(
+                f'<tr><td class="cislo" headers="t{t}sa1 t{t}sb1">'
+                f'{poradi}</td>'
+                f'<td class="overflow_name" headers="t{t}sa1 t{t}sb2">'
+                f'{escape(nazev)}</td>'
+                f'<td class="cislo" headers="t{t}sa2 t{t}sb3">'
+                f'{formatuj_cislo(hlasy)}</td>'
+                f'<td class="cislo" headers="t{t}sa2 t{t}sb4">'
+                f'{formatuj_procenta(podil)}</td></tr>\n'
+            )
+        if t == 2 and len(cast) < polovina:
+            # Prázdný řádek, kterým volby.cz doplňuje kratší tabulku
+            radky.append(
+                '<tr><td class="cislo">-</td>'
+                '<td class="overflow_name">-</td>'
+                '<td class="cislo">-</td><td class="cislo">-</td></tr>\n'
+            )
+        radky.append('</table></div>\n')
+        tabulky.append(''.join(radky))
+    return hlavicka + ''.join(tabulky)
+
+
+def stranka_obce(
+    radek: dict, nazev_okresu: str = 'Karviná', okrsek: int = None
+) -> bytes:
+    """Sestaví stránku obce (ps311), s 'okrsek' stránku okrsku."""
+    return _stranka(
+        '<h3>Kraj: Moravskoslezský kraj</h3>\n'
+        f'<h3>Okres: {escape(nazev_okresu)}</h3>\n'
+        f'<h3>Obec: {escape(radek["Název obce"])}</h3>\n'
+        + (f'<h3>Okrsek: {okrsek}</h3>\n' if okrsek is not None else '')
+        + _tabulky_vysledku(radek)
+    )
+
+
+def stranky_okrsku(
+    radek: dict, nazev_okresu: str, kraj: int, nuts: str
+) -> dict:
+    """
+    Vrátí stránky okrsků obce {relativní URL: obsah v bajtech}:
+    stránku každého okrsku a u obce s více okrsky i výběr
+    okrsků (ps34) s odkazy na ně.
+    """
+    cislo_obce = radek['Číslo obce']
+    okrsky = rozdel_na_okrsky(radek)
+    stranky = {
+        url_okrsku(cislo_obce, i, kraj, nuts): stranka_obce(
+            okrsek, nazev_okresu, i
+        )
+        for i, okrsek in enumerate(okrsky, 1)
+    }
+    if len(okrsky) > 1:
+        bunky = ''.join(
+            '<td class="cislo" headers="s1">'
+            f'<a href="{escape(url, quote=True)}">{i}</a></td>'
+            for i, url in enumerate(stranky, 1)
+        )
+        stranky[url_vyberu_okrsku(cislo_obce, kraj, nuts)] = _stranka(
+            f'<h3>Okres: {escape(nazev_okresu)}</h3>\n'
+            f'<h3>Obec: {escape(radek["Název obce"])}</h3>\n'
+            '<table class="table">\n<tr><th id="s1" colspan="10">'
+            'Okrsek</th></tr>\n'
+            f'<tr>{bunky}</tr>\n</table>\n'
+        )
+    return stranky
+
+
+def stranka_vysledku_okresu(radky: list, nazev_okresu: str) -> bytes:
+    """
+    Sestaví výsledky okresu (ps33) jako součet řádků všech obcí
+    okresu, se stejnými tabulkami jako stránka obce.
+    """
+    soucet = {}
+    for radek in radky:
+        for sloupec, hodnota in radek.items():
+            if sloupec not in ('Číslo obce', 'Název obce'):
+                soucet[sloupec] = soucet.get(sloupec, 0) + hodnota
+    return _stranka(
+        '<h3>Kraj: Moravskoslezský kraj</h3>\n'
+        f'<h3>Okres: {escape(nazev_okresu)}</h3>\n'
+        + _tabulky_vysledku(soucet)
+    )
+
+
+def stranky_karvine() -> dict:
+    """
+    Vrátí všechny stránky okresu Karviná včetně okrsků jako
+    slovník {relativní URL: obsah v bajtech}. Přehled voleb (ps3)
+    obsahuje jediný okres, Karvinou.
+    """
+    radky = nacti_radky()
+    stranky = {
+        url_prehledu(): stranka_prehledu(
+            [(KARVINA_KOD, 'Karviná', KARVINA_KRAJ, KARVINA_NUTS)]
+        ),
+        url_okresu(KARVINA_KRAJ, KARVINA_NUTS): stranka_okresu(
+            radky, 'Karviná', KARVINA_KRAJ, KARVINA_NUTS
+        ),
+        url_vysledku_okresu(KARVINA_KRAJ, KARVINA_NUTS):
+            stranka_vysledku_okresu(radky, 'Karviná')
+    }
+    for radek in radky:
+        stranky[url_obce(radek['Číslo obce'], KARVINA_KRAJ, KARVINA_NUTS)] = (
+            stranka_obce(radek)
+        )
+        stranky.update(
+            stranky_okrsku(radek, 'Karviná', KARVINA_KRAJ, KARVINA_NUTS)
+        )
+    return stranky
+
+
+def stranky_voleb(
+    pocet_okresu: int, obci_v_okrese: int, okrsky: bool = False
+) -> dict:
+    """
+    Vrátí syntetickou sadu stránek celých voleb jako slovník
+    {relativní URL: obsah v bajtech}: přehled (ps3) s 'pocet_okresu'
+    okresy rozdělenými do 14 krajů, stránky a výsledky okresů
+    a v každém okrese
+    'obci_v_okrese' obcí. Obce opakují výsledky obcí Karviné,
+    mají však vlastní čísla a názvy. Např. 77 okresů po 81 obcích
+    odpovídá velikosti celé republiky. S 'okrsky' obsahuje sada
+    i stránky okrsků všech obcí (zhruba desetkrát více stránek).
+    """
+    vzory = nacti_radky()
+    okresy = []
+    stranky = {}
+    for o in range(pocet_okresu):
+        kraj = o % 14 + 1
+        nuts = f"{8000 + o}"
+        nazev_okresu = f"Okres {o + 1}"
+        okresy.append((f"CZ{nuts}", nazev_okresu, kraj, nuts))
+        radky = []
+        for i in range(obci_v_okrese):
+            vzor = vzory[i % len(vzory)]
+            radek = dict(vzor)
+            radek['Číslo obce'] = str(500000 + o * obci_v_okrese + i)
+            radek['Název obce'] = f"{vzor['Název obce']} {o + 1}-{i + 1}"
+            radky.append(radek)
+            stranky[url_obce(radek['Číslo obce'], kraj, nuts)] = (
+                stranka_obce(radek, nazev_okresu)
+            )
+            if okrsky:
+                stranky.update(
+                    stranky_okrsku(radek, nazev_okresu, kraj, nuts)
+                )
+        stranky[url_okresu(kraj, nuts)] = stranka_okresu(
+            radky, nazev_okresu, kraj, nuts
+        )
+        stranky[url_vysledku_okresu(kraj, nuts)] = (
+            stranka_vysledku_okresu(radky, nazev_okresu)
+        )
+    stranky[url_prehledu()] = stranka_prehledu(okresy)
+    return stranky
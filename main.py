@@ -6,38 +6,195 @@ discord: lenka_34840
 """
 
 # Standardní knihovny
+import argparse
+import asyncio
+import contextlib
 import csv
+import gzip
+import hashlib
 import json
 import logging
 import os
+import random
+import sqlite3
 import sys
+import tempfile
+import threading
 import time
-import xml.etree.ElementTree as ET
+import zipfile
+from urllib.parse import parse_qs, urljoin, urlparse
+from array import array
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from html.parser import HTMLParser
+from itertools import islice
 from logging.handlers import RotatingFileHandler
-from typing import List, TypedDict
+from xml.sax.saxutils import escape, quoteattr
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Tuple, TypedDict, Union
+)
 
 # Knihovny třetích stran
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, UnicodeDammit
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout
 from tqdm import tqdm
 from colorama import Fore, init
 
+# Volitelné knihovny
+try:
+    import aiohttp  # Asynchronní engine (--engine asyncio)
+except ImportError:
+    aiohttp = None
+
+try:
+    import lxml  # Rychlý HTML parser napsaný v C (--parser lxml)
+except ImportError:
+    lxml = None
+
+try:
+    import numpy as np  # Souhrnné statistiky výsledků (--stats)
+except ImportError:
+    np = None
+
+try:
+    import orjson  # Rychlá serializace JSON napsaná v Rustu
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard  # Komprese výstupu zstd (přípona .zst)
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa  # Výstup do formátů Parquet a Arrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pa = None
+
 # Inicializace colorama
 init(autoreset=True)
 
-BASE_URL = "https://www.volby.cz/pls/ps2017nss/"
+# Stránky volby.cz: přehled voleb za celou republiku a okres
+STRANKA_PREHLEDU = 'ps3'
+STRANKA_OKRESU = 'ps32'
+# Zveřejněné výsledky okresu (součty za všechny obce okresu)
+STRANKA_VYSLEDKU_OKRESU = 'ps33'
+
+# Nadpisy stránek s názvem obce (ps311) a okresu (ps33)
+NADPIS_OBCE = 'Obec:'
+NADPIS_OKRESU = 'Okres:'
+
+# Kraje podle parametru 'xkraj' v URL volby.cz
+KRAJE = {
+    '1': 'Hlavní město Praha',
+    '2': 'Středočeský kraj',
+    '3': 'Jihočeský kraj',
+    '4': 'Plzeňský kraj',
+    '5': 'Karlovarský kraj',
+    '6': 'Ústecký kraj',
+    '7': 'Liberecký kraj',
+    '8': 'Královéhradecký kraj',
+    '9': 'Pardubický kraj',
+    '10': 'Kraj Vysočina',
+    '11': 'Jihomoravský kraj',
+    '12': 'Olomoucký kraj',
+    '13': 'Zlínský kraj',
+    '14': 'Moravskoslezský kraj'
+}
+
+# Výchozí počet vláken pro souběžné stahování obcí
+VYCHOZI_POCET_VLAKEN = 1
+
+# Společná pravidla pro všechny HTTP požadavky
+VYCHOZI_MAX_POKUSU = 3
+VYCHOZI_TIMEOUT = 10  # sekundy
+
+# Čekání před opakováním požadavku (exponenciálně rostoucí)
+VYCHOZI_CEKANI = 0.5  # sekundy, čekání po prvním neúspěchu
+MAX_CEKANI = 30  # sekundy
+# Nejnižší rychlost, na kterou omezovač zpomalí (požadavků za sekundu)
+MIN_RYCHLOST = 0.2
+# Jedno zpomalení nesníží rychlost pod tento podíl výchozí rychlosti
+SPODNI_MEZ_RYCHLOSTI = 0.25
+# Výchozí rychlost omezovače na jeden souběžný požadavek (požadavků/s)
+RYCHLOST_NA_VLAKNO = 5.0
+# HTTP kódy, po kterých má smysl požadavek zopakovat
+OPAKOVATELNE_KODY = (408, 429, 500, 502, 503, 504)
+# HTTP kódy, kterými server žádá o zpomalení
+KODY_PRETIZENI = (429, 503)
+
+# Výchozí maximální velikost diskové mezipaměti (--cache-max-mb)
+VYCHOZI_VELIKOST_CACHE_MB = 500
+
+# Žurnál dokončených obcí pro pokračování přerušeného běhu
+PRIPONA_ZURNALU = '.zurnal'
+
+# Změny obcí v jednotlivých cyklech sledování (--watch)
+PRIPONA_ZMEN = '.zmeny.jsonl'
+
+# Počet stran a obcí vypsaných v souhrnu statistik výsledků
+POCET_V_SOUHRNU = 5
+
+# Způsoby stahování obcí (--engine)
+ENGINE_REQUESTS = 'requests'
+ENGINE_ASYNCIO = 'asyncio'
+
+# HTML parsery (--parser): jednoprůchodový extraktor stránek obcí
+# nebo stromový parser pro BeautifulSoup
+PARSER_EXTRAKTOR = 'extraktor'
+PARSER_HTML = 'html.parser'
+PARSER_LXML = 'lxml'
+PODPOROVANE_PARSERY = (PARSER_EXTRAKTOR, PARSER_HTML, PARSER_LXML)
+VYCHOZI_PARSER = PARSER_EXTRAKTOR
 
 SEPARATOR = "=" * 79
 
+# Sloupec s názvem okresu (jen při zpracování celých voleb)
+SLOUPEC_OKRES = 'Okres'
+
+# Sloupec s číslem okrsku (jen v režimu '--okrsky')
+SLOUPEC_OKRSEK = 'Okrsek'
+
+# Pevné sloupce výstupu, za nimi následují sloupce stran
+ZAKLADNI_SLOUPCE = [
+    'Číslo obce',
+    'Název obce',
+    'Voliči',
+    'Vydané obálky',
+    'Platné hlasy'
+]
+
+# Všechny sloupce, které nejsou hlasy stran
+POPISNE_SLOUPCE = frozenset(ZAKLADNI_SLOUPCE + [SLOUPEC_OKRES, SLOUPEC_OKRSEK])
+
 class Okrsek(TypedDict):
     url: str
     cislo_obce: str
     nazev_obce: str
+    vyber_okrsku: str  # Odkaz 'Výběr okrsku' ze stránky okresu
+
+class OkrsekOkresu(Okrsek):
+    okres: str
+
+class OkrsekObce(Okrsek):
+    okrsek: str  # Číslo okrsku v obci (režim '--okrsky')
+
+class Okres(TypedDict):
+    url: str
+    nazev: str
 
 class Strana(TypedDict):
     strana: str
     hlasy: int
+    cislo: int  # Číslo strany na hlasovacím lístku
+    id: int  # ID strany v registru běhu (viz 'RegistrStran')
 
 class ObecData(TypedDict):
     obec: str
@@ -87,13 +244,29 @@ MSG_CRITICAL = """
 MSG_ERROR_ARGUMENTS_COUNT = """
     ❌ CHYBA PŘI SPUŠTĚNÍ:
     Očekávám dva argumenty: URL okresu a název výstupního souboru.
+    Detail chyby: {error_detail}
     
     Správné použití:
-    python {script_name} <URL_okresu> <vystupni_soubor.csv/json/xml>
+    python {script_name} <URL_okresu/voleb> <vystupni_soubor>
+                         [--workers N] [--engine requests/asyncio]
+                         [--cache ADRESAR]
+                         [--cache-ttl SEKUNDY / --refresh]
+                         [--cache-max-mb MB]
+                         [--parser extraktor/html.parser/lxml]
+                         [--resume] [--parse-workers N] [--okrsky]
+                         [--max-rate N]
+                         [--record ARCHIV / --replay ARCHIV]
+                         [--compact] [--stats SOUBOR]
+                         [--souhrny SOUBOR]
+                         [--watch SEKUNDY]
     
     Příklad:
     python volby_scraper.py "https://www.volby.cz/..." "vysledky.csv"
 """
+MSG_ERROR_PYARROW_MISSING = """
+    ❌ Pro formát {format_typ} je potřeba nainstalovat knihovnu 'pyarrow':
+        pip install pyarrow
+"""
 MSG_ERROR_REQUEST_FAILED = """
     ❌ CHYBA PŘI ZÍSKÁVÁNÍ SEZNAMU OBCÍ:
     Nepodařilo se stáhnout data ze stránky: {url}
@@ -116,7 +289,9 @@ MSG_ERROR_UNEXPECTED = """
 """
 MSG_ERROR_UNSUPPORTED_FORMAT = """
     ❌ Nepodporovaný formát souboru: {format_typ}. Zkontroluj příponu.
-    Podporované formáty: 📋.csv, 📝.json, 🔤.xml
+    Podporované formáty: 📋.csv, 📝.json, 📝.jsonl, 📝.ndjson, 🔤.xml,
+    📦.parquet, 📦.arrow, 🗄️.sqlite, 🗄️.db
+    Textové formáty lze komprimovat: .csv.gz, .json.zst, ...
 """
 MSG_ERROR_URL_VALIDATION = """
     ❌ CHYBA PŘI VALIDACI URL:
@@ -128,21 +303,55 @@ MSG_ERROR_URL_VALIDATION = """
         -> obsahuje 'volby.cz' a
         -> je správná pro dané volby.
 """
+MSG_ERROR_ZSTANDARD_MISSING = """
+    ❌ Pro kompresi zstd (.zst) je potřeba nainstalovat knihovnu 'zstandard':
+        pip install zstandard
+"""
 
 MSG_INFO_COUNT_OBCE = "    🔄 Celkový počet obcí ke zpracování: {total}"
+MSG_INFO_COUNT_OKRESY = "    🗺️ Nalezeno okresů: {total}"
+MSG_INFO_COUNT_OKRSKY = "    🏘️ Nalezeno okrsků: {total} v {obce} obcích"
 MSG_INFO_GETTING_LIST = "    📋 Získávám seznam obcí z adresy..."
+MSG_INFO_KONTROLA_SOUHRNU = """
+    🔎 Kontrola souhrnů: {shoda} z {celkem} okresů odpovídá zveřejněným \
+výsledkům okresů.
+"""
 MSG_INFO_PROCESSING_DATA = """    
     🔄 Zpracovávám volební data pro jednotlivé obce..."""
 MSG_INFO_PROCESSING_OBCE = """
 Zpracovávám obec {cislo}/{total}: {obec_nazev} (Číslo: {obec_cislo})
 """
+MSG_INFO_RESUME = """
+    ♻️ Pokračuji v přerušeném běhu: {pocet} obcí převzato ze žurnálu '{soubor}'.
+"""
+MSG_INFO_RESUME_HINT = """
+    ♻️ Zpracované obce jsou uloženy v žurnálu '{soubor}'.
+    Pro dokončení spusť program se stejnými argumenty a přepínačem --resume.
+"""
 MSG_INFO_SAVING = """
     💾 Ukládám výsledky do souboru '{filename}' ve formátu {format}...
 """
 MSG_INFO_SUCCESS_SAVE = """
     ✅ HOTOVO! Výsledky byly úspěšně uloženy do '{filename}'.
 """
+MSG_INFO_SUCCESS_SOUHRNY = """
+    🧮 Souhrny za okresy, kraje a celý stát byly uloženy do '{filename}'.
+"""
+MSG_INFO_SUCCESS_STATS = """
+    📊 Statistiky výsledků byly uloženy do '{filename}'.
+"""
 MSG_INFO_VALIDATION = "    🔍 Probíhá validace URL: {url}"
+MSG_INFO_WATCH_CYCLE = """\
+    🔁 Cyklus {cyklus} ({cas}): změněno {stranky} stránek a {zmenene} obcí \
+z {celkem}, chyb {chyby}, {doba:.1f} s"""
+MSG_INFO_WATCH_START = """
+    👀 Sleduji změny výsledků každých {interval:g} s (ukončení Ctrl+C).
+    Výstup '{soubor}' se přepíše po každé změně,
+    změny obcí se připisují do '{zmeny}'.
+"""
+MSG_INFO_WATCH_STOPPED = """
+    ⏹️ Sledování ukončeno po {cykly} cyklech.
+"""
 
 MSG_STATISTICS = """
     📊 Souhrn zpracování:
@@ -153,8 +362,47 @@ MSG_STATISTICS = """
        Celkový počet voličů: {volici:,}
        Celkový počet platných hlasů: {hlasy:,}
        Průměrná volební účast: {ucast:.2f}%
+       Síťová spojení: {nova_spojeni} nových, \
+{znovupouzita_spojeni} znovu použitých
+"""
+MSG_STATISTICS_CACHE = """\
+       Mezipaměť: {zasahy} zásahů ({revalidace} ověřeno na serveru), \
+{minuti} minutí
+"""
+MSG_STATISTICS_ARCHIV_RECORD = """\
+       Archiv stránek: {pocet} stránek zaznamenáno
+"""
+MSG_STATISTICS_ARCHIV_REPLAY = """\
+       Archiv stránek: {pocet} stránek přehráno bez přístupu k síti
+"""
+MSG_STATISTICS_OMEZOVAC = """\
+       Omezení rychlosti: {zpomaleni}× zpomaleno serverem, \
+čekání {cekani:.1f} s
+"""
+MSG_STATISTICS_VYSLEDKY = """
+       Volební účast v obcích: min {ucast_min:.2f}%, medián \
+{ucast_median:.2f}%, max {ucast_max:.2f}%
+       Volební účast vážená počtem voličů: {ucast_vazena:.2f}%
+       Obálky bez platného hlasu: {neplatne:,} ({neplatne_podil:.2f}% \
+vydaných obálek)
+       Největší obec: {nejvetsi} ({nejvetsi_volici:,} voličů)
+       Nejmenší obec: {nejmensi} ({nejmensi_volici:,} voličů)
+       Strany s nejvíce hlasy:
+{strany}
+"""
+MSG_STATISTICS_VYSLEDKY_STRANA = """\
+         {poradi}. {nazev}: {hlasy:,} ({podil:.2f}%)"""
+MSG_STATISTICS_WATCH = """\
+       Sledování: {cykly} cyklů, {zmeny} změn obcí
+"""
+MSG_STATISTICS_ZURNAL = """\
+       Převzato ze žurnálu: {pocet} obcí
 """
 
+MSG_WARNING_KONTROLA_SOUHRNU = """
+    ⚠️ VAROVÁNÍ: Souhrn okresu '{okres}' se liší od zveřejněných výsledků.
+    Rozdíly [spočteno, zveřejněno]: {rozdily}
+"""
 MSG_WARNING_NO_DATA_FOUND = """
     ⚠️ VAROVÁNÍ: Nebyly nalezeny žádné obce ke zpracování!
     Zkontroluj prosím zadanou URL adresu: {url}
@@ -163,6 +411,13 @@ MSG_WARNING_NO_DATA_SAVE = """
     ⚠️ VAROVÁNÍ:
     Nebyla nalezena žádná data k uložení. Soubor nebude vytvořen.
 """
+MSG_WARNING_RESUME_NO_JOURNAL = """
+    ⚠️ VAROVÁNÍ: Žurnál '{soubor}' nebyl nalezen, zpracuji všechny obce.
+"""
+MSG_WARNING_RESUME_OTHER_URL = """
+    ⚠️ VAROVÁNÍ: Žurnál '{soubor}' patří k jiné URL ({url}).
+    Nebude použit, zpracuji všechny obce.
+"""
 MSG_WARNING_PROCESSING_ERROR = """
     ⚠️ VAROVÁNÍ:
     Chyba při stahování dat pro obec '{obec_nazev}' ({obec_cislo}).
@@ -188,12 +443,25 @@ Data pro obec {obec_nazev} ({obec_cislo}) úspěšně zpracována.
 """
 LOG_DEBUG_SKIP_ROW = "Přeskakuji nevalidní řádek: '{strana}' – '{hlasy}'"
 
-LOG_ERROR_ARGUMENTS_COUNT = "Nesprávný počet argumentů."
+LOG_ERROR_ARGUMENTS_COUNT = "Nesprávné argumenty: {error_detail}"
+LOG_ERROR_ARCHIV = "soubor '{soubor}' není archiv stránek (ZIP)"
+LOG_ERROR_WATCH = """
+--watch nelze kombinovat s --resume, --record, --replay, --okrsky \
+ani --engine asyncio"""
+LOG_ERROR_AIOHTTP_MISSING = """
+pro --engine asyncio je potřeba nainstalovat knihovnu 'aiohttp'"""
+LOG_ERROR_LXML_MISSING = """
+pro --parser lxml je potřeba nainstalovat knihovnu 'lxml'"""
+LOG_ERROR_NUMPY_MISSING = """
+pro --stats je potřeba nainstalovat knihovnu 'numpy'"""
 LOG_ERROR_BEGIN = "URL musí začínat 'http://' nebo 'https://'"
 LOG_ERROR_DATA_FAILED = """
 Zpracování dat selhalo kvůli nenalezeným obcím: {error_detail}"""
 LOG_ERROR_DOMENA = "URL musí být z domény volby.cz"
 LOG_ERROR_GETTING_LIST = "Chyba při získávání seznamu obcí: {error_detail}"
+LOG_ERROR_NEUPLNE_VYSLEDKY = """
+Výsledky jsou neúplné, počet chyb: {chyby}. Chybějící obce doplní --resume."""
+LOG_ERROR_NOT_IN_ARCHIVE = "Stránka '{url}' není v archivu '{soubor}'"
 LOG_ERROR_NO_DATA_FOUND = """
 Varování: Nebyl nalezen žádný odkaz na obce na adrese '{url}'.
 """
@@ -201,6 +469,8 @@ LOG_ERROR_PARSING_DATA = "Chyba v datech pro danou obec: {error_detail}"
 LOG_ERROR_PARSING_ERROR = """
 Chyba při parsování dat pro obec {obec_nazev} ({obec_cislo}): {error_detail}
 """
+LOG_ERROR_PYARROW_MISSING = """
+Pro formát {format_typ} chybí knihovna 'pyarrow'"""
 LOG_ERROR_ROK = "URL musí obsahovat rok voleb: {rok}"
 LOG_ERROR_REQUEST = "Chyba při {operation}: {error_detail}"
 LOG_ERROR_REQUEST_FAILED = """
@@ -225,30 +495,68 @@ LOG_ERROR_UNSUPPORTED_FORMAT_FAILED = """
 Ukládání souboru selhalo kvůli nepodporovaném formátu souboru {error_detail}.
 """
 LOG_ERROR_URL_VALIDATION = "Neplatná URL '{url}': {error_detail} "
+LOG_ERROR_ZSTANDARD_MISSING = """
+Pro kompresi zstd (.zst) chybí knihovna 'zstandard'"""
 
 LOG_INFO_COUNT_OBCE = "Úspěšně získán seznam {count} obcí."
+LOG_INFO_COUNT_OKRESY = "Na přehledu voleb '{url}' nalezeno {count} okresů."
+LOG_INFO_COUNT_OKRSKY = "V {obce} obcích nalezeno {count} okrsků."
 LOG_INFO_GETTING_OBCE = "Zahajuji získávání seznamu obcí z URL: {url}"
+LOG_INFO_KONTROLA_SOUHRNU = """
+Kontrola souhrnů: {shoda} z {celkem} okresů odpovídá zveřejněným výsledkům."""
 LOG_INFO_OBCE_PROCESSED = "Zpracování dat pro obce dokončeno."
-LOG_INFO_PROCESSING_OBCE = "Zahajuji zpracování dat pro jednotlivé obce."
+LOG_INFO_PROCESSING_OBCE = """
+Zahajuji zpracování dat pro jednotlivé obce (počet vláken: {workers})."""
+LOG_INFO_PROCESSING_OBCE_ASYNC = """
+Zahajuji asynchronní zpracování dat pro jednotlivé obce
+(souběžných požadavků: {workers})."""
 LOG_INFO_PROCESSING_FINISHED = "Zpracování dat pro obce dokončeno."
+LOG_INFO_RESUME = "Ze žurnálu '{soubor}' obnoveno {pocet} obcí."
 LOG_INFO_PROGRAM_EXIT = """
 Program bude ukončen s kódem {exit_code} kvůli kritické chybě.
 """
 LOG_INFO_SAVE_SUCCESS = "Výsledky úspěšně uloženy do souboru '{filename}'."
+LOG_INFO_SOUHRNY_SUCCESS = "Souhrny za územní celky uloženy do souboru '{filename}'."
+LOG_INFO_STATS_SUCCESS = "Statistiky výsledků uloženy do souboru '{filename}'."
 LOG_INFO_SAVING = """
 Zahahuji ukládání výsledků do souboru '{filename}' ve formátu {format}.
 """
 LOG_INFO_URL_VALIDATED = "URL '{url}' úspěšně validována."
+LOG_INFO_WATCH_CYCLE = """
+Cyklus sledování {cyklus}: změněno {stranky} stránek a {zmenene} obcí, \
+chyb {chyby}."""
 
 LOG_RAISE_NO_DATA_FOUND = """
 Na adrese '{url}' nebyly nalezeny žádné odkazy na obce."""
+LOG_RAISE_NO_OKRESY_FOUND = """
+Na adrese '{url}' nebyly nalezeny žádné odkazy na okresy."""
+LOG_RAISE_NO_OKRSKY_FOUND = """
+Ve výběru okrsků nebyly nalezeny žádné odkazy na okrsky."""
 
 LOG_WARNING_NO_DATA_TO_SAVE = """
 Nebyla nalezena žádná data k uložení do souboru '{filename}'
 """
+LOG_WARNING_JOURNAL_TRUNCATED = """
+Žurnál '{soubor}' končí neúplným záznamem (bajt {pozice}), bude zkrácen."""
+LOG_WARNING_KONTROLA_OKRESU = """
+Zveřejněné výsledky okresu '{okres}' ({url}) nelze zkontrolovat: {error_detail}"""
+LOG_WARNING_KONTROLA_SOUHRNU = """
+Souhrn okresu '{okres}' se liší od zveřejněných výsledků: {rozdily}"""
+LOG_WARNING_OKRES_VOLEB = """
+Obce okresu '{okres}' ({url}) nelze načíst, okres bude přeskočen: \
+{error_detail}"""
+LOG_WARNING_OKRSKY_OBCE = """
+Okrsky obce {obec_nazev} ({obec_cislo}) nelze zjistit, obec bude \
+přeskočena: {error_detail}"""
 LOG_WARNING_POKUSY = """
 Chyba při {operation}: {error_detail} (pokus {current}/{max})
 """
+LOG_WARNING_WATCH_OBEC = """
+Obec {obec_nazev} ({obec_cislo}) se v cyklu {cyklus} nepodařilo \
+zkontrolovat: {error_detail}"""
+LOG_WARNING_ZPOMALENI = """
+Server žádá o zpomalení, pauza {pauza:.1f} s, nová rychlost \
+{rychlost:.2f} požadavků/s."""
 LOG_WARNING_VALUE_HLASY = """
 Neplatné číslo hlasů '{hlasy}' pro stranu '{strana}' - přeskočeno
 """
@@ -322,7 +630,747 @@ def nastav_logovani(
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
     
-def validuj_url(url: str, rok_voleb: str = None) -> None:
+class DiskovaCache:
+    """
+    Trvalá mezipaměť stažených stránek na disku, klíčovaná podle URL.
+    Ke každé stránce ukládá obsah (bajty) a metadata: hlavičky
+    ETag a Last-Modified, kódování a čas uložení. Zveřejněné
+    výsledky voleb se nemění, a proto se bez 'ttl' uložený záznam
+    použije vždy bez dotazu na server (volby.cz u stránek obcí
+    ETag ani Last-Modified neposílá, takže by je ani nešlo ověřit).
+    Se zadaným 'ttl' se bez dotazu použije jen záznam mladší než
+    'ttl', starší záznam se ověří podmíněným GET požadavkem
+    (If-None-Match, If-Modified-Since), na který server odpoví 304
+    bez obsahu, nebo se bez těchto hlaviček stáhne znovu.
+    Překročí-li velikost mezipaměti limit, odstraní se nejdéle
+    nepoužité záznamy (LRU). Pořadí použití se ukládá do času
+    změny souboru, takže přežije i další spuštění programu.
+    Instanci lze bezpečně sdílet mezi vlákny.
+
+    Args:
+        adresar (str): Adresář mezipaměti (vytvoří se, pokud neexistuje).
+        max_velikost (int, optional): Maximální velikost obsahu
+                                      v bajtech. Výchozí je 500 MB.
+        ttl (float, optional): Počet sekund, po které se záznam
+                               nerevaliduje, 0 ověří každý záznam
+                               ('--refresh'). Pokud není zadán,
+                               záznamy se neověřují nikdy.
+
+    Example:
+        >>> cache = DiskovaCache('.cache', ttl=86400)
+        >>> with StahovaciSession(8, cache=cache) as session:
+        ...     response = stahni_data(url, session=session)
+        >>> cache.statistiky()
+            {'cache_zasahy': 0, 'cache_minuti': 1, 'cache_revalidace': 0}
+    """
+
+    def __init__(
+        self,
+        adresar: str,
+        max_velikost: int = VYCHOZI_VELIKOST_CACHE_MB * 1024 * 1024,
+        ttl: float = None
+    ) -> None:
+        self.adresar = adresar
+        self.max_velikost = max_velikost
+        self.ttl = ttl
+        self._zamek = threading.Lock()
+        self._stats = {
+            'cache_zasahy': 0, 'cache_minuti': 0, 'cache_revalidace': 0
+        }
+        os.makedirs(adresar, exist_ok=True)
+
+        # Index záznamů seřazený od nejdéle nepoužitého
+        zaznamy = []
+        for nazev in os.listdir(adresar):
+            if nazev.endswith('.html'):
+                cesta = os.path.join(adresar, nazev)
+                info = os.stat(cesta)
+                zaznamy.append((info.st_mtime, nazev[:-5], info.st_size))
+        self._index = OrderedDict(
+            (klic, velikost) for _, klic, velikost in sorted(zaznamy)
+        )
+        self._velikost = sum(self._index.values())
+
+    def _cesta(self, klic: str, pripona: str) -> str:
+        return os.path.join(self.adresar, klic + pripona)
+
+    @staticmethod
+    def _klic(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _zapis(self, cesta: str, data: bytes) -> None:
+        # Atomický zápis: dočasný soubor a přejmenování
+        fd, docasny = tempfile.mkstemp(dir=self.adresar, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(docasny, cesta)
+
+    def nacti(self, url: str) -> dict:
+        """
+        Načte záznam pro URL adresu a označí ho jako naposledy použitý.
+
+        Args:
+            url (str): URL adresa stránky.
+
+        Returns:
+            dict: Metadata záznamu doplněná o klíč 'obsah' (bytes),
+                  nebo None, pokud záznam neexistuje.
+        """
+        klic = self._klic(url)
+        with self._zamek:
+            if klic not in self._index:
+                return None
+            self._index.move_to_end(klic)
+        try:
+            with open(self._cesta(klic, '.json'), encoding='utf-8') as f:
+                zaznam = json.load(f)
+            with open(self._cesta(klic, '.html'), 'rb') as f:
+                zaznam['obsah'] = f.read()
+            os.utime(self._cesta(klic, '.html'))
+        except (OSError, ValueError):
+            return None  # Poškozený nebo právě odstraněný záznam
+        return zaznam
+
+    def je_cerstvy(self, zaznam: dict) -> bool:
+        """Vrátí True, pokud záznam není starší než 'ttl'."""
+        return (
+            self.ttl is None
+            or time.time() - zaznam['ulozeno'] < self.ttl
+        )
+
+    @staticmethod
+    def podminene_hlavicky(zaznam: dict) -> dict:
+        """
+        Sestaví hlavičky podmíněného GET požadavku pro daný záznam.
+
+        Args:
+            zaznam (dict): Záznam z 'nacti', nebo None.
+
+        Returns:
+            dict: Hlavičky 'If-None-Match' a 'If-Modified-Since',
+                  pokud je záznam obsahuje, jinak prázdný slovník.
+        """
+        hlavicky = {}
+        if zaznam:
+            if zaznam.get('etag'):
+                hlavicky['If-None-Match'] = zaznam['etag']
+            if zaznam.get('last_modified'):
+                hlavicky['If-Modified-Since'] = zaznam['last_modified']
+        return hlavicky
+
+    def uloz(
+        self, url: str, obsah: bytes, hlavicky, kodovani: str
+    ) -> None:
+        """
+        Uloží stažený obsah stránky a odstraní nejdéle nepoužité
+        záznamy, pokud mezipaměť překročí maximální velikost.
+
+        Args:
+            url (str): URL adresa stránky.
+            obsah (bytes): Obsah odpovědi.
+            hlavicky (Mapping): Hlavičky odpovědi.
+            kodovani (str): Kódování obsahu stránky.
+        """
+        klic = self._klic(url)
+        meta = {
+            'url': url,
+            'etag': hlavicky.get('ETag'),
+            'last_modified': hlavicky.get('Last-Modified'),
+            'content_type': hlavicky.get('Content-Type'),
+            'kodovani': kodovani,
+            'ulozeno': time.time()
+        }
+        self._zapis(
+            self._cesta(klic, '.json'),
+            json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        )
+        self._zapis(self._cesta(klic, '.html'), obsah)
+
+        with self._zamek:
+            self._velikost += len(obsah) - self._index.pop(klic, 0)
+            self._index[klic] = len(obsah)
+            odstranit = []
+            while (
+                self._velikost > self.max_velikost
+                and len(self._index) > 1
+            ):
+                stary, velikost = self._index.popitem(last=False)
+                self._velikost -= velikost
+                odstranit.append(stary)
+
+        for stary in odstranit:
+            for pripona in ('.html', '.json'):
+                try:
+                    os.remove(self._cesta(stary, pripona))
+                except OSError:
+                    pass
+
+    def obnov(self, url: str, zaznam: dict, hlavicky) -> None:
+        """
+        Po odpovědi 304 Not Modified posune čas ověření záznamu
+        a převezme případné nové hlavičky ETag a Last-Modified.
+        """
+        zaznam = dict(zaznam)
+        zaznam.pop('obsah', None)
+        zaznam['etag'] = hlavicky.get('ETag') or zaznam.get('etag')
+        zaznam['last_modified'] = (
+            hlavicky.get('Last-Modified') or zaznam.get('last_modified')
+        )
+        zaznam['ulozeno'] = time.time()
+        self._zapis(
+            self._cesta(self._klic(url), '.json'),
+            json.dumps(zaznam, ensure_ascii=False).encode('utf-8')
+        )
+
+    def zapocitej(self, klic: str) -> None:
+        """Zvýší počitadlo statistiky ('cache_zasahy' apod.) o jedna."""
+        with self._zamek:
+            self._stats[klic] += 1
+
+    def statistiky(self) -> dict:
+        """
+        Vrátí počet zásahů, minutí a revalidací (odpovědí 304).
+
+        Returns:
+            dict: Slovník s klíči 'cache_zasahy', 'cache_minuti'
+                  a 'cache_revalidace'.
+        """
+        with self._zamek:
+            return dict(self._stats)
+
+
+class ArchivStranek:
+    """
+    Archiv stažených stránek v jediném komprimovaném souboru ZIP
+    (přepínače '--record' a '--replay'). Každá stránka je jedna
+    položka pojmenovaná podle hashe URL, samotná URL, hlavička
+    Content-Type a kódování jsou uloženy v komentáři položky.
+    Centrální adresář ZIP tak slouží jako index, který se
+    při otevření načte z konce souboru bez čtení obsahu stránek.
+    Při nahrávání 'stahni_data' ukládá každou stránku, kterou
+    vrátí, při přehrávání čte stránky jen z archivu a na síť
+    nepřistupuje vůbec. Nahrávání vždy založí nový archiv,
+    centrální adresář se zapíše až metodou 'zavri'.
+    Instanci lze bezpečně sdílet mezi vlákny.
+
+    Args:
+        soubor (str): Cesta k archivu.
+        prehravani (bool, optional): True otevře existující archiv
+                                     pro přehrávání, False (výchozí)
+                                     založí nový archiv pro nahrávání.
+
+    Example:
+        >>> with ArchivStranek('karvina.zip') as archiv:
+        ...     with StahovaciSession(8, archiv=archiv) as session:
+        ...         response = stahni_data(url, session=session)
+        >>> with ArchivStranek('karvina.zip', prehravani=True) as archiv:
+        ...     with StahovaciSession(8, archiv=archiv) as session:
+        ...         response = stahni_data(url, session=session)
+    """
+
+    def __init__(self, soubor: str, prehravani: bool = False) -> None:
+        self.soubor = soubor
+        self.prehravani = prehravani
+        self._zamek = threading.Lock()
+        self._zip = zipfile.ZipFile(
+            soubor, 'r' if prehravani else 'w',
+            compression=zipfile.ZIP_DEFLATED
+        )
+        self._pocet = 0
+
+        # Index URL -> (položka archivu, metadata)
+        self._index = {}
+        for info in self._zip.infolist():
+            try:
+                meta = json.loads(info.comment.decode('utf-8'))
+            except ValueError:
+                continue  # Položka, kterou nezapsal tento program
+            self._index[meta['url']] = (info, meta)
+
+    def __enter__(self) -> "ArchivStranek":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.zavri()
+
+    def uloz(
+        self, url: str, obsah: bytes, hlavicky, kodovani: str
+    ) -> None:
+        """
+        Uloží stránku do archivu. Stránka, která už v archivu je
+        (např. stažená během běhu podruhé), se neukládá znovu.
+
+        Args:
+            url (str): URL adresa stránky.
+            obsah (bytes): Obsah odpovědi.
+            hlavicky (Mapping): Hlavičky odpovědi.
+            kodovani (str): Kódování obsahu stránky.
+        """
+        meta = {
+            'url': url,
+            'content_type': hlavicky.get('Content-Type'),
+            'kodovani': kodovani
+        }
+        info = zipfile.ZipInfo(
+            DiskovaCache._klic(url) + '.html',
+            date_time=time.localtime()[:6]
+        )
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.comment = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        with self._zamek:
+            if url in self._index:
+                return
+            self._zip.writestr(info, obsah)
+            self._index[url] = (info, meta)
+            self._pocet += 1
+
+    def prehraj(self, url: str) -> dict:
+        """
+        Vrátí stránku z archivu jako záznam ve stejném tvaru,
+        jaký vrací 'DiskovaCache.nacti'.
+
+        Args:
+            url (str): URL adresa stránky.
+
+        Returns:
+            dict: Metadata stránky doplněná o klíč 'obsah' (bytes).
+
+        Raises:
+            requests.exceptions.ConnectionError: Pokud stránka
+                                  v archivu není (při přehrávání
+                                  ji nelze stáhnout ze sítě).
+        """
+        polozka = self._index.get(url)
+        if polozka is None:
+            raise requests.exceptions.ConnectionError(
+                LOG_ERROR_NOT_IN_ARCHIVE.format(url=url, soubor=self.soubor)
+            )
+        info, meta = polozka
+        zaznam = dict(meta)
+        zaznam['obsah'] = self._zip.read(info)
+        with self._zamek:
+            self._pocet += 1
+        return zaznam
+
+    def zavri(self) -> None:
+        """Zapíše centrální adresář (index) a zavře soubor archivu."""
+        with self._zamek:
+            self._zip.close()
+
+    def statistiky(self) -> dict:
+        """
+        Vrátí počet stránek nahraných do archivu, nebo
+        přehraných z archivu.
+
+        Returns:
+            dict: Slovník s klíčem 'archiv_prehrano' při přehrávání,
+                  jinak 'archiv_zaznamenano'.
+        """
+        klic = 'archiv_prehrano' if self.prehravani else 'archiv_zaznamenano'
+        with self._zamek:
+            return {klic: self._pocet}
+
+
+def cekani_pred_opakovanim(pokus: int) -> float:
+    """
+    Vrátí dobu čekání před dalším pokusem: exponenciálně rostoucí
+    s pořadím pokusu ('VYCHOZI_CEKANI' * 2^pokus, nejvýše
+    'MAX_CEKANI') s náhodným rozptylem v horní polovině intervalu,
+    aby souběžně selhané požadavky nezkoušely server ve stejnou chvíli.
+
+    Args:
+        pokus (int): Pořadí neúspěšného pokusu (0-indexováno).
+
+    Returns:
+        float: Doba čekání v sekundách.
+
+    Example:
+        >>> 1.0 <= cekani_pred_opakovanim(1) <= 2.0
+            True
+    """
+    strop = min(MAX_CEKANI, VYCHOZI_CEKANI * 2 ** pokus)
+    return random.uniform(strop / 2, strop)
+
+
+def retry_after(e: Exception) -> float:
+    """
+    Přečte z chybové odpovědi hlavičku Retry-After (počet sekund
+    nebo HTTP datum) a vrátí, kolik sekund má klient počkat.
+    Vrací None, pokud výjimka odpověď nebo hlavičku nenese.
+    """
+    response = getattr(e, 'response', None)
+    if response is None:
+        return None
+    hodnota = response.headers.get('Retry-After')
+    if not hodnota:
+        return None
+    try:
+        return max(0.0, float(hodnota))
+    except ValueError:
+        pass
+    try:
+        datum = parsedate_to_datetime(hodnota)
+        return max(0.0, datum.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def je_pretizeni(e: Exception) -> bool:
+    """Vrátí True, pokud server odpověděl kódem 429 nebo 503."""
+    response = getattr(e, 'response', None)
+    return response is not None and response.status_code in KODY_PRETIZENI
+
+
+class OmezovacRychlosti:
+    """
+    Společný omezovač rychlosti požadavků pro všechna vlákna
+    (token bucket). Každý požadavek si před odesláním vezme token,
+    tokeny přibývají rychlostí 'rychlost' za sekundu až do
+    'kapacita'. Rychlost se přizpůsobuje serveru: odpoví-li 429
+    nebo 503, všechny požadavky se pozastaví na dobu z hlavičky
+    Retry-After (jinak na dobu exponenciálního čekání) a rychlost
+    se sníží na polovinu, nejvýše však na spodní mez (čtvrtinu
+    nejvyšší dosažené rychlosti), takže ani opakované chyby 503
+    provoz nezastaví. Trvalé přetížení pak brzdí pauzy z Retry-After.
+    Úspěšné požadavky rychlost zase zvyšují: až k nejvyšší dosažené
+    rychlosti rychle (zhruba dvojnásobně za sekundu), dál zvolna
+    (asi o 1 požadavek/s za sekundu), nejvýše na zadané maximum.
+    Bez zadané rychlosti omezovač nic nebrzdí, dokud server poprvé
+    nepožádá o zpomalení, a výchozí rychlostí je pak naměřená
+    rychlost posledních požadavků, nejméně však
+    'RYCHLOST_NA_VLAKNO' na každý souběžný požadavek ('soubeznost'),
+    protože na začátku běhu je naměřená rychlost podhodnocená
+    rozjezdem.
+    Instanci lze sdílet mezi vlákny i s asynchronním enginem.
+
+    Args:
+        rychlost (float, optional): Maximální počet požadavků
+                                    za sekundu. Výchozí je bez omezení.
+        kapacita (float, optional): Kolik požadavků smí odejít
+                                    najednou. Výchozí odpovídá jedné
+                                    sekundě při plné rychlosti.
+        soubeznost (int, optional): Počet souběžných požadavků
+                                    ('--workers'), výchozí rychlost
+                                    bez zadaného maxima. Výchozí je 1.
+
+    Example:
+        >>> omezovac = OmezovacRychlosti(rychlost=5)
+        >>> time.sleep(omezovac.rezervuj())
+        >>> omezovac.uspech()
+    """
+
+    def __init__(
+        self,
+        rychlost: float = None,
+        kapacita: float = None,
+        soubeznost: int = 1
+    ) -> None:
+        self.max_rychlost = rychlost
+        self.rychlost = rychlost
+        self.kapacita = kapacita or max(1.0, rychlost or 1.0)
+        # Nejnižší rychlost, ze které začne první zpomalení
+        self._vychozi = rychlost or max(1, soubeznost) * RYCHLOST_NA_VLAKNO
+        self.spodni_mez = max(
+            MIN_RYCHLOST, self._vychozi * SPODNI_MEZ_RYCHLOSTI
+        )
+        # Nejvyšší dosažená rychlost, ke které se omezovač po zpomalení
+        # rychle vrací; zpomalení ji nesnižují
+        self._cil = None
+        self._tokeny = self.kapacita
+        self._doplneno = time.monotonic()
+        self._pauza_do = 0.0
+        self._zpomaleno = float('-inf')
+        self._casy = deque(maxlen=32)
+        self._zamek = threading.Lock()
+        self._stats = {'omezovac_zpomaleni': 0, 'omezovac_cekani': 0.0}
+
+    def _namerena_rychlost(self) -> float:
+        # Rychlost posledních požadavků (na začátku běhu podhodnocená)
+        if len(self._casy) < 2 or self._casy[-1] <= self._casy[0]:
+            return 0.0
+        return (len(self._casy) - 1) / (self._casy[-1] - self._casy[0])
+
+    def _nastav_cil(self, rychlost: float) -> None:
+        # Cíl návratu po zpomalení a z něj odvozená spodní mez
+        self._cil = rychlost
+        self.spodni_mez = max(MIN_RYCHLOST, rychlost * SPODNI_MEZ_RYCHLOSTI)
+
+    def rezervuj(self) -> float:
+        """
+        Vezme token pro jeden požadavek a vrátí, kolik sekund
+        má volající před odesláním počkat (0, pokud může hned).
+        Čekání provede volající ('time.sleep' nebo 'asyncio.sleep').
+        """
+        with self._zamek:
+            ted = time.monotonic()
+            cekani = max(0.0, self._pauza_do - ted)
+            if self.rychlost:
+                self._tokeny = min(
+                    self.kapacita,
+                    self._tokeny + (ted - self._doplneno) * self.rychlost
+                )
+                self._doplneno = ted
+                # Záporný stav tokenů je fronta čekajících požadavků
+                self._tokeny -= 1
+                if self._tokeny < 0:
+                    cekani = max(cekani, -self._tokeny / self.rychlost)
+            self._casy.append(ted + cekani)
+            self._stats['omezovac_cekani'] += cekani
+            return cekani
+
+    def pockej(self) -> None:
+        """Počká na token pro další požadavek (blokuje vlákno)."""
+        cekani = self.rezervuj()
+        if cekani:
+            time.sleep(cekani)
+
+    def uspech(self) -> None:
+        """Po úspěšném požadavku zvýší rychlost (viz třída)."""
+        with self._zamek:
+            if self.rychlost and self.rychlost != self.max_rychlost:
+                if self._cil and self.rychlost < self._cil:
+                    # Návrat k rychlosti před zpomalením: za sekundu
+                    # (asi 'rychlost' úspěchů) se rychlost zdvojnásobí
+                    rychlost = min(
+                        self._cil, self.rychlost * 2 ** (1 / self.rychlost)
+                    )
+                else:
+                    # Aditivní růst: zhruba o 1 požadavek/s každou sekundu
+                    rychlost = self.rychlost + 1 / self.rychlost
+                if self.max_rychlost:
+                    rychlost = min(self.max_rychlost, rychlost)
+                self.rychlost = rychlost
+                if self._cil and rychlost > self._cil:
+                    self._nastav_cil(rychlost)
+
+    def zpomal(self, pauza: float = None, pokus: int = 0) -> None:
+        """
+        Reakce na odpověď 429/503: pozastaví všechny požadavky
+        a sníží rychlost na polovinu, nejníže na 'spodni_mez'.
+        Souběžné odpovědi v jedné sekundě se počítají jako jedno
+        zpomalení.
+
+        Args:
+            pauza (float, optional): Doba z hlavičky Retry-After.
+                                     Pokud chybí, použije se
+                                     'cekani_pred_opakovanim'.
+            pokus (int, optional): Pořadí neúspěšného pokusu.
+        """
+        if pauza is None:
+            pauza = cekani_pred_opakovanim(pokus)
+        with self._zamek:
+            ted = time.monotonic()
+            self._pauza_do = max(self._pauza_do, ted + pauza)
+            if ted - self._zpomaleno < 1.0:
+                return
+            self._zpomaleno = ted
+            if self._cil is None:
+                # První zpomalení: výchozí rychlost určí cíl návratu
+                # i spodní mez, další chyby už je nesnižují
+                self._nastav_cil(self.rychlost or max(
+                    self._vychozi, self._namerena_rychlost()
+                ))
+            puvodni = self.rychlost or self._cil
+            self.rychlost = min(puvodni, max(self.spodni_mez, puvodni / 2))
+            self.kapacita = min(self.kapacita, max(1.0, self.rychlost))
+            self._tokeny = min(self._tokeny, 0.0)
+            self._stats['omezovac_zpomaleni'] += 1
+        logging.warning(
+            LOG_WARNING_ZPOMALENI.format(pauza=pauza, rychlost=self.rychlost)
+        )
+
+    def statistiky(self) -> dict:
+        """
+        Vrátí počet zpomalení serverem a celkové čekání v sekundách.
+
+        Returns:
+            dict: Slovník s klíči 'omezovac_zpomaleni'
+                  a 'omezovac_cekani'.
+        """
+        with self._zamek:
+            return dict(self._stats)
+
+
+def doba_cekani(
+    e: Exception, pokus: int, omezovac: OmezovacRychlosti = None
+) -> float:
+    """
+    Určí, jak dlouho čekat před dalším pokusem po chybě 'e'.
+    Žádá-li server o zpomalení (429/503) a je k dispozici omezovač,
+    pozastaví se přes omezovač všechny požadavky a vrátí se 0
+    (na konec pauzy počká 'OmezovacRychlosti.rezervuj'). Jinak se
+    dodrží Retry-After, nebo se čeká exponenciálně s rozptylem.
+
+    Args:
+        e (Exception): Výjimka posledního pokusu.
+        pokus (int): Pořadí neúspěšného pokusu (0-indexováno).
+        omezovac (OmezovacRychlosti, optional): Společný omezovač.
+
+    Returns:
+        float: Doba čekání v sekundách.
+    """
+    pauza = retry_after(e)
+    if omezovac and je_pretizeni(e):
+        omezovac.zpomal(pauza, pokus)
+        return 0.0
+    if pauza is not None:
+        return min(pauza, MAX_CEKANI)
+    return cekani_pred_opakovanim(pokus)
+
+
+def http_chyba(
+    url: str, status: int, duvod: str, hlavicky: dict
+) -> requests.exceptions.HTTPError:
+    """
+    Sestaví výjimku HTTPError knihovny requests i s odpovědí
+    (kód a hlavičky), aby šlo chyby asynchronního enginu
+    ošetřit stejně jako chyby 'stahni_data' (např. Retry-After).
+    """
+    response = requests.Response()
+    response.status_code = status
+    response.reason = duvod
+    response.url = url
+    response.headers.update(hlavicky)
+    return requests.exceptions.HTTPError(
+        f"{status} {duvod} for url: {url}", response=response
+    )
+
+
+def odpoved_z_cache(zaznam: dict, url: str) -> requests.Response:
+    """
+    Sestaví objekt 'requests.Response' ze záznamu mezipaměti,
+    aby volající nemusel rozlišovat, odkud stránka pochází.
+
+    Args:
+        zaznam (dict): Záznam vrácený metodou 'DiskovaCache.nacti'.
+        url (str): URL adresa stránky.
+
+    Returns:
+        requests.Response: Odpověď se stavem 200 a uloženým obsahem.
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = zaznam['obsah']
+    response.encoding = zaznam.get('kodovani')
+    if zaznam.get('content_type'):
+        response.headers['Content-Type'] = zaznam['content_type']
+    return response
+
+
+def deklarovane_kodovani(content_type: str) -> str:
+    """
+    Vrátí kódování, které server výslovně uvádí v hlavičce
+    Content-Type (parametr 'charset').
+    Na rozdíl od 'requests.Response.encoding' nedoplňuje výchozí
+    ISO-8859-1, takže pokud server kódování neuvede, parser ho
+    převezme z deklarace <meta charset> přímo ve stránce.
+
+    Args:
+        content_type (str): Hodnota hlavičky Content-Type, nebo None.
+
+    Returns:
+        str: Název kódování (např. 'utf-8'), nebo None.
+
+    Example:
+        >>> deklarovane_kodovani('text/html; charset=UTF-8')
+            'UTF-8'
+        >>> deklarovane_kodovani('text/html') is None
+            True
+    """
+    for parametr in (content_type or '').split(';')[1:]:
+        klic, _, hodnota = parametr.strip().partition('=')
+        if klic.strip().lower() == 'charset':
+            return hodnota.strip().strip('"\'') or None
+    return None
+
+
+class StahovaciSession(requests.Session):
+    """
+    Sdílená HTTP session pro všechny požadavky jednoho běhu programu.
+    Session udržuje spojení otevřená (keep-alive), takže každá další
+    stránka z volby.cz nemusí znovu navazovat TCP a TLS spojení.
+    Velikost poolu spojení odpovídá počtu vláken a pro jeden server
+    nikdy neotevře více spojení, než je tento počet (pool_block).
+    Session zároveň počítá nově otevřená a znovu použitá spojení.
+    Volitelně nese diskovou mezipaměť, kterou pak používá
+    'stahni_data' pro všechny GET požadavky, omezovač rychlosti
+    společný všem vláknům a archiv stránek pro nahrávání
+    nebo přehrávání běhu.
+
+    Args:
+        pocet_spojeni (int, optional): Maximální počet spojení
+                                       na jeden server. Výchozí je 1.
+        max_serveru (int, optional): Počet serverů, pro které
+                                     se udržuje vlastní pool spojení.
+                                     Výchozí je 2.
+        cache (DiskovaCache, optional): Disková mezipaměť stránek.
+                                     Výchozí je None (bez mezipaměti).
+        omezovac (OmezovacRychlosti, optional): Omezovač rychlosti
+                                     požadavků (viz 'stahni_data').
+        archiv (ArchivStranek, optional): Archiv, do kterého se
+                                     stránky nahrávají, nebo ze
+                                     kterého se přehrávají.
+
+    Example:
+        >>> with StahovaciSession(pocet_spojeni=8) as session:
+        ...     response = stahni_data(url, session=session)
+        ...     session.statistiky_spojeni()
+            {'nova_spojeni': 1, 'znovupouzita_spojeni': 0}
+    """
+
+    def __init__(
+        self,
+        pocet_spojeni: int = VYCHOZI_POCET_VLAKEN,
+        max_serveru: int = 2,
+        cache: DiskovaCache = None,
+        omezovac: OmezovacRychlosti = None,
+        archiv: ArchivStranek = None
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self.omezovac = omezovac
+        self.archiv = archiv
+        self.headers['Connection'] = 'keep-alive'
+        adapter = HTTPAdapter(
+            pool_connections=max_serveru,
+            pool_maxsize=max(1, pocet_spojeni),
+            pool_block=True
+        )
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+        self._adapter = adapter
+
+    def statistiky_spojeni(self) -> dict:
+        """
+        Vrátí počet nově otevřených a znovu použitých spojení.
+        Údaje čte z poolů knihovny urllib3, které evidují počet
+        vytvořených spojení a počet odeslaných požadavků.
+
+        Returns:
+            dict: Slovník s klíči 'nova_spojeni' a
+                  'znovupouzita_spojeni'.
+        """
+        nova = pozadavky = 0
+        pools = self._adapter.poolmanager.pools
+        for klic in pools.keys():
+            pool = pools.get(klic)
+            if pool is not None:
+                nova += pool.num_connections
+                pozadavky += pool.num_requests
+        return {
+            'nova_spojeni': nova,
+            'znovupouzita_spojeni': max(0, pozadavky - nova)
+        }
+
+
+def validuj_url(
+    url: str,
+    rok_voleb: str = None,
+    session: requests.Session = None,
+    over_dostupnost: bool = True,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU
+) -> None:
     # Vrátí None při úspěchu
     """
     Ověřuje validitu zadané URL adresy a případně kontroluje,
@@ -332,7 +1380,10 @@ def validuj_url(url: str, rok_voleb: str = None) -> None:
     2. zda URL patří doméně 'volby.cz',
     3. pokud je zadán rok voleb, zkontroluje, 
        zda se teto rok v URL nachází,
-    4. ověřuje dostupnost URL provedením HTTP GET požadavku.
+    4. pokud je 'over_dostupnost' True, ověřuje dostupnost URL
+       levným HTTP HEAD požadavkem (bez stahování obsahu stránky)
+       se stejnými pravidly pro opakování a časový limit
+       jako 'stahni_data'.
     Pokud jakákoliv kontrola selže, vyvolá výjimku 'ValidationError'.
 
     Args:
@@ -342,6 +1393,19 @@ def validuj_url(url: str, rok_voleb: str = None) -> None:
                                    v URL (např. 'ps2017', 'ps2021')
                                   Pokud není zadán, kontrola 
                                   na tento rok se přeskočí.
+
+        session(requests.Session, optional): Sdílená session,
+                                  přes kterou se požadavek odešle.
+                                  Pokud není zadána, použije se
+                                  samostatný požadavek.
+
+        over_dostupnost(bool, optional): Pokud je False, síťová
+                                  kontrola se přeskočí. Hodí se,
+                                  když volající stránku hned poté
+                                  stejně stahuje. Výchozí je True.
+
+        max_pokusu(int, optional): Maximální počet pokusů o ověření
+                                  dostupnosti. Výchozí jsou 3 pokusy.
     
     Returns:
         None: Funkce nevrací žádnou hodnotu při úspěchu.
@@ -380,17 +1444,15 @@ def validuj_url(url: str, rok_voleb: str = None) -> None:
             LOG_ERROR_ROK.format(rok=rok_voleb)
         )
     
-    try:
-        # Zkusíme udělat GET request pro ověření dostupnosti
-        response = requests.get(url, timeout=5)
-        # Vrátí chybu (např. 404, 500), jež se zachytí v části except
-        response.raise_for_status()
-    
-    except requests.exceptions.RequestException as e:
-        # Zde je potřeba pouze 1 pokus
-        zpracuj_vyjimku(e, 0, 1, "ověřování URL")
-
-def parsuj_html(content: str) -> BeautifulSoup:
+    if over_dostupnost:
+        # Pro ověření dostupnosti stačí hlavička, obsah nestahujeme
+        stahni_data(url, max_pokusu, session, metoda='HEAD')
+
+def parsuj_html(
+    content: Union[str, bytes],
+    parser: str = PARSER_HTML,
+    kodovani: str = None
+) -> BeautifulSoup:
     """
     Parsuje HTML obsah a vrací objekt BeautifulSoup
     pro snadnou manipulaci a extraci dat.
@@ -399,9 +1461,22 @@ def parsuj_html(content: str) -> BeautifulSoup:
     z HTML dokumentu.
     Tento objekt lze použít k vyhledávání elementů,
     získávání textového obsahu nebo atributů HTML tagů.
+    Obsah lze předat přímo jako bajty ('response.content')
+    spolu s kódováním, které deklaruje server. Odpadá tak
+    odhadování kódování a dekódování celé stránky v 'response.text'.
 
     Args:
-        content(str): HTML obsah stránky ve formě řetězce (string)
+        content(str | bytes): HTML obsah stránky ve formě řetězce
+                              (string) nebo bajtů
+        parser(str, optional): Parser pro BeautifulSoup,
+                              'html.parser' (výchozí, čistý Python)
+                              nebo 'lxml' (rychlejší, napsaný v C).
+                              Hodnota 'extraktor' se týká jen stránek
+                              obcí, ostatní stránky pak parsuje
+                              'html.parser'.
+        kodovani(str, optional): Kódování bajtového obsahu. Pokud
+                              není zadáno, převezme se z deklarace
+                              <meta charset> ve stránce.
     
     Returns:
         BeautifulSoup: Objekt reprezentující parsovaný HTML dokument,
@@ -426,10 +1501,19 @@ def parsuj_html(content: str) -> BeautifulSoup:
         pomocí 'pip install beautifulsoup'.
     """
        
-    return BeautifulSoup(content, 'html.parser')
-
-
-def stahni_data(url: str, max_pokusu: int = 3) -> requests.Response:
+    if parser == PARSER_EXTRAKTOR:
+        parser = PARSER_HTML
+    if isinstance(content, bytes) and kodovani:
+        return BeautifulSoup(content, parser, from_encoding=kodovani)
+    return BeautifulSoup(content, parser)
+
+
+def stahni_data(
+    url: str,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU,
+    session: requests.Session = None,
+    metoda: str = 'GET'
+) -> requests.Response:
     """
     Stahuje data z URL adresy s možností několika pokusů v případě chyby.
     Funkce se pokusí stáhnout data z uvedené URL adresy.
@@ -438,12 +1522,35 @@ def stahni_data(url: str, max_pokusu: int = 3) -> requests.Response:
     nebo vrací chybu), funkce se pokusí požadavek zopakovat
     až 'max_pokusu' krát.
     Pokud všechny pokusy selžou, funkce vyvolá chybu.
+    Opakují se jen chyby, u kterých má opakování smysl (výpadek
+    spojení, vypršení časového limitu, kódy 408, 429 a 5xx). Mezi
+    pokusy se čeká exponenciálně déle s náhodným rozptylem, nebo
+    tak dlouho, jak server žádá hlavičkou Retry-After.
+    Nese-li session omezovač rychlosti ('OmezovacRychlosti'),
+    počká každý pokus na jeho token a odpověď 429/503 zpomalí
+    všechna vlákna.
+    Pokud session nese diskovou mezipaměť ('DiskovaCache'), vrátí
+    GET požadavek čerstvý záznam bez dotazu na server, starší
+    záznam ověří podmíněným požadavkem a nově stažené stránky
+    do mezipaměti uloží.
+    Nese-li session archiv stránek ('ArchivStranek'), uloží se
+    do něj každá vrácená stránka, nebo se při přehrávání stránka
+    vrátí jen z archivu bez jakéhokoli přístupu k síti.
 
     Args:
         url(str): URL adresa stránky, ze které se mají stáhnout data
         
         max_pokusu(int, optional): Maximální počet pokusů o stažení dat.
                                    Výchozí hodnota jsou 3 pokusy.
+
+        session(requests.Session, optional): Sdílená session s poolem
+                                   spojení (viz 'StahovaciSession').
+                                   Pokud není zadána, každý požadavek
+                                   otevře nové spojení.
+
+        metoda(str, optional): HTTP metoda požadavku. Výchozí je 'GET',
+                                   pro pouhé ověření dostupnosti
+                                   stačí 'HEAD'.
     
     Returns:
         requests.Response: Objekt odpovědi (Response), který
@@ -466,16 +1573,64 @@ def stahni_data(url: str, max_pokusu: int = 3) -> requests.Response:
         Pokud není nainstalována, je třeba ji nainstalovat
         pomocí 'pip install requests'
     """
-    
+
+    archiv = getattr(session, 'archiv', None)
+    if archiv and archiv.prehravani:
+        return odpoved_z_cache(archiv.prehraj(url), url)
+
+    response = _stahni_ze_site(url, max_pokusu, session, metoda)
+    if archiv and metoda == 'GET':
+        archiv.uloz(
+            url, response.content, response.headers, response.encoding
+        )
+    return response
+
+
+def _stahni_ze_site(
+    url: str,
+    max_pokusu: int,
+    session: requests.Session,
+    metoda: str
+) -> requests.Response:
+    # Stažení s mezipamětí, omezovačem a opakováním (viz 'stahni_data')
+    cache = getattr(session, 'cache', None) if metoda == 'GET' else None
+    zaznam = cache.nacti(url) if cache else None
+    if zaznam and cache.je_cerstvy(zaznam):
+        cache.zapocitej('cache_zasahy')
+        return odpoved_z_cache(zaznam, url)
+
+    omezovac = getattr(session, 'omezovac', None)
     for pokus in range(max_pokusu):
+        if omezovac:
+            omezovac.pockej()
         try:
-            response = requests.get(url, timeout=10)
+            response = (session or requests).request(
+                metoda, url, timeout=VYCHOZI_TIMEOUT,
+                headers=DiskovaCache.podminene_hlavicky(zaznam)
+            )
+            if zaznam and response.status_code == 304:
+                # I odpověď 304 je úspěšná výměna se serverem
+                if omezovac:
+                    omezovac.uspech()
+                cache.obnov(url, zaznam, response.headers)
+                cache.zapocitej('cache_zasahy')
+                cache.zapocitej('cache_revalidace')
+                return odpoved_z_cache(zaznam, url)
             response.raise_for_status()
+            if omezovac:
+                omezovac.uspech()
+            if cache:
+                cache.uloz(
+                    url, response.content,
+                    response.headers, response.encoding
+                )
+                cache.zapocitej('cache_minuti')
             return response
         
         except requests.exceptions.RequestException as e:
             zpracuj_vyjimku(e, pokus, max_pokusu, "stahování dat")
-            time.sleep(2) # Počkej před dalším pokusem
+            # Počkej před dalším pokusem
+            time.sleep(doba_cekani(e, pokus, omezovac))
 
 
 def zpracuj_vyjimku(
@@ -485,8 +1640,9 @@ def zpracuj_vyjimku(
     Zpracovává výjimky při vykonávání operace a loguje chyby
     podle typu výjimky. Pokud je počet pokusů menší než
     'max_pokusu', vypíše varování a pokračuje v pokusu.
-    Při dosažení počtu 'max_pokusu' nebo při vypršení 
-    časového limitu vyvolá výjimku.
+    Vypršení časového limitu se opakuje stejně jako výpadek
+    spojení. Při dosažení počtu 'max_pokusu' nebo u chyby,
+    kterou opakování nespraví (např. 404), výjimku vyvolá znovu.
     
     Args:
         e(Exception): Výjimka, která byla vyvolána během operace
@@ -502,23 +1658,21 @@ def zpracuj_vyjimku(
         None: Funkce nevrací žádnou hodnotu při úspěchu.
     
     Raises:
-        ValidationError: Pokud vypršel datový limit nebo pokud
-                         došlo k jiné kritické chybě
+        RequestException: Pokud jde o poslední pokus nebo pokud
+                          chybu opakování nespraví
     """
     
     if isinstance(e, requests.exceptions.Timeout):
         logging.error(
             LOG_ERROR_TIME_OUT.format(operation=operace, error_detail=e)
         )
-        raise ValidationError(
-            LOG_ERROR_TIME_OUT.format(operation=operace, error_detail=e)
-        ) from e
-    
     elif isinstance(e, requests.RequestException):
         logging.error(
             LOG_ERROR_REQUEST.format(operation=operace, error_detail=e)
-        )       
-        if pokus == max_pokusu - 1: # Poslední pokus
+        )
+
+    if isinstance(e, requests.RequestException):
+        if pokus == max_pokusu - 1 or not je_opakovatelna(e):
             raise
         logging.warning(
             LOG_WARNING_POKUSY.format(
@@ -530,8 +1684,24 @@ def zpracuj_vyjimku(
         )
 
 
+def je_opakovatelna(e: requests.RequestException) -> bool:
+    """
+    Vrátí True, pokud má smysl požadavek po chybě 'e' zopakovat:
+    výpadek spojení, vypršení limitu nebo HTTP kód
+    z 'OPAKOVATELNE_KODY'. Ostatní chybové kódy (např. 404) by
+    se opakováním nezměnily.
+    """
+    response = getattr(e, 'response', None)
+    if response is None:
+        return True
+    return response.status_code in OPAKOVATELNE_KODY
+
+
 def ziskej_linky_okrsku(
-    url: str, max_pokusu: int = 3
+    url: str,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU,
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER
 ) -> List[Okrsek]:
     """
     Získává seznam URL adres jednotlivých okrsků 
@@ -547,12 +1717,17 @@ def ziskej_linky_okrsku(
                   URL adresy okrsků
         max_pokusu(int, optional): Maximální počet pokusů o stažení dat.
                                    Výchozí hodnota jsou 3 pokusy.
+        session(requests.Session, optional): Sdílená session
+                                   pro stahování (viz 'stahni_data').
+        parser(str, optional): HTML parser (viz 'parsuj_html').
     
     Returns:
         list[dict]: Seznam slovníků (Okrsek), kde každý obsahuje:
         - 'url'(str): URl adresa okrsku,
         - 'cislo_obce'(str): Číslo obce,
-        - 'nazev_obce'(str): Název obce.
+        - 'nazev_obce'(str): Název obce,
+        - 'vyber_okrsku'(str): Odkaz na výběr okrsků obce (ps34),
+          u obce s jediným okrskem přímo na okrsek, nebo None.
 
     Example:
         >>> url = "https://www.volby.cz/pls/ps2017nss/" +
@@ -563,7 +1738,8 @@ def ziskej_linky_okrsku(
     Note:
         Funkce předpokládá, že všechny odkazy v HTML 
         odpovědi jsou ve formátu 'ps311' a obsahují 
-        parametry s číslem obce.
+        parametry s číslem obce. Relativní odkazy se skládají
+        s adresou stránky, takže funguje pro libovolný rok voleb.
         Pokud se struktura stránky změní, může být nutné 
         upravit selektory.
     """
@@ -571,14 +1747,18 @@ def ziskej_linky_okrsku(
     unique_urls = set()
     obce: List[Okrsek] = []
 
-    response = stahni_data(url, max_pokusu)
-    soup = parsuj_html(response.text)   
+    response = stahni_data(url, max_pokusu, session)
+    soup = parsuj_html(
+        response.content, parser,
+        deklarovane_kodovani(response.headers.get('Content-Type'))
+    )
 
     for row in soup.select('table tr'):
         link = row.select_one('td:nth-child(1) a[href*="ps311"]')
         if link:
             href = link.get('href')
-            full_url = BASE_URL + href
+            # Odkazy jsou relativní k adresáři voleb (např. ps2017nss/)
+            full_url = urljoin(url, href)
             if full_url not in unique_urls:
                 unique_urls.add(full_url)
                 cislo_obce = href.split('xobec=')[1].split('&')[0]
@@ -588,18 +1768,335 @@ def ziskej_linky_okrsku(
                     if nazev_obce_cell
                     else None
                 )
+                # Sloupec 'Výběr okrsku' (viz 'ziskej_okrsky')
+                vyber = row.select_one('td:nth-child(3) a')
                 obce.append(
                     Okrsek(
                         url=full_url,
                         cislo_obce=cislo_obce,
-                        nazev_obce=nazev_obce
+                        nazev_obce=nazev_obce,
+                        vyber_okrsku=(
+                            urljoin(url, vyber.get('href')) if vyber
+                            else None
+                        )
                     )
                 )
             
     return obce
+
+
+def typ_stranky(url: str) -> str:
+    """
+    Vrátí typ stránky volby.cz podle posledního úseku cesty URL,
+    např. 'ps3' (přehled voleb) nebo 'ps32' (okres).
+
+    Example:
+        >>> typ_stranky("https://www.volby.cz/pls/ps2021nss/ps3?xjazyk=CZ")
+            'ps3'
+    """
+    return urlparse(url).path.rsplit('/', 1)[-1]
+
+
+def oznaceni_voleb(url: str) -> str:
+    """
+    Vrátí označení voleb podle adresáře voleb v URL (předposlední
+    úsek cesty), např. 'ps2021nss'. Pod tímto označením se ukládají
+    výsledky do databáze (viz 'SqliteZapisovac').
+
+    Example:
+        >>> oznaceni_voleb("https://www.volby.cz/pls/ps2021nss/ps3?xjazyk=CZ")
+            'ps2021nss'
+    """
+    casti = urlparse(url).path.rstrip('/').split('/')
+    return casti[-2] if len(casti) > 1 else None
+
+
+def uzemi_obce(url: str) -> Tuple[str, str]:
+    """
+    Vrátí kód kraje a okresu obce podle parametrů 'xkraj'
+    a 'xvyber' v URL stránky obce (ps311). Kód okresu je stejný
+    jako parametr 'xnumnuts' stránek okresu (ps32, ps33).
+
+    Example:
+        >>> uzemi_obce("https://www.volby.cz/pls/ps2017nss/ps311?"
+        ...            "xjazyk=CZ&xkraj=14&xobec=598925&xvyber=8103")
+            ('14', '8103')
+    """
+    parametry = parse_qs(urlparse(url).query)
+    return (
+        parametry.get('xkraj', [None])[0],
+        parametry.get('xvyber', [None])[0]
+    )
+
+
+def ziskej_linky_okresu(
+    url: str,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU,
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER
+) -> List[Okres]:
+    """
+    Získá seznam okresů z přehledu voleb za celou republiku (ps3).
+    Přehled obsahuje pro každý kraj tabulku okresů s odkazem
+    'Výběr obce' na stránku okresu (ps32). Název okresu je
+    v buňce před odkazem.
+
+    Args:
+        url(str): URL adresa přehledu voleb (ps3).
+        max_pokusu(int, optional): Maximální počet pokusů o stažení dat.
+        session(requests.Session, optional): Sdílená session
+                                   pro stahování (viz 'stahni_data').
+        parser(str, optional): HTML parser (viz 'parsuj_html').
+
+    Returns:
+        List[Okres]: Okresy v pořadí přehledu, každý s URL adresou
+                     stránky okresu a názvem.
+
+    Example:
+        >>> okresy = ziskej_linky_okresu(
+                "https://www.volby.cz/pls/ps2017nss/ps3?xjazyk=CZ"
+            )
+        >>> okresy[0]
+            {'url': 'https://www.volby.cz/pls/ps2017nss/
+            ps32?xjazyk=CZ&xkraj=1&xnumnuts=1100', 'nazev': 'Praha'}
+    """
+    okresy: List[Okres] = []
+    unique_urls = set()
+
+    response = stahni_data(url, max_pokusu, session)
+    soup = parsuj_html(
+        response.content, parser,
+        deklarovane_kodovani(response.headers.get('Content-Type'))
+    )
+
+    for link in soup.select(f'td a[href*="{STRANKA_OKRESU}?"]'):
+        full_url = urljoin(url, link.get('href'))
+        if full_url in unique_urls:
+            continue
+        unique_urls.add(full_url)
+        bunka_nazvu = link.find_parent('td').find_previous_sibling('td')
+        okresy.append(
+            Okres(
+                url=full_url,
+                nazev=(
+                    bunka_nazvu.get_text(strip=True) if bunka_nazvu
+                    else None
+                )
+            )
+        )
+
+    return okresy
+
+
+def ziskej_obce_voleb(
+    url: str,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU,
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER,
+    workers: int = VYCHOZI_POCET_VLAKEN,
+    stats: dict = None
+) -> List[OkrsekOkresu]:
+    """
+    Získá obce všech okresů z přehledu voleb (ps3).
+    Stránky okresů se stahují souběžně ve 'workers' vláknech
+    (viz 'spust_paralelne') přes sdílenou session. Obce všech okresů
+    se spojí do jednoho seznamu v pořadí přehledu, takže je dále
+    zpracuje jedno společné stahování a souběh tak přesahuje
+    hranice okresů. Každá obec nese název svého okresu.
+    Okres, jehož stránku nelze stáhnout nebo zpracovat, se zaloguje,
+    započte do chyb a přeskočí, ostatní okresy se zpracují dál.
+    Žurnál se pak po běhu nesmaže a '--resume' okres zkusí znovu.
+
+    Args:
+        url(str): URL adresa přehledu voleb (ps3).
+        max_pokusu(int, optional): Maximální počet pokusů o stažení dat.
+        session(requests.Session, optional): Sdílená session
+                                   pro stahování (viz 'stahni_data').
+        parser(str, optional): HTML parser (viz 'parsuj_html').
+        workers(int, optional): Počet souběžně stahovaných okresů.
+        stats(dict, optional): Statistiky běhu, ke klíči 'chyby'
+                                   se připočte každý přeskočený okres.
+
+    Returns:
+        List[OkrsekOkresu]: Obce všech okresů s klíčem 'okres'.
+
+    Raises:
+        NoDataFoundError: Pokud přehled neobsahuje žádné okresy.
+    """
+    okresy = ziskej_linky_okresu(url, max_pokusu, session, parser)
+    if not okresy:
+        raise NoDataFoundError(LOG_RAISE_NO_OKRESY_FOUND.format(url=url))
+    logging.info(LOG_INFO_COUNT_OKRESY.format(url=url, count=len(okresy)))
+    print(
+        "\n" + Fore.LIGHTCYAN_EX +
+        MSG_INFO_COUNT_OKRESY.format(total=len(okresy)) + "\n"
+    )
+
+    obce: List[OkrsekOkresu] = []
+    unique_urls = set()
+    with contextlib.closing(spust_paralelne(
+        lambda okres: ziskej_linky_okrsku(
+            okres['url'], max_pokusu, session, parser
+        ),
+        okresy, workers
+    )) as stahovani:
+        for okres, future in tqdm(
+            stahovani, total=len(okresy),
+            desc="Načítám okresy", unit="okres"
+        ):
+            try:
+                obce_okresu = future.result()
+            except (RequestException, DataParsingError, ValueError) as e:
+                logging.warning(
+                    LOG_WARNING_OKRES_VOLEB.format(
+                        okres=okres['nazev'], url=okres['url'], error_detail=e
+                    )
+                )
+                if stats is not None:
+                    stats['chyby'] += 1
+                continue
+            for obec in obce_okresu:
+                # Obec se stejnou adresou může být odkazována vícekrát
+                if obec['url'] not in unique_urls:
+                    unique_urls.add(obec['url'])
+                    obce.append(OkrsekOkresu(**obec, okres=okres['nazev']))
+    return obce
         
 
-def ziskej_data_obce(url: str, max_pokusu: int = 3) -> ObecData:
+def ziskej_okrsky_obce(
+    obec: Okrsek,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU,
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER
+) -> List[OkrsekObce]:
+    """
+    Najde okrsky jedné obce. Odkaz 'Výběr okrsku' ze stránky okresu
+    vede u obce s jediným okrskem přímo na stránku okrsku (ps311
+    s parametrem 'xokrsek'), u větších obcí na výběr okrsků (ps34),
+    ze kterého se převezmou odkazy na všechny okrsky. Obec bez
+    odkazu se hledá na její vlastní stránce.
+
+    Args:
+        obec (Okrsek): Obec z 'ziskej_obce'.
+        max_pokusu (int, optional): Maximální počet pokusů o stažení.
+        session (requests.Session, optional): Sdílená session
+                                   pro stahování (viz 'stahni_data').
+        parser (str, optional): HTML parser (viz 'parsuj_html').
+
+    Returns:
+        List[OkrsekObce]: Okrsky obce v pořadí stránky, každý
+                          s údaji obce, URL stránky okrsku
+                          a číslem okrsku 'okrsek'.
+
+    Example:
+        >>> okrsky = ziskej_okrsky_obce(obce[0])
+        >>> okrsky[0]['url'], okrsky[0]['okrsek']
+            ('https://www.volby.cz/pls/ps2017nss/ps311?xjazyk=CZ&xkraj=14
+            &xobec=598925&xokrsek=1&xvyber=8103', '1')
+    """
+    url = obec.get('vyber_okrsku') or obec['url']
+    cislo = parse_qs(urlparse(url).query).get('xokrsek')
+    if cislo:
+        return [OkrsekObce(obec, url=url, okrsek=cislo[0])]
+
+    response = stahni_data(url, max_pokusu, session)
+    soup = parsuj_html(
+        response.content, parser,
+        deklarovane_kodovani(response.headers.get('Content-Type'))
+    )
+    okrsky: List[OkrsekObce] = []
+    unique_urls = set()
+    for link in soup.select('a[href*="xokrsek="]'):
+        full_url = urljoin(url, link.get('href'))
+        if full_url not in unique_urls:
+            unique_urls.add(full_url)
+            okrsky.append(OkrsekObce(
+                obec, url=full_url,
+                okrsek=parse_qs(urlparse(full_url).query)['xokrsek'][0]
+            ))
+    return okrsky
+
+
+def ziskej_okrsky(
+    obce: List[Okrsek],
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER,
+    workers: int = VYCHOZI_POCET_VLAKEN,
+    stats: dict = None
+) -> List[OkrsekObce]:
+    """
+    Rozloží obce na okrsky (režim '--okrsky'). Výběry okrsků
+    se stahují souběžně ve 'workers' vláknech (viz 'spust_paralelne')
+    a okrsky všech obcí se spojí do jednoho seznamu v pořadí obcí.
+    Seznam pak zpracuje 'zpracuj_obce' stejně jako obce: stránka
+    okrsku má stejné tabulky jako stránka obce, v paměti je vždy
+    jen omezený počet rozpracovaných stránek a řádky se průběžně
+    zapisují. Stránky se tedy v paměti nehromadí, seznam okrsků
+    (a tabulka výsledků, viz 'TabulkaVysledku') však roste lineárně
+    s jejich počtem. Obec, jejíž okrsky nelze zjistit, se zaloguje,
+    započítá do 'stats['chyby']' a přeskočí.
+
+    Args:
+        obce (List[Okrsek]): Obce z 'ziskej_obce'.
+        session (requests.Session, optional): Sdílená session.
+        parser (str, optional): HTML parser (viz 'parsuj_html').
+        workers (int, optional): Počet souběžně stahovaných obcí.
+        stats (dict, optional): Statistiky běhu, do jejichž klíče
+                                'chyby' se připočtou přeskočené obce.
+
+    Returns:
+        List[OkrsekObce]: Okrsky všech obcí.
+
+    Raises:
+        NoDataFoundError: Pokud se nenašel žádný okrsek.
+    """
+    okrsky: List[OkrsekObce] = []
+    with contextlib.closing(spust_paralelne(
+        lambda obec: ziskej_okrsky_obce(
+            obec, session=session, parser=parser
+        ),
+        obce, workers
+    )) as stahovani:
+        for obec, future in tqdm(
+            stahovani, total=len(obce), desc="Hledám okrsky", unit="obec"
+        ):
+            try:
+                okrsky_obce = future.result()
+                if not okrsky_obce:
+                    raise NoDataFoundError(LOG_RAISE_NO_OKRSKY_FOUND.strip())
+            except (RequestException, ValueError, NoDataFoundError) as e:
+                logging.warning(
+                    LOG_WARNING_OKRSKY_OBCE.format(
+                        obec_nazev=obec['nazev_obce'],
+                        obec_cislo=obec['cislo_obce'], error_detail=e
+                    )
+                )
+                if stats is not None:
+                    stats['chyby'] += 1
+                continue
+            okrsky.extend(okrsky_obce)
+
+    if not okrsky:
+        raise NoDataFoundError(LOG_RAISE_NO_OKRSKY_FOUND)
+    logging.info(
+        LOG_INFO_COUNT_OKRSKY.format(count=len(okrsky), obce=len(obce))
+    )
+    print(
+        "\n" + Fore.LIGHTCYAN_EX +
+        MSG_INFO_COUNT_OKRSKY.format(total=len(okrsky), obce=len(obce))
+        + "\n"
+    )
+    return okrsky
+
+
+def ziskej_data_obce(
+    url: str,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU,
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER,
+    parsovaci_pool: Executor = None,
+    registr: "RegistrStran" = None
+) -> ObecData:
     """
     Získává detailní volební data pro konkrétní obce z dané URL.
     Funkce stáhne obsah zadané URL a pomocí BeautifulSoup 
@@ -615,6 +2112,16 @@ def ziskej_data_obce(url: str, max_pokusu: int = 3) -> ObecData:
         max_pokusu(int, optional): Maximální počet pokusů 
                                    o stáhnutí stránky.
                                    Výchozí hodnota je 3.
+        session(requests.Session, optional): Sdílená session
+                                   pro stahování (viz 'stahni_data').
+        parser(str, optional): HTML parser (viz 'parsuj_html').
+        parsovaci_pool(Executor, optional): Pool procesů, ve kterém
+                                   se stránka parsuje. Pokud není
+                                   zadán, parsuje se ve volajícím
+                                   vlákně.
+        registr(RegistrStran, optional): Registr stran běhu. Strany
+                                   obce se v něm zaregistrují a dostanou
+                                   ID (klíč 'id').
 
     Returns:
         ObecData: Slovník s volebními data pro danou obec, 
@@ -624,7 +2131,9 @@ def ziskej_data_obce(url: str, max_pokusu: int = 3) -> ObecData:
         - 'vydane_obalky'(int): Počet vydaných volebních obálek,
         - 'platne_hlasy'(int): Počet platných hlasů,
         - 'strany'(List[Strana]): Seznam politických stran
-                                  a počtu hlasů pro každou stranu.
+                                  a počtu hlasů pro každou stranu
+                                  s číslem na lístku ('cislo')
+                                  a s 'registr' i s ID ('id').
 
     Raises:
         DataParsingError: Pokud dojde k chybě při parsování dat.
@@ -642,7 +2151,7 @@ def ziskej_data_obce(url: str, max_pokusu: int = 3) -> ObecData:
               'vydane_obalky': 1957,
               'platne_hlasy': 1944,             
               'strany': [{'strana': 'Občanská demokratická strana',
-                          'hlasy': 109},
+                          'hlasy': 109, 'cislo': 1},
                          {'strana': 'Řád národa - Vlastenecká unie',
                           'hlasy': 4},
                          {'strana': 'CESTA ODPOVĚDNÉ SPOLEČNOSTI',
@@ -659,20 +2168,105 @@ def ziskej_data_obce(url: str, max_pokusu: int = 3) -> ObecData:
         podobě bez čárky. 
         Pokud jsou data obce podezřelá, zachytí je výjimka 
         a zaloguje jako chybu pro danou obec.
+        Samotné vytěžení dat ze stažené stránky 
+        provádí funkce 'parsuj_data_obce'. S 'parsovaci_pool'
+        běží v jiném procesu, takže parsování v čistém Pythonu
+        nedrží GIL vláken, která stahují. Mezi procesy se předávají
+        jen bajty stránky a výsledné ObecData, nikdy objekty soup.
     """
     
-    response = stahni_data(url, max_pokusu)
-    soup = parsuj_html(response.text)
-    
-    # Najdi název obce
-    obec_text = najdi_text_nebo_chybu(
-        soup, 'h3:-soup-contains("Obec:")', "název obce"
+    response = stahni_data(url, max_pokusu, session)
+    data = parsuj_odpoved_obce(response, parser, parsovaci_pool)
+    if registr is not None:
+        # Registr žije v hlavním procesu, parsovat se mohlo jinde
+        registr.oznac(data['strany'])
+    return data
+
+
+def parsuj_odpoved_obce(
+    response: requests.Response,
+    parser: str = VYCHOZI_PARSER,
+    parsovaci_pool: Executor = None
+) -> ObecData:
+    """
+    Vytěží data obce ze stažené odpovědi pomocí 'parsuj_data_obce',
+    s 'parsovaci_pool' v jiném procesu (viz 'ziskej_data_obce').
+
+    Args:
+        response (requests.Response): Stažená stránka obce.
+        parser (str, optional): HTML parser (viz 'parsuj_html').
+        parsovaci_pool (Executor, optional): Pool procesů pro parsování.
+
+    Returns:
+        ObecData: Data obce.
+    """
+    argumenty = (
+        response.content, parser,
+        deklarovane_kodovani(response.headers.get('Content-Type'))
     )
-    jmeno_obce = obec_text.replace("Obec:", "").strip()
-    
-    # Najdi počet voličů
-    volici_text = najdi_text_nebo_chybu(
-        soup, 'td[headers="sa2"]', "počet voličů"
+    if parsovaci_pool:
+        return parsovaci_pool.submit(parsuj_data_obce, *argumenty).result()
+    return parsuj_data_obce(*argumenty)
+
+
+def parsuj_data_obce(
+    content: Union[str, bytes],
+    parser: str = VYCHOZI_PARSER,
+    kodovani: str = None,
+    nadpis: str = NADPIS_OBCE
+) -> ObecData:
+    """
+    Vytěží volební data obce z HTML obsahu stránky 'ps311'.
+    Funkce neprovádí žádné síťové operace, pouze parsuje
+    již stažený obsah. Sdílí ji proto synchronní funkce
+    'ziskej_data_obce' i asynchronní 'ziskej_data_obce_async',
+    takže oba způsoby stahování vrací totožná data.
+    S parserem 'extraktor' (výchozí) čte stránku jediným
+    průchodem bez stavby stromu (viz 'ExtraktorObce'), jinak
+    sestaví strom BeautifulSoup a hledá v něm CSS selektory.
+    Oba způsoby vrací stejná data i stejné chyby.
+
+    Args:
+        content(str | bytes): HTML obsah stránky obce ve formě
+                              řetězce nebo bajtů
+        parser(str, optional): 'extraktor' (výchozí) nebo parser
+                              pro BeautifulSoup (viz 'parsuj_html').
+        kodovani(str, optional): Kódování bajtového obsahu.
+        nadpis(str, optional): Nadpis <h3> s názvem územního celku.
+                              Se 'NADPIS_OKRESU' se stejně vytěží
+                              zveřejněné výsledky okresu (ps33),
+                              které mají stejné tabulky jako obec.
+
+    Returns:
+        ObecData: Slovník s volebními daty pro danou obec
+                  (viz 'ziskej_data_obce').
+
+    Raises:
+        DataParsingError: Pokud stránka neobsahuje očekávané údaje.
+        
+        ValueError: Pokud není možné text převést na číslo.
+
+    Example:
+        >>> response = stahni_data(url)
+        >>> data = parsuj_data_obce(response.content, 'lxml', 'utf-8')
+        >>> data['obec']
+            'Albrechtice'
+    """
+    
+    if parser == PARSER_EXTRAKTOR:
+        return extrahuj_data_obce(content, kodovani, nadpis)
+
+    soup = parsuj_html(content, parser, kodovani)
+    
+    # Najdi název obce
+    obec_text = najdi_text_nebo_chybu(
+        soup, f'h3:-soup-contains("{nadpis}")', "název obce"
+    )
+    jmeno_obce = obec_text.replace(nadpis, "").strip()
+    
+    # Najdi počet voličů
+    volici_text = najdi_text_nebo_chybu(
+        soup, 'td[headers="sa2"]', "počet voličů"
     )
     volici = ocisti_cislo(volici_text)
     
@@ -689,55 +2283,262 @@ def ziskej_data_obce(url: str, max_pokusu: int = 3) -> ObecData:
     platne_hlasy = ocisti_cislo(platne_text)
     
     # Najdi strany a počet hlasů
-    strany_data: List[Strana] = []
+    radky_stran = []
     for table in soup.select('table')[1:]:
         for row in table.select('tr:nth-child(n+3)'):
             cells = row.select('td')
             if len(cells) >= 3:
-                strana = cells[1].text.strip()
-                hlasy_text = cells[2].text.strip()
-                logging.debug(
-                    LOG_DEBUG_LOADED_DATA.format(
-                        strana=strana, 
-                        hlasy=hlasy_text
-                    )
-                )
-                # Zkontrolujeme, zda máme platný řádek
-                if not je_validni_radek(strana, hlasy_text):
-                    logging.debug(
-                        LOG_DEBUG_SKIP_ROW.format(
-                            strana=strana, hlasy=hlasy_text
-                        )
-                    )
-                    continue  # Přeskoč tento řádek
-
-                try:
-                    hlasy = ocisti_cislo(hlasy_text)                    
-                    strany_data.append(Strana(strana=strana, hlasy=hlasy))
-                
-                except ValueError:
-                    logging.warning(
-                        LOG_WARNING_VALUE_HLASY.format(
-                            hlasy=hlasy_text, strana=strana
-                        )
-                    )
-                    continue # Přeskoč tento řádek
-                
-                except DataParsingError as e:
-                    logging.error(
-                        LOG_ERROR_PARSING_DATA.format(error_detail=e)
-                    )
-                    raise               
+                radky_stran.append((
+                    cells[0].text.strip(), cells[1].text.strip(),
+                    cells[2].text.strip()
+                ))
                                   
     return (
         ObecData(obec=jmeno_obce,
         volici=volici,
         vydane_obalky=vydane_obalky,
         platne_hlasy=platne_hlasy,
-        strany=strany_data)
+        strany=zpracuj_radky_stran(radky_stran))
+    )
+
+
+def zpracuj_radky_stran(
+    radky: Iterable[Tuple[str, str, str]]
+) -> List[Strana]:
+    """
+    Převede řádky tabulek stran na seznam stran s počtem hlasů
+    a číslem strany na hlasovacím lístku. Nevalidní řádky (viz
+    'je_validni_radek') a řádky s nečíselným počtem hlasů
+    přeskočí. Funkci sdílí parsování přes BeautifulSoup
+    i jednoprůchodový extraktor. ID strany doplní až registr
+    stran (viz 'RegistrStran.oznac').
+
+    Args:
+        radky (Iterable[Tuple[str, str, str]]): Trojice (číslo
+                                   strany, název strany, text
+                                   s počtem hlasů).
+
+    Returns:
+        List[Strana]: Strany a jejich hlasy v pořadí řádků.
+
+    Example:
+        >>> zpracuj_radky_stran([('4', 'Strana zelených', '1\xa0015'),
+        ...                      ('-', '-', '-')])
+            [{'strana': 'Strana zelených', 'hlasy': 1015, 'cislo': 4}]
+    """
+    strany_data: List[Strana] = []
+    for cislo_text, strana, hlasy_text in radky:
+        logging.debug(
+            LOG_DEBUG_LOADED_DATA.format(
+                strana=strana, 
+                hlasy=hlasy_text
+            )
+        )
+        # Zkontrolujeme, zda máme platný řádek
+        if not je_validni_radek(strana, hlasy_text):
+            logging.debug(
+                LOG_DEBUG_SKIP_ROW.format(
+                    strana=strana, hlasy=hlasy_text
+                )
+            )
+            continue  # Přeskoč tento řádek
+
+        try:
+            hlasy = ocisti_cislo(hlasy_text)                    
+            strany_data.append(Strana(
+                strana=strana, hlasy=hlasy,
+                cislo=int(cislo_text) if cislo_text.isdigit() else None
+            ))
+        
+        except ValueError:
+            logging.warning(
+                LOG_WARNING_VALUE_HLASY.format(
+                    hlasy=hlasy_text, strana=strana
+                )
+            )
+            continue # Přeskoč tento řádek
+        
+        except DataParsingError as e:
+            logging.error(
+                LOG_ERROR_PARSING_DATA.format(error_detail=e)
+            )
+            raise
+
+    return strany_data
+
+
+class ExtraktorObce(HTMLParser):
+    """
+    Jednoprůchodový extraktor volebních dat ze stránky obce 'ps311'.
+    Místo stavby celého stromu BeautifulSoup a hledání CSS
+    selektorů čte stránku jako proud událostí (začátek a konec
+    značky, text) a ukládá pouze potřebné údaje:
+    - text prvního nadpisu <h3> obsahujícího 'nadpis' ('Obec:'),
+    - text první buňky <td> s atributem headers 'sa2', 'sa3' a 'sa6',
+    - buňky řádků tabulek stran (všechny tabulky kromě první,
+      řádky od třetího), tedy totéž, co vybírají selektory
+      v 'parsuj_data_obce'.
+
+    Example:
+        >>> extraktor = ExtraktorObce()
+        >>> extraktor.feed(html)
+        >>> extraktor.close()
+        >>> extraktor.obec, extraktor.hlavicky['sa2']
+            ('Obec: Albrechtice', '3\xa0173')
+    """
+
+    HLEDANE_HLAVICKY = ('sa2', 'sa3', 'sa6')
+
+    def __init__(self, nadpis: str = NADPIS_OBCE) -> None:
+        super().__init__(convert_charrefs=True)
+        self.nadpis = nadpis
+        self.obec = None
+        self.hlavicky = {}
+        self.radky_stran = []
+        self._pocet_tabulek = 0
+        self._tabulky = []  # [pořadí tabulky, počet řádků] otevřených
+        self._h3 = None
+        self._bunka = None
+        self._bunka_headers = None
+        self._radek = None
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag == 'td':
+            self._uzavri_bunku()
+            self._bunka = []
+            self._bunka_headers = dict(attrs).get('headers')
+        elif tag == 'tr':
+            self._uzavri_radek()
+            if self._tabulky:
+                tabulka = self._tabulky[-1]
+                tabulka[1] += 1
+                # Řádky stran: tabulky za první, řádky od třetího
+                if tabulka[0] > 1 and tabulka[1] >= 3:
+                    self._radek = []
+        elif tag == 'table':
+            self._pocet_tabulek += 1
+            self._tabulky.append([self._pocet_tabulek, 0])
+        elif tag == 'h3':
+            self._h3 = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'td':
+            self._uzavri_bunku()
+        elif tag == 'tr':
+            self._uzavri_radek()
+        elif tag == 'table':
+            self._uzavri_radek()
+            if self._tabulky:
+                self._tabulky.pop()
+        elif tag == 'h3' and self._h3 is not None:
+            text = ''.join(self._h3)
+            if self.obec is None and self.nadpis in text:
+                self.obec = text.strip()
+            self._h3 = None
+
+    def handle_data(self, data: str) -> None:
+        if self._bunka is not None:
+            self._bunka.append(data)
+        if self._h3 is not None:
+            self._h3.append(data)
+
+    def close(self) -> None:
+        super().close()
+        # Neuzavřené značky na konci (useknutá stránka)
+        self._uzavri_radek()
+
+    def _uzavri_bunku(self) -> None:
+        if self._bunka is None:
+            return
+        text = ''.join(self._bunka).strip()
+        if (
+            self._bunka_headers in self.HLEDANE_HLAVICKY
+            and self._bunka_headers not in self.hlavicky
+        ):
+            self.hlavicky[self._bunka_headers] = text
+        if self._radek is not None:
+            self._radek.append(text)
+        self._bunka = None
+
+    def _uzavri_radek(self) -> None:
+        self._uzavri_bunku()
+        if self._radek is not None and len(self._radek) >= 3:
+            self.radky_stran.append(tuple(self._radek[:3]))
+        self._radek = None
+
+
+def extrahuj_data_obce(
+    content: Union[str, bytes], kodovani: str = None,
+    nadpis: str = NADPIS_OBCE
+) -> ObecData:
+    """
+    Vytěží volební data obce jediným průchodem stránky
+    (viz 'ExtraktorObce'). Vrací stejná data a při chybějících
+    údajích vyvolá stejné výjimky jako 'parsuj_data_obce'
+    s parserem BeautifulSoup.
+
+    Args:
+        content(str | bytes): HTML obsah stránky obce.
+        kodovani(str, optional): Kódování bajtového obsahu. Pokud
+                                 není zadáno, převezme se z deklarace
+                                 <meta charset> ve stránce.
+        nadpis(str, optional): Nadpis s názvem územního celku
+                                 (viz 'parsuj_data_obce').
+
+    Returns:
+        ObecData: Slovník s volebními daty pro danou obec.
+
+    Raises:
+        DataParsingError: Pokud stránka neobsahuje očekávané údaje.
+
+        ValueError: Pokud není možné text převést na číslo.
+    """
+    if isinstance(content, bytes):
+        content = UnicodeDammit(
+            content, [kodovani] if kodovani else []
+        ).unicode_markup
+
+    extraktor = ExtraktorObce(nadpis)
+    extraktor.feed(content)
+    extraktor.close()
+
+    if extraktor.obec is None:
+        chybi_element("název obce")
+    jmeno_obce = extraktor.obec.replace(nadpis, "").strip()
+
+    cisla = []
+    for headers, popis in (
+        ('sa2', "počet voličů"),
+        ('sa3', "počet vydaných obálek"),
+        ('sa6', "počet platných hlasů")
+    ):
+        if headers not in extraktor.hlavicky:
+            chybi_element(popis)
+        cisla.append(ocisti_cislo(extraktor.hlavicky[headers]))
+    volici, vydane_obalky, platne_hlasy = cisla
+
+    return ObecData(
+        obec=jmeno_obce,
+        volici=volici,
+        vydane_obalky=vydane_obalky,
+        platne_hlasy=platne_hlasy,
+        strany=zpracuj_radky_stran(extraktor.radky_stran)
     )
 
 
+def chybi_element(popis: str) -> None:
+    """
+    Zaloguje chybějící element stránky a vyvolá DataParsingError.
+
+    Args:
+        popis (str): Popis hledaného prvku (např. 'název obce').
+
+    Raises:
+        DataParsingError: Vždy.
+    """
+    logging.error(f"Nepodařilo se najít element: {popis}")
+    raise DataParsingError(f"Chybí element: {popis}")
+
 
 def najdi_text_nebo_chybu(
     soup: BeautifulSoup, selector: str, popis: str
@@ -784,8 +2585,7 @@ def najdi_text_nebo_chybu(
     element = soup.select_one(selector)
     
     if element is None:
-        logging.error(f"Nepodařilo se najít element: {popis}")
-        raise DataParsingError(f"Chybí element: {popis}")
+        chybi_element(popis)
     
     return element.text.strip()
 
@@ -861,91 +2661,310 @@ def je_validni_radek(strana:str, hlasy_text: str) -> bool:
     return not (strana == "-" or hlasy_text == "-" or hlasy_text == "")
   
 
-def zkontroluj_vstupy() -> tuple[str, str]:
+class ParserArgumentu(argparse.ArgumentParser):
+    """
+    Parser argumentů příkazové řádky, který při chybě vypíše
+    vlastní chybovou hlášku a ukončí program s kódem 1.
+    """
+
+    def error(self, message: str) -> None:
+        logging.error(LOG_ERROR_ARGUMENTS_COUNT.format(error_detail=message))
+        print("\n" + SEPARATOR)
+        print(
+            Fore.LIGHTYELLOW_EX + 
+            MSG_ERROR_ARGUMENTS_COUNT.format(
+                script_name=self.prog, error_detail=message
+            )
+        )
+        print(SEPARATOR + "\n")
+        sys.exit(1)
+
+
+def kladne_cislo(hodnota: str) -> int:
+    """
+    Převede argument příkazové řádky na kladné celé číslo.
+
+    Args:
+        hodnota (str): Textová hodnota argumentu.
+
+    Returns:
+        int: Kladné celé číslo.
+
+    Raises:
+        argparse.ArgumentTypeError: Pokud hodnota není kladné celé číslo.
+
+    Example:
+        >>> kladne_cislo("8")
+            8
+    """
+    try:
+        cislo = int(hodnota)
+    except ValueError:
+        cislo = 0
+    if cislo < 1:
+        raise argparse.ArgumentTypeError(
+            f"očekávám kladné celé číslo, zadáno '{hodnota}'"
+        )
+    return cislo
+
+
+def kladne_desetinne_cislo(hodnota: str) -> float:
+    """
+    Převede argument příkazové řádky na kladné (desetinné) číslo.
+
+    Raises:
+        argparse.ArgumentTypeError: Pokud hodnota není kladné číslo.
+
+    Example:
+        >>> kladne_desetinne_cislo("0.5")
+            0.5
+    """
+    try:
+        cislo = float(hodnota)
+    except ValueError:
+        cislo = 0.0
+    if not cislo > 0:
+        raise argparse.ArgumentTypeError(
+            f"očekávám kladné číslo, zadáno '{hodnota}'"
+        )
+    return cislo
+
+
+def zkontroluj_vstupy(argv: List[str] = None) -> argparse.Namespace:
     """
     Zkontroluje správnost vstupních argumentů programu
-    (URL adresu okresu a název výstupního souboru).
-    Funkce ověřuje, že uživatel poskytl správný 
-    počet argumentů (2), a že tyto argumenty obsahují 
-    URL adresu okresu a název výstupního souboru. 
-    Pokud není zadaný správný počet argumentů,
+    (URL adresu okresu, název výstupního souboru a volitelné přepínače).
+    Funkce ověřuje, že uživatel poskytl oba povinné argumenty,
+    tedy URL adresu okresu a název výstupního souboru,
+    a že volitelné přepínače mají platné hodnoty.
+    Pokud argumenty nejsou v pořádku,
     funkce vypíše chybovou zprávu a ukončí program.
     
     Args:
-        Argumenty jsou získávány z 'sys.argv'
-        (vstupní argumenty příkazového řádku)
+        argv (List[str], optional): Seznam argumentů bez názvu skriptu.
+                                    Pokud není zadán, použije se
+                                    'sys.argv[1:]'.
     
     Returns:
-        tuple[str, str]: Dvojice obsahující:
-            - str: URL adresa okresu 
-                   (první argument)
-            - str: název výstupního souboru 
-                   (druhý argument)
+        argparse.Namespace: Objekt s atributy:
+            - url_okresu (str): URL adresa okresu nebo přehledu voleb
+            - vystupni_soubor (str): název výstupního souboru
+            - workers (int): počet vláken pro souběžné
+                             stahování obcí a okresů (výchozí 1), u enginu
+                             'asyncio' počet souběžných požadavků
+            - engine (str): způsob stahování obcí,
+                            'requests' (výchozí) nebo 'asyncio'
+            - cache (str): adresář diskové mezipaměti, nebo None
+            - cache_ttl (int): stáří záznamu v sekundách, do kterého
+                               se záznam neověřuje na serveru,
+                               nebo None (neověřuje se nikdy)
+            - refresh (bool): ověřit všechny záznamy mezipaměti
+                               na serveru (např. během sčítání)
+            - cache_max_mb (int): maximální velikost mezipaměti v MB
+            - parser (str): HTML parser, 'extraktor' (výchozí),
+                            'html.parser' nebo 'lxml'
+            - resume (bool): pokračovat v přerušeném běhu podle
+                             žurnálu (viz 'ZurnalObci')
+            - okrsky (bool): zpracovat místo obcí jednotlivé
+                             okrsky (viz 'ziskej_okrsky')
+            - max_rate (float): maximální počet požadavků za sekundu,
+                             nebo None (bez omezení)
+            - parse_workers (int): počet procesů pro parsování
+                             stránek obcí, nebo None (parsuje se
+                             ve vláknech stahování)
+            - record (str): archiv, do kterého se nahrají všechny
+                             stažené stránky, nebo None
+            - replay (str): archiv, ze kterého se stránky přehrají
+                             bez přístupu k síti, nebo None
+            - compact (bool): zapsat JSON bez odsazení
+            - stats (str): soubor JSON pro statistiky výsledků,
+                             nebo None
+            - souhrny (str): soubor JSON pro souhrny za okresy,
+                             kraje a stát, nebo None
+            - watch (float): interval sledování změn v sekundách,
+                             nebo None (jednorázový běh)
 
     Raises:
-        SystemExit: Pokud není zadán správný počet 
-                    argumentů nebo jsou nesprávně formátovány,
+        SystemExit: Pokud nejsou zadány povinné argumenty 
+                    nebo jsou nesprávně formátovány,
                     program vypíše chybovou zprávu a 
                     ukončí se s kódem 1.
 
     Examples:
-        import sys
-        sys.argv = (
-            ['election_scraper.py',
-            'https://www.volby.cz/pls/ps2017nss/ +
-            ps32?xjazyk=CZ&xkraj=14&xnumnuts=8102',
-            'vysledky.csv']
-        )
-        >>> zkontroluj_vstupy()
-            ('https://www.volby.cz/pls/ps2017nss/ +
-            ps32?xjazyk=CZ&xkraj=14&xnumnuts=8102',
-            'vysledky.csv'
+        >>> argumenty = zkontroluj_vstupy(
+                ['https://www.volby.cz/pls/ps2017nss/ +
+                ps32?xjazyk=CZ&xkraj=14&xnumnuts=8102',
+                'vysledky.csv', '--workers', '8']
             )
+        >>> argumenty.vystupni_soubor, argumenty.workers
+            ('vysledky.csv', 8)
 
-            sys.argv = (
-                ['election_scraper.py',
-                'https://www.volby.cz/pls/ps2017nss/ +
-                ps32?xjazyk=CZ&xkraj=14&xnumnuts=8102'
-                ]
+        >>> zkontroluj_vstupy(
+                ['https://www.volby.cz/pls/ps2017nss/ +
+                ps32?xjazyk=CZ&xkraj=14&xnumnuts=8102']
             )
-        >>> zkontrolu_vstupy()
-            Chyba: Musíte zadat dva argumenty -
-               URL okresu a název výstupního souboru.
-            Chyba: Nsprávný počet argumentů!
-            Použití: python election_scraper.py
-                 <URL_okresu> <vystupni_soubor.csv>
-            Příklad: python election_scraper.py
-                 "https://volby.cz/..." "vysledky.csv"
+            ❌ CHYBA PŘI SPUŠTĚNÍ:
+            Očekávám dva argumenty: URL okresu a název výstupního souboru.
+            ...
             SystemExit: 1
     """    
     
-    if len(sys.argv) != 3:
-        logging.error(LOG_ERROR_ARGUMENTS_COUNT)
-        print("\n" + SEPARATOR)
-        print(
-            Fore.LIGHTYELLOW_EX + 
-            MSG_ERROR_ARGUMENTS_COUNT.format(script_name=sys.argv[0])
-        )
-        print(SEPARATOR + "\n")
-        sys.exit(1)
+    parser = ParserArgumentu(
+        prog=os.path.basename(sys.argv[0]),
+        description="Stáhne volební výsledky obcí zadaného okresu."
+    )
+    parser.add_argument(
+        'url_okresu',
+        help="URL adresa okresu (ps32) nebo přehledu celých voleb (ps3)"
+    )
+    parser.add_argument(
+        'vystupni_soubor',
+        help="výstupní soubor (.csv, .json, .jsonl, .ndjson, .xml, "
+             ".parquet, .arrow, .sqlite, .db)"
+    )
+    parser.add_argument(
+        '--workers', type=kladne_cislo, default=VYCHOZI_POCET_VLAKEN,
+        metavar='N',
+        help="počet souběžně stahovaných obcí (výchozí 1)"
+    )
+    parser.add_argument(
+        '--engine', choices=(ENGINE_REQUESTS, ENGINE_ASYNCIO),
+        default=ENGINE_REQUESTS,
+        help="způsob stahování obcí: vlákna s 'requests' (výchozí) "
+             "nebo asynchronní 'asyncio' s knihovnou aiohttp"
+    )
+    parser.add_argument(
+        '--cache', metavar='ADRESAR',
+        help="adresář diskové mezipaměti stažených stránek"
+    )
+    platnost = parser.add_mutually_exclusive_group()
+    platnost.add_argument(
+        '--cache-ttl', type=kladne_cislo, metavar='SEKUNDY',
+        help="stáří záznamu, do kterého se mezipaměť neověřuje "
+             "na serveru (výchozí: zveřejněné výsledky se neověřují)"
+    )
+    platnost.add_argument(
+        '--refresh', action='store_true',
+        help="ověřit všechny stránky v mezipaměti na serveru "
+             "(podmíněným požadavkem), např. během sčítání hlasů"
+    )
+    parser.add_argument(
+        '--cache-max-mb', type=kladne_cislo,
+        default=VYCHOZI_VELIKOST_CACHE_MB, metavar='MB',
+        help="maximální velikost mezipaměti v MB, nejdéle nepoužité "
+             "stránky se odstraní (výchozí 500)"
+    )
+    parser.add_argument(
+        '--parser', choices=PODPOROVANE_PARSERY, default=VYCHOZI_PARSER,
+        help="parser stránek obcí: jednoprůchodový 'extraktor' "
+             "(výchozí) nebo BeautifulSoup s 'html.parser' či 'lxml'"
+    )
+    parser.add_argument(
+        '--max-rate', type=kladne_desetinne_cislo, metavar='N',
+        help="nejvýše N požadavků za sekundu pro všechna vlákna "
+             "(výchozí: bez omezení, zpomalí se jen na žádost serveru)"
+    )
+    parser.add_argument(
+        '--parse-workers', type=kladne_cislo, metavar='N',
+        help="počet procesů pro parsování stránek obcí "
+             "(výchozí: parsuje se ve vláknech stahování)"
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help="pokračovat v přerušeném běhu: obce uložené v žurnálu "
+             "'<vystupni_soubor>.zurnal' se znovu nestahují"
+    )
+    parser.add_argument(
+        '--okrsky', action='store_true',
+        help="zpracovat výsledky jednotlivých okrsků místo obcí "
+             "(řádek pro každý okrsek se sloupcem 'Okrsek')"
+    )
+    archiv = parser.add_mutually_exclusive_group()
+    archiv.add_argument(
+        '--record', metavar='ARCHIV',
+        help="nahrát všechny stažené stránky do archivu (ZIP)"
+    )
+    archiv.add_argument(
+        '--replay', metavar='ARCHIV',
+        help="přehrát stránky z archivu nahraného přepínačem "
+             "--record, bez přístupu k síti"
+    )
+    parser.add_argument(
+        '--compact', action='store_true',
+        help="zapsat výstup JSON bez odsazení, každou obec na jeden "
+             "řádek pole"
+    )
+    parser.add_argument(
+        '--stats', metavar='SOUBOR',
+        help="uložit statistiky výsledků (podíly stran, rozdělení "
+             "účasti, největší obce) do souboru JSON (vyžaduje numpy)"
+    )
+    parser.add_argument(
+        '--souhrny', metavar='SOUBOR',
+        help="uložit souhrny výsledků za okresy, kraje a celý stát "
+             "do souboru JSON a porovnat je se zveřejněnými výsledky "
+             "okresů"
+    )
+    parser.add_argument(
+        '--watch', type=kladne_desetinne_cislo, metavar='SEKUNDY',
+        help="sledovat změny výsledků: každých SEKUNDY sekund ověřit "
+             "stránky obcí a při změně přepsat výstup (ukončení Ctrl+C)"
+    )
+    argumenty = parser.parse_args(argv)
+
+    if argumenty.engine == ENGINE_ASYNCIO and aiohttp is None:
+        parser.error(LOG_ERROR_AIOHTTP_MISSING.strip())
+    if argumenty.parser == PARSER_LXML and lxml is None:
+        parser.error(LOG_ERROR_LXML_MISSING.strip())
+    if argumenty.stats and np is None:
+        parser.error(LOG_ERROR_NUMPY_MISSING.strip())
+    if argumenty.replay and not (
+        os.path.isfile(argumenty.replay)
+        and zipfile.is_zipfile(argumenty.replay)
+    ):
+        parser.error(LOG_ERROR_ARCHIV.format(soubor=argumenty.replay))
+    if argumenty.watch and (
+        argumenty.resume or argumenty.record or argumenty.replay
+        or argumenty.okrsky or argumenty.engine == ENGINE_ASYNCIO
+    ):
+        parser.error(LOG_ERROR_WATCH.strip())
 
-    url_okresu = sys.argv[1]
-    vystupni_soubor = sys.argv[2]
-    return url_okresu, vystupni_soubor
+    return argumenty
 
 
-def ziskej_obce(url_okresu) -> list[dict]:
+def ziskej_obce(
+    url_okresu,
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER,
+    workers: int = VYCHOZI_POCET_VLAKEN,
+    stats: dict = None
+) -> list[dict]:
     """
     Validuje URL adresu a získává seznam obcí ke zpracování.
     Funkce nejprve validuje zadanou URL adresu okresu, 
     a pokud je platná, pokračuje získáním seznamu obcí, 
     které budou dále zpracovávány.
+    Stránka okresu se stahuje pouze jednou: validace kontroluje
+    jen tvar URL a dostupnost stránky ověří samotné stažení
+    seznamu obcí (se společnými pravidly pro opakování).
     Pokud není nalezen žádný odkaz na obce,
     funkce vypíše chybovou hlášku a ukončí program.
+    Je-li zadán přehled celých voleb (stránka ps3), získá obce
+    všech okresů (viz 'ziskej_obce_voleb') a každá obec má navíc
+    klíč 'okres' s názvem okresu.
 
     Args:
-        url_okresu(str): URL adresa okresu, ze které
-                         budou získány odkazy obce
+        url_okresu(str): URL adresa okresu (ps32), ze které
+                         budou získány odkazy obce, nebo přehledu
+                         voleb (ps3)
+        session(requests.Session, optional): Sdílená session
+                         pro všechny požadavky (viz 'stahni_data').
+        parser(str, optional): HTML parser (viz 'parsuj_html').
+        workers(int, optional): Počet souběžně stahovaných okresů
+                         při zpracování celých voleb.
+        stats(dict, optional): Statistiky běhu, ke klíči 'chyby'
+                         se připočtou přeskočené okresy
+                         (viz 'ziskej_obce_voleb').
     Returns:
         list[dict]: Seznam slovníků, kde každý slovník 
                     obsahuje informace o obci.
@@ -985,7 +3004,9 @@ def ziskej_obce(url_okresu) -> list[dict]:
     )
     
     try:
-        validuj_url(url_okresu)
+        # Dostupnost ověří až stažení seznamu obcí níže,
+        # stránka okresu se tak stahuje jen jednou
+        validuj_url(url_okresu, session=session, over_dostupnost=False)
         logging.info(LOG_INFO_URL_VALIDATED.format(url=url_okresu))
     except ValidationError as e:
         logging.error(
@@ -1008,7 +3029,15 @@ def ziskej_obce(url_okresu) -> list[dict]:
     
     logging.info(LOG_INFO_GETTING_OBCE.format(url=url_okresu))
     try:
-        obce = ziskej_linky_okrsku(url_okresu)
+        if typ_stranky(url_okresu) == STRANKA_PREHLEDU:
+            obce = ziskej_obce_voleb(
+                url_okresu, session=session, parser=parser,
+                workers=workers, stats=stats
+            )
+        else:
+            obce = ziskej_linky_okrsku(
+                url_okresu, session=session, parser=parser
+            )
         if not obce: # Kontrola, zda se obce opravdu našly
             raise NoDataFoundError(
                 LOG_RAISE_NO_DATA_FOUND.format(url=url_okresu)
@@ -1064,211 +3093,2766 @@ def ziskej_obce(url_okresu) -> list[dict]:
         sys.exit(1)
    
 
-def zpracuj_obce(obce) -> tuple[list, dict]:
+def spust_paralelne(
+    funkce: Callable[[Any], Any],
+    polozky: Iterable[Any],
+    pocet_vlaken: int = VYCHOZI_POCET_VLAKEN,
+    executor: ThreadPoolExecutor = None
+) -> Iterator[Tuple[Any, Future]]:
+    """
+    Spouští funkci pro jednotlivé položky souběžně v omezeném
+    počtu vláken a vrací výsledky ve stejném pořadí, v jakém
+    byly položky zadány.
+    Funkce udržuje rozpracovaných nejvýše dvojnásobek počtu vláken,
+    další položky odesílá ke zpracování až ve chvíli, kdy si
+    volající převezme výsledek nejstarší položky. Paměť tak neroste
+    s délkou vstupu a přerušení (např. Ctrl-C) zruší
+    všechny dosud nespuštěné úlohy. Volající proto generátor
+    uzavírá pomocí 'contextlib.closing', aby se úlohy zrušily
+    hned při výjimce, a ne až při úklidu generátoru.
+
+    Args:
+        funkce (callable): Funkce, která se zavolá pro každou položku.
+        polozky (iterable): Položky ke zpracování (např. seznam obcí).
+        pocet_vlaken (int, optional): Maximální počet souběžně
+                                      běžících vláken. Výchozí je 1.
+        executor (ThreadPoolExecutor, optional): Existující pool
+                                      vláken, který se po dokončení
+                                      neukončí (např. mezi cykly
+                                      sledování změn). Jinak se
+                                      vytvoří nový.
+
+    Returns:
+        Iterator[Tuple[Any, Future]]: Dvojice (položka, future)
+                                      v pořadí vstupu. Výsledek nebo
+                                      výjimku získá volající
+                                      voláním 'future.result()'.
+
+    Example:
+        >>> with contextlib.closing(spust_paralelne(
+        ...     lambda obec: ziskej_data_obce(obec['url']), obce, 8
+        ... )) as stahovani:
+        ...     for obec, future in stahovani:
+        ...         data = future.result()
+    """
+    okno = max(1, pocet_vlaken) * 2
+    iterator = iter(polozky)
+    fronta = deque()
+
+    vlastni = executor is None
+    if vlastni:
+        executor = ThreadPoolExecutor(max_workers=max(1, pocet_vlaken))
+    try:
+        for polozka in islice(iterator, okno):
+            fronta.append((polozka, executor.submit(funkce, polozka)))
+
+        while fronta:
+            # Na místo převzaté položky hned odešli další
+            for polozka in islice(iterator, 1):
+                fronta.append(
+                    (polozka, executor.submit(funkce, polozka))
+                )
+            yield fronta.popleft()
+    finally:
+        # Při přerušení zruš úlohy, které se ještě nezačaly
+        for _, future in fronta:
+            future.cancel()
+        if vlastni:
+            executor.shutdown()
+
+
+def zpracuj_obce(
+    obce,
+    workers: int = VYCHOZI_POCET_VLAKEN,
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER,
+    zapisovac: "ZapisovacVysledku" = None,
+    zurnal: "ZurnalObci" = None,
+    parsovaci_pool: Executor = None,
+    registr: "RegistrStran" = None,
+    souhrny: "SouhrnyUzemi" = None
+) -> tuple["TabulkaVysledku", dict]:
     """
     Zpracuje seznam obcí a získá volební data pro každou obec.
     Funkce projde seznam obcí, pro každou obec stáhne a
     zpracuje její volební data, včetně počtu voličů, 
     vydaných obálek, platných hlasů a hlasů pro 
     jednotlivé strany.
+    Stahování a parsování obcí probíhá souběžně v 'workers'
+    vláknech (viz 'spust_paralelne'), výsledky se však
+    vyhodnocují v původním pořadí obcí, takže pořadí řádků,
+    statistiky i ošetření chyb jednotlivých obcí zůstávají stejné
+    jako při postupném zpracování.
     Vytvoří výstupní seznam, který obsahuje výsledky 
     pro každou obec, a také statistiky o celkovém počtu 
     zpracovaných obcí, celkovém počtu voličů a platných hlasů.
 
     Args:
-        obce (list): Seznam slovníků, kde každý slovník 
-                     obsahuje informace o obci, 
-                     včetně URL adresy a čísla obce.
+        obce (list): Seznam slovníků, kde každý slovník 
+                     obsahuje informace o obci, 
+                     včetně URL adresy a čísla obce.
+        workers (int, optional): Počet souběžně stahovaných obcí.
+                                 Výchozí hodnota je 1.
+        session (requests.Session, optional): Sdílená session
+                                 s poolem spojení, kterou používají
+                                 všechna vlákna (viz 'StahovaciSession').
+        parser (str, optional): HTML parser (viz 'parsuj_html').
+        zapisovac (ZapisovacVysledku, optional): Průběžný zápis
+                                 výsledků. Pokud je zadán, každý řádek
+                                 se zapíše do souboru hned po zpracování
+                                 obce. V paměti zůstane jen ve sloupcové
+                                 tabulce výsledků (pro statistiky).
+        zurnal (ZurnalObci, optional): Žurnál dokončených obcí. Obce,
+                                 které v něm již jsou, se nestahují
+                                 a jejich data se převezmou ze žurnálu,
+                                 nově zpracované obce se do něj zapíší.
+        parsovaci_pool (Executor, optional): Pool procesů pro
+                                 parsování stránek obcí (viz
+                                 'ziskej_data_obce'). Vlákna pak jen
+                                 stahují a parsování se rozloží
+                                 na více jader.
+        registr (RegistrStran, optional): Registr stran, do kterého
+                                 se registrují strany stažených obcí
+                                 i obcí převzatých ze žurnálu. Sdílí ho
+                                 zapisovač i vrácená tabulka výsledků.
+                                 Pokud není zadán, vytvoří se nový.
+        souhrny (SouhrnyUzemi, optional): Průběžné souhrny za okresy,
+                                 kraje a stát, ke kterým se připočte
+                                 řádek každé zpracované obce.
+
+    Returns:
+        tuple: Dvojice, kde:
+            - TabulkaVysledku: Výsledky volebních dat pro každou
+                    obec ve sloupcovém úložišti, které se chová
+                    jako seznam řádků; každý řádek obsahuje
+                    číslo obce, název obce, voliče, vydané obálky, 
+                    platné hlasy a hlasy pro jednotlivé strany.
+            
+            - dict: Statistiky zpracování, obsahující:
+                - 'zpracovane_obce': Počet zpracovaných obcí
+                - 'chyby': Počet chyb při zpracování obcí
+                - 'celkem_volicu': Celkový počet voličů pro všechny
+                                   zpracované obce
+                - 'celkem_platnych_hlasu': Celkový počet platných hlasů
+                                           pro všechny zpracované obce
+
+    Examples:
+        obce = (
+            [{'url': 'https://www.volby.cz/pls/ps2021nss/
+            ps311?xjazyk=CZ&xkraj=14&xobec=598925',
+            'cislo_obce': '598925', 
+            'nazev_obce': 'Albrechtice'}, ...
+            ]
+        )
+        >>> vysledky, stats = zpracuj_obce(obce, workers=8)
+        vysledky
+        [{'Číslo obce': '598925', 'Název obce': 'Albrechtice',
+          'Voliči': 3173,'Vydané obálky': 1957, 
+          'Platné hlasy': 1944, 'ANO 2011': 635, ...}, ...
+        ]
+        stats
+        {'zpracovane_obce': 17, 'chyby': 0, 
+         'celkem_volicu': 106196,
+         'celkem_platnych_hlasu': 106196}
+    
+    Note:
+        Funkce používá knihovnu 'tqdm'.
+        Pokud není nainstalována, je třeba ji nainstalovat
+        pomocí 'pip install tqdm'
+    """
+    
+    if registr is None:
+        registr = RegistrStran()
+    vysledky = TabulkaVysledku(registr=registr)
+    uloz_radek = zapis_a_pridej(zapisovac, vysledky)
+    # Přidáme statistiky
+    stats = {
+        'zpracovane_obce': 0,
+        'chyby': 0,
+        'celkem_volicu': 0,
+        'celkem_platnych_hlasu': 0
+    }
+
+    print("\n" + Fore.LIGHTCYAN_EX + MSG_INFO_PROCESSING_DATA + "\n")
+    logging.info(LOG_INFO_PROCESSING_OBCE.format(workers=workers))
+    
+    total_obce = len(obce)
+    print(
+        "\n" + Fore.LIGHTCYAN_EX + 
+        MSG_INFO_COUNT_OBCE.format(total=total_obce) + "\n"
+    )
+    
+    def ziskej(obec: Okrsek) -> ObecData:
+        # Obec dokončená v přerušeném běhu se znovu nestahuje
+        if zurnal and klic_obce(obec) in zurnal.hotove:
+            data = zurnal.hotove[klic_obce(obec)]
+            registr.oznac(data['strany'])
+            return data
+        return ziskej_data_obce(
+            obec['url'], session=session, parser=parser,
+            parsovaci_pool=parsovaci_pool, registr=registr
+        )
+
+    # Souběžné stahování obcí, vyhodnocení v původním pořadí
+    with contextlib.closing(
+        spust_paralelne(ziskej, obce, workers)
+    ) as stahovani:
+        # Zpracování každé obce s progress barem
+        for i, (obec, future) in enumerate(
+            tqdm(
+                stahovani, total=total_obce,
+                desc="Zpracovávám obce", unit="obec"
+            )
+        ):
+            radek = vyhodnot_obec(i, total_obce, obec, future, stats, zurnal)
+            if radek is not None:
+                uloz_radek(radek)
+                if souhrny is not None:
+                    souhrny.pridej(obec, radek)
+    
+    print("\n")
+    logging.info(LOG_INFO_OBCE_PROCESSED)
+    return vysledky, stats
+
+
+async def _stahni_obsah_async(
+    session: "aiohttp.ClientSession",
+    url: str,
+    cache: DiskovaCache = None,
+    zaznam: dict = None,
+    omezovac: OmezovacRychlosti = None
+) -> Tuple[bytes, str]:
+    """
+    Provede jeden asynchronní GET požadavek a vrátí obsah stránky
+    jako bajty spolu s kódováním, které deklaruje server.
+    Chyby knihovny aiohttp převádí na odpovídající výjimky
+    knihovny requests, aby je bylo možné ošetřit stejně
+    jako při synchronním stahování (viz 'zpracuj_vyjimku').
+    Je-li zadán záznam mezipaměti, pošle podmíněný požadavek
+    a při odpovědi 304 vrátí obsah z mezipaměti. Zápis do mezipaměti
+    běží ve výchozím executoru, aby souborové operace neblokovaly
+    event loop.
+
+    Args:
+        session (aiohttp.ClientSession): Sdílená asynchronní session.
+        url (str): URL adresa stránky.
+        cache (DiskovaCache, optional): Disková mezipaměť stránek.
+        zaznam (dict, optional): Dosavadní záznam mezipaměti pro URL.
+        omezovac (OmezovacRychlosti, optional): Omezovač rychlosti,
+                                 kterému se hlásí úspěšné požadavky.
+
+    Returns:
+        Tuple[bytes, str]: Obsah stránky a deklarované kódování
+                           (viz 'deklarovane_kodovani').
+
+    Raises:
+        requests.exceptions.Timeout: Pokud vyprší časový limit.
+        requests.exceptions.HTTPError: Pokud server vrátí chybový kód.
+        requests.exceptions.ConnectionError: Při jiné chybě spojení.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        async with session.get(
+            url, headers=DiskovaCache.podminene_hlavicky(zaznam)
+        ) as response:
+            if zaznam and response.status == 304:
+                if omezovac:
+                    omezovac.uspech()
+                await loop.run_in_executor(
+                    None, cache.obnov, url, zaznam, response.headers
+                )
+                cache.zapocitej('cache_zasahy')
+                cache.zapocitej('cache_revalidace')
+                return _obsah_z_cache(zaznam)
+            if response.status >= 400:
+                raise http_chyba(
+                    url, response.status, response.reason,
+                    response.headers
+                )
+            obsah = await response.read()
+            if omezovac:
+                omezovac.uspech()
+            content_type = response.headers.get('Content-Type')
+            if cache:
+                await loop.run_in_executor(
+                    None, cache.uloz, url, obsah, response.headers,
+                    deklarovane_kodovani(content_type)
+                )
+                cache.zapocitej('cache_minuti')
+            return obsah, deklarovane_kodovani(content_type)
+
+    except asyncio.TimeoutError as e:
+        raise Timeout(f"Vypršel časový limit pro URL: {url}") from e
+
+    except aiohttp.ClientResponseError as e:
+        raise http_chyba(url, e.status, e.message, e.headers or {}) from e
+
+    except aiohttp.ClientError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+
+
+def _obsah_z_cache(zaznam: dict) -> Tuple[bytes, str]:
+    # Obsah a deklarované kódování uložené stránky
+    return (
+        zaznam['obsah'],
+        deklarovane_kodovani(zaznam.get('content_type'))
+    )
+
+
+async def stahni_data_async(
+    session: "aiohttp.ClientSession",
+    url: str,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU,
+    cache: DiskovaCache = None,
+    omezovac: OmezovacRychlosti = None,
+    archiv: ArchivStranek = None
+) -> Tuple[bytes, str]:
+    """
+    Asynchronní obdoba funkce 'stahni_data'.
+    Stáhne obsah URL adresy s možností několika pokusů
+    v případě chyby. Pravidla pro opakování a logování chyb jsou
+    stejná jako u 'stahni_data', mezi pokusy se však čeká
+    pomocí 'asyncio.sleep', takže čekání neblokuje ostatní požadavky.
+    Mezipaměť, omezovač rychlosti a archiv stránek se používají
+    stejně jako v 'stahni_data', jejich čtení a zápis souborů však
+    běží ve výchozím executoru mimo event loop.
+
+    Args:
+        session (aiohttp.ClientSession): Sdílená asynchronní session.
+        url (str): URL adresa stránky, ze které se mají stáhnout data.
+        max_pokusu (int, optional): Maximální počet pokusů o stažení.
+                                    Výchozí hodnota jsou 3 pokusy.
+        cache (DiskovaCache, optional): Disková mezipaměť stránek.
+        omezovac (OmezovacRychlosti, optional): Společný omezovač
+                                    rychlosti požadavků.
+        archiv (ArchivStranek, optional): Archiv pro nahrávání
+                                    nebo přehrávání stránek.
+
+    Returns:
+        Tuple[bytes, str]: Obsah stažené stránky a kódování,
+                           které deklaruje server.
+
+    Raises:
+        RequestException: Pokud všechny pokusy o stažení selžou.
+
+    Example:
+        >>> async with aiohttp.ClientSession() as session:
+        ...     obsah, kodovani = await stahni_data_async(session, url)
+    """
+
+    loop = asyncio.get_running_loop()
+    if archiv and archiv.prehravani:
+        return _obsah_z_cache(
+            await loop.run_in_executor(None, archiv.prehraj, url)
+        )
+
+    obsah, kodovani = await _stahni_ze_site_async(
+        session, url, max_pokusu, cache, omezovac
+    )
+    if archiv:
+        # Z hlaviček je pro parsování podstatné jen deklarované kódování
+        hlavicky = {'Content-Type': f'text/html; charset={kodovani}'}
+        await loop.run_in_executor(
+            None, archiv.uloz, url, obsah,
+            hlavicky if kodovani else {}, kodovani
+        )
+    return obsah, kodovani
+
+
+async def _stahni_ze_site_async(
+    session: "aiohttp.ClientSession",
+    url: str,
+    max_pokusu: int,
+    cache: DiskovaCache,
+    omezovac: OmezovacRychlosti
+) -> Tuple[bytes, str]:
+    # Stažení s mezipamětí, omezovačem a opakováním
+    # (viz 'stahni_data_async')
+    zaznam = None
+    if cache:
+        loop = asyncio.get_running_loop()
+        zaznam = await loop.run_in_executor(None, cache.nacti, url)
+    if zaznam and cache.je_cerstvy(zaznam):
+        cache.zapocitej('cache_zasahy')
+        return _obsah_z_cache(zaznam)
+
+    for pokus in range(max_pokusu):
+        if omezovac:
+            cekani = omezovac.rezervuj()
+            if cekani:
+                await asyncio.sleep(cekani)
+        try:
+            return await _stahni_obsah_async(
+                session, url, cache, zaznam, omezovac
+            )
+
+        except requests.exceptions.RequestException as e:
+            zpracuj_vyjimku(e, pokus, max_pokusu, "stahování dat")
+            # Počkej před dalším pokusem
+            await asyncio.sleep(doba_cekani(e, pokus, omezovac))
+
+
+async def ziskej_data_obce_async(
+    session: "aiohttp.ClientSession",
+    url: str,
+    max_pokusu: int = VYCHOZI_MAX_POKUSU,
+    cache: DiskovaCache = None,
+    parser: str = VYCHOZI_PARSER,
+    parsovaci_pool: Executor = None,
+    omezovac: OmezovacRychlosti = None,
+    archiv: ArchivStranek = None,
+    registr: "RegistrStran" = None
+) -> ObecData:
+    """
+    Asynchronní obdoba funkce 'ziskej_data_obce'.
+    Stáhne stránku obce pomocí 'stahni_data_async' a její
+    parsování ('parsuj_data_obce') spustí v executoru, aby
+    parsování neblokovalo ostatní požadavky: v 'parsovaci_pool',
+    je-li zadán, jinak ve výchozím executoru event loopu.
+
+    Args:
+        session (aiohttp.ClientSession): Sdílená asynchronní session.
+        url (str): URL adresa stránky obce.
+        max_pokusu (int, optional): Maximální počet pokusů o stažení.
+                                    Výchozí hodnota je 3.
+        cache (DiskovaCache, optional): Disková mezipaměť stránek.
+        parser (str, optional): HTML parser (viz 'parsuj_html').
+        parsovaci_pool (Executor, optional): Pool procesů pro
+                                    parsování (viz 'ziskej_data_obce').
+        omezovac (OmezovacRychlosti, optional): Společný omezovač
+                                    rychlosti požadavků.
+        archiv (ArchivStranek, optional): Archiv pro nahrávání
+                                    nebo přehrávání stránek.
+        registr (RegistrStran, optional): Registr stran běhu
+                                    (viz 'ziskej_data_obce').
+
+    Returns:
+        ObecData: Stejná data, jaká vrací 'ziskej_data_obce'.
+
+    Raises:
+        DataParsingError: Pokud dojde k chybě při parsování dat.
+        RequestException: Pokud se stránku nepodaří stáhnout.
+    """
+    obsah, kodovani = await stahni_data_async(
+        session, url, max_pokusu, cache, omezovac, archiv
+    )
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(
+        parsovaci_pool, parsuj_data_obce, obsah, parser, kodovani
+    )
+    if registr is not None:
+        registr.oznac(data['strany'])
+    return data
+
+
+async def zpracuj_obce_async(
+    obce,
+    max_soubeznych: int = VYCHOZI_POCET_VLAKEN,
+    session: "aiohttp.ClientSession" = None,
+    cache: DiskovaCache = None,
+    parser: str = VYCHOZI_PARSER,
+    zapisovac: "ZapisovacVysledku" = None,
+    zurnal: "ZurnalObci" = None,
+    parsovaci_pool: Executor = None,
+    omezovac: OmezovacRychlosti = None,
+    archiv: ArchivStranek = None,
+    registr: "RegistrStran" = None,
+    souhrny: "SouhrnyUzemi" = None
+) -> tuple["TabulkaVysledku", dict]:
+    """
+    Asynchronní obdoba funkce 'zpracuj_obce'.
+    Stahuje stránky obcí pomocí knihovny aiohttp s nejvýše
+    'max_soubeznych' rozpracovanými požadavky. Stejně jako
+    'spust_paralelne' vytváří úlohy jen pro okno dvojnásobku
+    'max_soubeznych' obcí a další úlohu přidá, až se převezme
+    výsledek nejstarší obce, takže počet stažených a dosud
+    nezapsaných stránek neroste s počtem obcí. Výsledky vyhodnocuje
+    v původním pořadí obcí stejnou funkcí ('vyhodnot_obec') jako
+    synchronní zpracování, takže výstupní řádky, statistiky
+    i ošetření chyb jsou totožné.
+    Funkci lze volat i z vlastního event loopu a předat jí
+    sdílenou session, např. při zpracování více okresů najednou.
+
+    Args:
+        obce (list): Seznam obcí (Okrsek) ke zpracování.
+        max_soubeznych (int, optional): Maximální počet souběžných
+                                        požadavků. Výchozí hodnota je 1.
+        session (aiohttp.ClientSession, optional): Sdílená session.
+                                        Pokud není zadána, funkce
+                                        si vytvoří vlastní s poolem
+                                        spojení (keep-alive) a do
+                                        statistik doplní počet nových
+                                        a znovu použitých spojení.
+        cache (DiskovaCache, optional): Disková mezipaměť stránek
+                                        (viz 'stahni_data').
+        parser (str, optional): HTML parser (viz 'parsuj_html').
+        zapisovac (ZapisovacVysledku, optional): Průběžný zápis
+                                        výsledků (viz 'zpracuj_obce').
+        zurnal (ZurnalObci, optional): Žurnál dokončených obcí
+                                        (viz 'zpracuj_obce').
+        parsovaci_pool (Executor, optional): Pool procesů pro
+                                        parsování (viz 'zpracuj_obce').
+        omezovac (OmezovacRychlosti, optional): Omezovač rychlosti
+                                        (viz 'stahni_data').
+        archiv (ArchivStranek, optional): Archiv stránek
+                                        (viz 'stahni_data').
+        registr (RegistrStran, optional): Registr stran
+                                        (viz 'zpracuj_obce').
+        souhrny (SouhrnyUzemi, optional): Souhrny za územní celky
+                                        (viz 'zpracuj_obce').
+
+    Returns:
+        tuple[list, dict]: Výsledky a statistiky ve stejném tvaru,
+                           jaký vrací 'zpracuj_obce'.
+
+    Example:
+        >>> vysledky, stats = asyncio.run(zpracuj_obce_async(obce, 16))
+    """
+
+    if session is None:
+        # Vlastní session s poolem spojení a počítáním jejich využití
+        spojeni = {'nova_spojeni': 0, 'znovupouzita_spojeni': 0}
+
+        async def nove_spojeni(*_) -> None:
+            spojeni['nova_spojeni'] += 1
+
+        async def znovupouzite_spojeni(*_) -> None:
+            spojeni['znovupouzita_spojeni'] += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(nove_spojeni)
+        trace.on_connection_reuseconn.append(znovupouzite_spojeni)
+
+        connector = aiohttp.TCPConnector(
+            limit=max_soubeznych, limit_per_host=max_soubeznych
+        )
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=VYCHOZI_TIMEOUT),
+            trace_configs=[trace]
+        ) as vlastni_session:
+            vysledky, stats = await zpracuj_obce_async(
+                obce, max_soubeznych, vlastni_session, cache, parser,
+                zapisovac, zurnal, parsovaci_pool, omezovac, archiv,
+                registr, souhrny
+            )
+        stats.update(spojeni)
+        return vysledky, stats
+
+    if registr is None:
+        registr = RegistrStran()
+    vysledky = TabulkaVysledku(registr=registr)
+    uloz_radek = zapis_a_pridej(zapisovac, vysledky)
+    stats = {
+        'zpracovane_obce': 0,
+        'chyby': 0,
+        'celkem_volicu': 0,
+        'celkem_platnych_hlasu': 0
+    }
+
+    print("\n" + Fore.LIGHTCYAN_EX + MSG_INFO_PROCESSING_DATA + "\n")
+    logging.info(
+        LOG_INFO_PROCESSING_OBCE_ASYNC.format(workers=max_soubeznych)
+    )
+
+    total_obce = len(obce)
+    print(
+        "\n" + Fore.LIGHTCYAN_EX + 
+        MSG_INFO_COUNT_OBCE.format(total=total_obce) + "\n"
+    )
+
+    semafor = asyncio.Semaphore(max_soubeznych)
+
+    async def ziskej_s_limitem(obec: Okrsek) -> ObecData:
+        # Obec dokončená v přerušeném běhu se znovu nestahuje
+        if zurnal and klic_obce(obec) in zurnal.hotove:
+            data = zurnal.hotove[klic_obce(obec)]
+            registr.oznac(data['strany'])
+            return data
+        async with semafor:
+            return await ziskej_data_obce_async(
+                session, obec['url'], cache=cache, parser=parser,
+                parsovaci_pool=parsovaci_pool, omezovac=omezovac,
+                archiv=archiv, registr=registr
+            )
+
+    # Okno rozpracovaných úloh (viz 'spust_paralelne')
+    okno = max(1, max_soubeznych) * 2
+    iterator = iter(obce)
+    fronta = deque(
+        (obec, asyncio.create_task(ziskej_s_limitem(obec)))
+        for obec in islice(iterator, okno)
+    )
+    try:
+        with tqdm(
+            total=total_obce, desc="Zpracovávám obce", unit="obec"
+        ) as prubeh:
+            for i in range(total_obce):
+                # Na místo převzaté obce hned spusť další
+                for obec in islice(iterator, 1):
+                    fronta.append(
+                        (obec, asyncio.create_task(ziskej_s_limitem(obec)))
+                    )
+                obec, uloha = fronta.popleft()
+                # Počkej na dokončení úlohy, výjimku vyhodnotí
+                # vyhodnot_obec
+                await asyncio.wait([uloha])
+                radek = vyhodnot_obec(
+                    i, total_obce, obec, uloha, stats, zurnal
+                )
+                if radek is not None:
+                    uloz_radek(radek)
+                    if souhrny is not None:
+                        souhrny.pridej(obec, radek)
+                prubeh.update()
+    finally:
+        for _, uloha in fronta:
+            uloha.cancel()
+
+    print("\n")
+    logging.info(LOG_INFO_OBCE_PROCESSED)
+    return vysledky, stats
+
+
+def vyhodnot_obec(
+    poradi: int,
+    total_obce: int,
+    obec: Okrsek,
+    future: Future,
+    stats: dict,
+    zurnal: "ZurnalObci" = None
+) -> dict:
+    """
+    Vyhodnotí výsledek stahování jedné obce, započítá ho
+    do statistik a vrátí výstupní řádek.
+    Funkce převezme data obce z dokončené úlohy ('future'),
+    sestaví z nich výstupní řádek a aktualizuje statistiky.
+    Pokud úloha skončila chybou, chybu zaloguje, vypíše
+    uživateli a obec přeskočí (započítá ji mezi chyby).
+    Funkci sdílí synchronní i asynchronní zpracování obcí.
+
+    Args:
+        poradi (int): Pořadí obce v seznamu (0-indexováno).
+        total_obce (int): Celkový počet obcí ke zpracování.
+        obec (Okrsek): Informace o obci (URL, číslo a název).
+        future (Future): Dokončená úloha, jejíž metoda 'result()'
+                         vrací ObecData nebo vyvolá výjimku
+                         (concurrent.futures.Future i asyncio.Task).
+        stats (dict): Statistiky zpracování, které se aktualizují.
+        zurnal (ZurnalObci, optional): Žurnál, do kterého se zapíší
+                         data úspěšně zpracované obce.
+
+    Returns:
+        dict: Výstupní řádek obce, nebo None, pokud byla obec
+              kvůli chybě přeskočena.
+    """
+    obec_nazev = obec['nazev_obce']
+    # V režimu '--okrsky' i s číslem okrsku (viz 'klic_obce')
+    obec_cislo = klic_obce(obec)
+    # Výpis aktuální obce
+    print(
+        MSG_INFO_PROCESSING_OBCE.format(
+        cislo=poradi+1, total=total_obce, 
+        obec_nazev=obec_nazev, obec_cislo=obec_cislo
+        )
+    )
+
+    try:
+        logging.debug(
+            LOG_DEBUG_PROCESSING_OBCE.format(
+                obec_nazev=obec_nazev,
+                obec_cislo=obec_cislo,
+                url=obec['url']
+            )
+        )
+        data = future.result()
+        if zurnal:
+            zurnal.zapis(obec_cislo, data)
+        radek = sestav_radek(obec, data)
+
+        # Aktualizace statistik
+        stats['zpracovane_obce'] += 1
+        stats['celkem_volicu'] += data['volici']
+        stats['celkem_platnych_hlasu'] += data['platne_hlasy']
+        logging.debug(
+            LOG_DEBUG_OBCE_PROCESSED.format(
+                obec_nazev=obec_nazev,
+                obec_cislo=obec_cislo
+            )   
+        )
+        return radek
+
+    except (ValueError, DataParsingError) as e:
+        vypis_chybu(
+            LOG_ERROR_PARSING_ERROR, obec_nazev, obec_cislo, e
+        )
+        stats['chyby'] += 1
+        return # Pokračuj na další obec
+
+    except requests.exceptions.RequestException as e:
+        vypis_chybu(
+            LOG_ERROR_REQUEST_OBCE_FAILED, obec_nazev, obec_cislo, e
+        )
+        stats['chyby'] += 1
+        return # Pokračuj na další obec
+
+    except Exception as e:
+        logging.error(
+            LOG_ERROR_UNEXPECTED_OBCE.format(
+                obec_nazev=obec_nazev,
+                obec_cislo=obec_cislo,
+                error_detail=e
+            ), exc_info=True
+        )
+        print("\n" + SEPARATOR)
+        print(
+            Fore.LIGHTYELLOW_EX + MSG_ERROR_UNEXPECTED.format(
+                operation=(
+                    f"zpracování obce {obec_nazev} ({obec_cislo}). "
+                    "Tato obec bude přeskočena."
+                ),
+                error_detail=e
+            )
+        )
+        print(SEPARATOR + "\n")
+        stats['chyby'] += 1
+        return # Pokračuj na další obec
+
+
+def zapis_a_pridej(
+    zapisovac: "ZapisovacVysledku", vysledky: "TabulkaVysledku"
+) -> Callable[[dict], None]:
+    """
+    Vrátí funkci, která řádek obce zapíše zapisovačem (je-li
+    zadán) a přidá do tabulky výsledků. Tabulka drží jen čísla
+    ve sloupcích, takže i pro celé volby zabere kolem 2 MB (roste
+    však s počtem obcí, viz 'TabulkaVysledku') a nad ní se
+    na konci spočítají statistiky (viz 'vypis_statistiky').
+    """
+    if zapisovac is None:
+        return vysledky.pridej
+
+    def uloz_radek(radek: dict) -> None:
+        zapisovac.zapis(radek)
+        vysledky.pridej(radek)
+    return uloz_radek
+
+
+def sestav_radek(obec: Okrsek, data: ObecData) -> dict:
+    """
+    Sestaví výstupní řádek obce: pevné sloupce (při zpracování
+    celých voleb na začátku i okres) a hlasy stran v pořadí,
+    v jakém jsou na stránce obce.
+
+    Args:
+        obec (Okrsek): Informace o obci (číslo, případně okres
+                       a číslo okrsku).
+        data (ObecData): Zpracovaná data obce.
+
+    Returns:
+        dict: Výstupní řádek obce.
+    """
+    # Při zpracování celých voleb je první sloupec okres
+    radek = {SLOUPEC_OKRES: obec['okres']} if 'okres' in obec else {}
+    radek.update({
+        'Číslo obce': obec['cislo_obce'],
+        'Název obce': data['obec']
+    })
+    # V režimu '--okrsky' následuje za obcí číslo okrsku
+    if 'okrsek' in obec:
+        radek[SLOUPEC_OKRSEK] = obec['okrsek']
+    radek.update({
+        'Voliči': data['volici'],
+        'Vydané obálky': data['vydane_obalky'],
+        'Platné hlasy': data['platne_hlasy']
+    })
+
+    for strana in data['strany']:
+        radek[strana['strana']] = strana['hlasy']
+    return radek
+
+
+def pevne_sloupce(radek: dict) -> List[str]:
+    """
+    Vrátí pevné sloupce výstupního řádku v pořadí, v jakém je
+    vytváří 'sestav_radek': případný okres, číslo a název obce,
+    případné číslo okrsku, voliči, vydané obálky a platné hlasy.
+
+    Example:
+        >>> pevne_sloupce({'Číslo obce': '598925', 'Okrsek': '1', ...})
+            ['Číslo obce', 'Název obce', 'Okrsek', 'Voliči',
+             'Vydané obálky', 'Platné hlasy']
+    """
+    sloupce = [SLOUPEC_OKRES] if SLOUPEC_OKRES in radek else []
+    sloupce += ZAKLADNI_SLOUPCE[:2]
+    if SLOUPEC_OKRSEK in radek:
+        sloupce.append(SLOUPEC_OKRSEK)
+    return sloupce + ZAKLADNI_SLOUPCE[2:]
+
+
+def klic_obce(obec: Okrsek) -> str:
+    """
+    Vrátí klíč obce v žurnálu: číslo obce, v režimu '--okrsky'
+    číslo obce a okrsku ('598917/1001').
+    """
+    if 'okrsek' in obec:
+        return f"{obec['cislo_obce']}/{obec['okrsek']}"
+    return obec['cislo_obce']
+
+
+def vypis_chybu(
+    a: str, 
+    obec_nazev: str, 
+    obec_cislo: str, chyba: str
+) -> None:
+    """
+    Vypíše do logu a na konzoli chybové hlášení týkající se dané obce.
+
+    Args:
+        a (str): Šablona formátovacího řetězce 
+                 pro logování chybové události.
+        obec_nazev (str): Název obce.
+        obec_cislo (str): Číslo obce.
+        chyba (str): Podrobnosti o chybě.
+
+    Returns:
+        None: Funkce nevrací žádnou hodnotu při úspěchu.
+
+    Example:
+        >>> vypis_chybu(
+                LOG_ERROR_PARSING_ERROR, "Praha", "001", 
+                "Chyba při parsování dat"
+            )
+    """
+    logging.error(
+        a.format(
+            obec_nazev=obec_nazev, 
+            obec_cislo=obec_cislo, 
+            error_detail=chyba
+        ), exc_info=True
+    )
+    
+    print("\n" + SEPARATOR)
+    print(
+        Fore.LIGHTYELLOW_EX + 
+        MSG_WARNING_PROCESSING_ERROR.format(
+            obec_nazev=obec_nazev, 
+            obec_cislo=obec_cislo, 
+            error_detail=chyba
+        )
+    )
+    print(SEPARATOR + "\n")
+
+
+def rozdil_radku(puvodni: dict, novy: dict) -> dict:
+    """
+    Porovná dva výstupní řádky téže obce a vrátí změněné sloupce.
+
+    Args:
+        puvodni (dict): Řádek z minulého cyklu, nebo None
+                        (obec dosud nebyla zpracována).
+        novy (dict): Aktuální řádek obce.
+
+    Returns:
+        dict: Číslo a název obce a slovník 'zmeny'
+              {sloupec: [původní hodnota, nová hodnota]}.
+
+    Example:
+        >>> rozdil_radku(
+        ...     {'Číslo obce': '1', 'Název obce': 'A', 'Voliči': 10},
+        ...     {'Číslo obce': '1', 'Název obce': 'A', 'Voliči': 12}
+        ... )
+            {'Číslo obce': '1', 'Název obce': 'A',
+             'zmeny': {'Voliči': [10, 12]}}
+    """
+    puvodni = puvodni or {}
+    return {
+        'Číslo obce': novy['Číslo obce'],
+        'Název obce': novy['Název obce'],
+        'zmeny': {
+            sloupec: [puvodni.get(sloupec), novy.get(sloupec)]
+            for sloupec in dict.fromkeys([*puvodni, *novy])
+            if puvodni.get(sloupec) != novy.get(sloupec)
+        }
+    }
+
+
+def sleduj_volby(
+    url_okresu: str,
+    vystupni_soubor: str,
+    interval: float,
+    workers: int = VYCHOZI_POCET_VLAKEN,
+    parser: str = VYCHOZI_PARSER,
+    parse_workers: int = None,
+    cache: DiskovaCache = None,
+    omezovac: OmezovacRychlosti = None,
+    max_cyklu: int = None,
+    kompaktni: bool = False,
+    souhrny_soubor: str = None
+) -> tuple["TabulkaVysledku", dict]:
+    """
+    Průběžně sleduje výsledky během sčítání hlasů ('--watch').
+    Seznam obcí se získá jen jednou, session s otevřenými spojeními,
+    pool vláken i pool procesů pro parsování zůstávají připravené
+    po celou dobu sledování. V každém cyklu se stránky všech obcí
+    ověří podmíněným požadavkem (mezipaměť s ETag/Last-Modified;
+    není-li zadána, použije se dočasná) a z obsahu stránky se spočítá
+    otisk (hash). Parsuje se jen stránka, jejíž otisk se od minulého
+    cyklu změnil, a za změnu obce se považuje jen skutečně jiný
+    výstupní řádek. Doba cyklu tak roste s počtem změn, ne s počtem
+    obcí. Po cyklu se změnami se výstupní soubor atomicky přepíše
+    a změny obcí se připíšou jako jeden řádek JSON do souboru
+    '<vystupni_soubor>.zmeny.jsonl'. Obec, kterou se v cyklu
+    nepodaří zkontrolovat, si ponechá řádek z minulého cyklu.
+    Se 'souhrny_soubor' se souhrny za okresy, kraje a stát
+    (viz 'SouhrnyUzemi') upravují jen o změněné obce a soubor
+    se přepisuje spolu s výstupem. Se zveřejněnými výsledky
+    okresů se během sčítání neporovnávají, ty se průběžně mění.
+    Sledování skončí po 'max_cyklu' cyklech nebo přerušením (Ctrl+C).
+
+    Args:
+        url_okresu (str): URL adresa okresu nebo přehledu voleb.
+        vystupni_soubor (str): Výstupní soubor (viz 'ZAPISOVACE').
+        interval (float): Počet sekund mezi začátky cyklů.
+        workers (int, optional): Počet vláken pro stahování.
+        parser (str, optional): HTML parser (viz 'parsuj_html').
+        parse_workers (int, optional): Počet procesů pro parsování.
+        cache (DiskovaCache, optional): Mezipaměť stránek. Její
+                                        'ttl' se nepoužije, každá
+                                        stránka se ověří na serveru.
+        omezovac (OmezovacRychlosti, optional): Omezovač rychlosti.
+        max_cyklu (int, optional): Nejvyšší počet cyklů. Výchozí
+                                   je bez omezení.
+        kompaktni (bool, optional): JSON bez odsazení ('--compact').
+        souhrny_soubor (str, optional): Soubor JSON se souhrny
+                                   za územní celky ('--souhrny').
+
+    Returns:
+        tuple: Poslední stav výsledků (TabulkaVysledku, obce
+               v pořadí prvního úspěšného zpracování) a statistiky
+               'chyby', 'sledovani_cyklu', 'sledovani_zmen'
+               a využití spojení a mezipaměti.
+
+    Raises:
+        UnsupportedFormatError: Pokud přípona souboru není podporována.
+        FileSavingError: Pokud výstupní soubor nelze zapsat.
+
+    Example:
+        >>> vysledky, stats = sleduj_volby(url, 'karvina.csv', 60, 8)
+    """
+    trida = vyber_zapisovac(vystupni_soubor)
+    soubor_zmen = vystupni_soubor + PRIPONA_ZMEN
+
+    with contextlib.ExitStack() as zdroje:
+        if cache is None:
+            # Podmíněné požadavky potřebují ETag a obsah minulého cyklu
+            cache = DiskovaCache(
+                zdroje.enter_context(tempfile.TemporaryDirectory())
+            )
+        cache.ttl = 0
+        session = zdroje.enter_context(
+            StahovaciSession(workers, cache=cache, omezovac=omezovac)
+        )
+        vlakna = zdroje.enter_context(
+            ThreadPoolExecutor(max_workers=workers)
+        )
+        parsovaci_pool = None
+        if parse_workers:
+            parsovaci_pool = ProcessPoolExecutor(parse_workers)
+            zdroje.callback(parsovaci_pool.shutdown, cancel_futures=True)
+
+        chyby_seznamu = {'chyby': 0}
+        obce = ziskej_obce(
+            url_okresu, session, parser, workers, chyby_seznamu
+        )
+        otisky = {}
+        registr = RegistrStran()
+        vysledky = TabulkaVysledku(registr=registr)
+        poradi = {}  # Číslo obce -> řádek v tabulce výsledků
+        souhrny = None
+        if souhrny_soubor:
+            souhrny = SouhrnyUzemi(registr)
+            souhrny.ocekavej(obce)
+
+        def zkontroluj(obec: Okrsek) -> tuple:
+            response = stahni_data(obec['url'], session=session)
+            otisk = hashlib.sha256(response.content).digest()
+            if otisky.get(obec['cislo_obce']) == otisk:
+                return None  # Stránka se nezměnila, neparsuje se
+            data = parsuj_odpoved_obce(response, parser, parsovaci_pool)
+            registr.oznac(data['strany'])
+            return otisk, data
+
+        print(
+            Fore.LIGHTCYAN_EX + MSG_INFO_WATCH_START.format(
+                interval=interval, soubor=vystupni_soubor,
+                zmeny=soubor_zmen
+            )
+        )
+        open(soubor_zmen, 'w', encoding='utf-8').close()
+
+        dokonceno = zmen_celkem = 0
+        try:
+            while max_cyklu is None or dokonceno < max_cyklu:
+                cyklus = dokonceno + 1
+                zacatek = time.monotonic()
+                zmeny = []
+                stranky = chyby = 0
+                with contextlib.closing(spust_paralelne(
+                    zkontroluj, obce, workers, vlakna
+                )) as kontrola:
+                    if cyklus == 1:
+                        kontrola = tqdm(
+                            kontrola, total=len(obce),
+                            desc="Zpracovávám obce", unit="obec"
+                        )
+                    for obec, future in kontrola:
+                        try:
+                            vysledek = future.result()
+                        except Exception as e:
+                            # Obec se zkontroluje znovu v dalším cyklu
+                            logging.warning(
+                                LOG_WARNING_WATCH_OBEC.format(
+                                    obec_nazev=obec['nazev_obce'],
+                                    obec_cislo=obec['cislo_obce'],
+                                    cyklus=cyklus, error_detail=e
+                                )
+                            )
+                            chyby += 1
+                            continue
+                        if vysledek is None:
+                            continue
+                        stranky += 1
+                        otisk, data = vysledek
+                        otisky[obec['cislo_obce']] = otisk
+                        radek = sestav_radek(obec, data)
+                        puvodni = None
+                        if obec['cislo_obce'] in poradi:
+                            puvodni = vysledky[poradi[obec['cislo_obce']]]
+                            vysledky.nahrad(poradi[obec['cislo_obce']], radek)
+                        else:
+                            poradi[obec['cislo_obce']] = len(vysledky)
+                            vysledky.pridej(radek)
+                        if souhrny:
+                            souhrny.nahrad(obec, puvodni, radek)
+                        if cyklus > 1 and radek != puvodni:
+                            zmeny.append(rozdil_radku(puvodni, radek))
+
+                # Přepis výstupu v původním pořadí obcí
+                if vysledky and (cyklus == 1 or zmeny):
+                    try:
+                        zapis_vse(trida, (
+                            vysledky[poradi[obec['cislo_obce']]]
+                            for obec in obce if obec['cislo_obce'] in poradi
+                        ), vystupni_soubor, registr,
+                            oznaceni_voleb(url_okresu), kompaktni)
+                    except (OSError, sqlite3.Error) as e:
+                        zpracuj_chybu_ukladani(vystupni_soubor, e)
+                    if souhrny:
+                        uloz_souhrny(souhrny, souhrny_soubor)
+
+                cas = time.strftime('%Y-%m-%dT%H:%M:%S')
+                with open(soubor_zmen, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({
+                        'cyklus': cyklus,
+                        'cas': cas,
+                        'zmenene_stranky': stranky,
+                        'chyby': chyby,
+                        'zmeny': zmeny
+                    }, ensure_ascii=False) + '\n')
+
+                dokonceno = cyklus
+                zmen_celkem += len(zmeny)
+                doba = time.monotonic() - zacatek
+                print(
+                    Fore.LIGHTCYAN_EX + MSG_INFO_WATCH_CYCLE.format(
+                        cyklus=cyklus, cas=cas, stranky=stranky,
+                        zmenene=len(zmeny), celkem=len(obce),
+                        chyby=chyby, doba=doba
+                    )
+                )
+                logging.info(
+                    LOG_INFO_WATCH_CYCLE.format(
+                        cyklus=cyklus, stranky=stranky,
+                        zmenene=len(zmeny), chyby=chyby
+                    )
+                )
+                if max_cyklu is None or dokonceno < max_cyklu:
+                    time.sleep(max(0.0, interval - doba))
+        except KeyboardInterrupt:
+            pass
+        print(
+            Fore.LIGHTCYAN_EX + MSG_INFO_WATCH_STOPPED.format(cykly=dokonceno)
+        )
+
+        stats = {
+            'chyby': len(obce) - len(vysledky) + chyby_seznamu['chyby'],
+            'sledovani_cyklu': dokonceno,
+            'sledovani_zmen': zmen_celkem
+        }
+        stats.update(session.statistiky_spojeni())
+        stats.update(cache.statistiky())
+    return vysledky, stats
+
+
+class ZurnalObci:
+    """
+    Žurnál dokončených obcí pro pokračování přerušeného běhu.
+    Soubor ve formátu JSON Lines, do kterého se pouze připisuje:
+    první řádek nese URL okresu, každý další číslo obce a její
+    data (ObecData). Záznam se zapíše a předá operačnímu systému
+    hned po zpracování obce, takže přežije pád programu, Ctrl-C
+    i ukončení kvůli nedostatku paměti (ne však výpadek napájení,
+    'fsync' se kvůli rychlosti nevolá). Zápis jednoho řádku trvá
+    desítky mikrosekund, stažení obce desítky milisekund.
+    Při obnovení se načtou dokončené obce do 'hotove'. Neúplný
+    poslední záznam (pád během zápisu) se odřízne.
+
+    Args:
+        soubor (str): Cesta k žurnálu.
+        url (str): URL okresu, ke kterému žurnál patří.
+        obnovit (bool, optional): Načíst existující žurnál
+                                  a pokračovat v něm. Jinak se
+                                  žurnál založí znovu.
+
+    Example:
+        >>> zurnal = ZurnalObci('karvina.csv.zurnal', url, obnovit=True)
+        >>> len(zurnal.hotove)
+            12
+    """
+
+    def __init__(self, soubor: str, url: str, obnovit: bool = False) -> None:
+        self.soubor = soubor
+        self.url = url
+        self.hotove: Dict[str, ObecData] = {}
+        self._zapsane = set()
+        if obnovit:
+            self._nacti()
+        rezim = 'a' if self.hotove else 'w'
+        self._f = open(soubor, rezim, encoding='utf-8')
+        if rezim == 'w':
+            self._zapis_radek({'url': url})
+
+    def _nacti(self) -> None:
+        if not os.path.exists(self.soubor):
+            print(
+                Fore.LIGHTYELLOW_EX +
+                MSG_WARNING_RESUME_NO_JOURNAL.format(soubor=self.soubor)
+            )
+            return
+
+        hotove = {}
+        platny_konec = 0
+        with open(self.soubor, 'rb') as f:
+            for i, radek in enumerate(f):
+                try:
+                    zaznam = json.loads(radek)
+                    if not radek.endswith(b'\n'):
+                        raise ValueError(radek)
+                except ValueError:
+                    logging.warning(
+                        LOG_WARNING_JOURNAL_TRUNCATED.format(
+                            soubor=self.soubor, pozice=platny_konec
+                        )
+                    )
+                    break
+                if i == 0 and zaznam.get('url') != self.url:
+                    print(
+                        Fore.LIGHTYELLOW_EX +
+                        MSG_WARNING_RESUME_OTHER_URL.format(
+                            soubor=self.soubor, url=zaznam.get('url')
+                        )
+                    )
+                    return
+                if i > 0:
+                    hotove[zaznam['cislo_obce']] = zaznam['data']
+                platny_konec += len(radek)
+
+        # Odřízni neúplný konec, aby další záznamy navázaly
+        os.truncate(self.soubor, platny_konec)
+        self.hotove = hotove
+        self._zapsane = set(hotove)
+        logging.info(
+            LOG_INFO_RESUME.format(soubor=self.soubor, pocet=len(hotove))
+        )
+
+    def _zapis_radek(self, zaznam: dict) -> None:
+        self._f.write(serializuj_json(zaznam, odsazeni=False) + '\n')
+        self._f.flush()
+
+    def zapis(self, cislo_obce: str, data: ObecData) -> None:
+        """
+        Zapíše data dokončené obce. Obec, která už v žurnálu je
+        (např. převzatá při obnovení), se nezapisuje znovu.
+
+        Args:
+            cislo_obce (str): Číslo obce (klíč záznamu).
+            data (ObecData): Zpracovaná data obce.
+        """
+        if cislo_obce in self._zapsane:
+            return
+        self._zapis_radek({'cislo_obce': cislo_obce, 'data': data})
+        self._zapsane.add(cislo_obce)
+
+    @property
+    def pocet(self) -> int:
+        """Počet obcí zapsaných v žurnálu."""
+        return len(self._zapsane)
+
+    def zavri(self) -> None:
+        """Zavře žurnál a ponechá ho na disku pro '--resume'."""
+        self._f.close()
+
+    def odstran(self) -> None:
+        """Zavře a smaže žurnál (běh skončil bez chyb)."""
+        self._f.close()
+        try:
+            os.remove(self.soubor)
+        except OSError:
+            pass
+
+
+class RegistrStran:
+    """
+    Registr stran jednoho běhu. Každé straně přidělí při prvním
+    výskytu stálé celočíselné ID (pořadí registrace) a zapamatuje
+    si její číslo na hlasovacím lístku. Strany se registrují už při
+    získání dat obce (viz 'ziskej_data_obce'), takže zapisovače
+    i 'TabulkaVysledku' převezmou sloupce stran přímo z registru
+    a nemusí u každého řádku hledat nové strany mezi jeho klíči.
+    Pořadí sloupců ('sloupce') je podle čísla na lístku, strany
+    bez čísla následují v pořadí registrace. Instanci lze sdílet
+    mezi vlákny.
+
+    Example:
+        >>> registr = RegistrStran()
+        >>> registr.zaregistruj('ANO 2011', 20)
+            0
+        >>> registr.zaregistruj('Občanská demokratická strana', 1)
+            1
+        >>> registr.sloupce()
+            ['Občanská demokratická strana', 'ANO 2011']
+    """
+
+    def __init__(self) -> None:
+        self.nazvy: List[str] = []
+        self.cisla: List[int] = []
+        self._id: Dict[str, int] = {}
+        self._sloupce: List[str] = None
+        self._zamek = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.nazvy)
+
+    def __contains__(self, nazev: str) -> bool:
+        return nazev in self._id
+
+    def id_strany(self, nazev: str) -> int:
+        """Vrátí ID strany, nebo None, pokud není registrována."""
+        return self._id.get(nazev)
+
+    def zaregistruj(self, nazev: str, cislo: int = None) -> int:
+        """
+        Vrátí ID strany, při prvním výskytu ji zaregistruje.
+        Číslo na lístku se doplní i ke straně, která byla
+        registrována bez něj (např. z dat žurnálu).
+
+        Args:
+            nazev (str): Název strany.
+            cislo (int, optional): Číslo strany na hlasovacím lístku.
+
+        Returns:
+            int: ID strany.
+        """
+        id_strany = self._id.get(nazev)
+        if id_strany is not None and (
+            cislo is None or self.cisla[id_strany] is not None
+        ):
+            return id_strany
+        with self._zamek:
+            id_strany = self._id.get(nazev)
+            if id_strany is None:
+                id_strany = len(self.nazvy)
+                self.nazvy.append(nazev)
+                self.cisla.append(cislo)
+                self._id[nazev] = id_strany
+            elif self.cisla[id_strany] is None:
+                self.cisla[id_strany] = cislo
+            self._sloupce = None
+        return id_strany
+
+    def oznac(self, strany: List[Strana]) -> None:
+        """
+        Zaregistruje strany obce a doplní jim klíč 'id'.
+
+        Args:
+            strany (List[Strana]): Strany z 'parsuj_data_obce'.
+        """
+        for strana in strany:
+            strana['id'] = self.zaregistruj(
+                strana['strana'], strana.get('cislo')
+            )
+
+    def sloupce(self) -> List[str]:
+        """
+        Vrátí názvy stran v pořadí sloupců výstupu.
+
+        Returns:
+            List[str]: Strany podle čísla na lístku, strany bez
+                       čísla na konci v pořadí registrace.
+        """
+        sloupce = self._sloupce
+        if sloupce is None:
+            with self._zamek:
+                poradi = sorted(
+                    range(len(self.nazvy)),
+                    key=lambda i: (
+                        self.cisla[i] is None, self.cisla[i] or 0, i
+                    )
+                )
+                sloupce = self._sloupce = [self.nazvy[i] for i in poradi]
+        return sloupce
+
+
+class TabulkaVysledku:
+    """
+    Sloupcové úložiště výsledků obcí místo seznamu slovníků.
+    Názvy stran jsou uloženy jen jednou v registru stran, pevné
+    číselné sloupce (voliči, vydané obálky, platné hlasy) jsou
+    pole typu 'array' a hlasy tvoří hustou celočíselnou matici
+    obcí × stran uloženou po řádcích v jediném poli; sloupec
+    matice je ID strany v registru. Strana, která v obci
+    nekandidovala, má v matici hodnotu -1. Přibude-li v registru
+    strana, matice se jednou přeskládá na novou šířku.
+    Navenek se tabulka chová jako seznam výstupních řádků:
+    'len', indexování a iterace vrací řádky ve tvaru, jaký vytváří
+    'sestav_radek' (strany v pořadí sloupců registru), takže ji
+    přijmou zapisovače i funkce 'uloz_do_*'.
+    Tabulka řádky jen zhušťuje, paměť neomezuje: drží všechny
+    přidané obce, takže dál roste lineárně s jejich počtem, jen
+    zhruba patnáctkrát pomaleji než seznam slovníků (pro celou
+    republiku asi 1,7 MB místo 26 MB). Celou tabulku potřebují
+    statistiky na konci běhu, '--stats' a sledování změn.
+
+    Args:
+        radky (Iterable[dict], optional): Počáteční výstupní řádky.
+        registr (RegistrStran, optional): Sdílený registr stran,
+                                do kterého se strany registrují
+                                při získání dat obce. Bez něj si
+                                tabulka vede vlastní registr a strany
+                                registruje z klíčů přidávaných řádků.
+
+    Example:
+        >>> tabulka = TabulkaVysledku()
+        >>> tabulka.pridej({'Číslo obce': '598925',
+        ...     'Název obce': 'Albrechtice', 'Voliči': 3173,
+        ...     'Vydané obálky': 1957, 'Platné hlasy': 1944,
+        ...     'Občanská demokratická strana': 109})
+        >>> tabulka[0]['Občanská demokratická strana'], len(tabulka)
+            (109, 1)
+    """
+
+    # Hodnota matice pro stranu, která v obci nekandidovala
+    CHYBI = -1
+
+    def __init__(
+        self, radky: Iterable[dict] = (), registr: RegistrStran = None
+    ) -> None:
+        self._vlastni_registr = registr is None
+        self.registr = RegistrStran() if registr is None else registr
+        self.sirka = 0
+        self.okresy: List[str] = []
+        self.cisla_obci: List[str] = []
+        self.nazvy_obci: List[str] = []
+        self.okrsky: List[str] = []
+        # 'i' = 32bitové celé číslo, stačí i pro součty za celý stát
+        self.volici = array('i')
+        self.vydane_obalky = array('i')
+        self.platne_hlasy = array('i')
+        self.hlasy = array('i')
+        for radek in radky:
+            self.pridej(radek)
+
+    def __len__(self) -> int:
+        return len(self.cisla_obci)
+
+    def __getitem__(self, poradi: int) -> dict:
+        if not 0 <= poradi < len(self):
+            raise IndexError(poradi)
+        okres = self.okresy[poradi]
+        radek = {SLOUPEC_OKRES: okres} if okres is not None else {}
+        radek.update({
+            'Číslo obce': self.cisla_obci[poradi],
+            'Název obce': self.nazvy_obci[poradi]
+        })
+        okrsek = self.okrsky[poradi]
+        if okrsek is not None:
+            radek[SLOUPEC_OKRSEK] = okrsek
+        radek.update({
+            'Voliči': self.volici[poradi],
+            'Vydané obálky': self.vydane_obalky[poradi],
+            'Platné hlasy': self.platne_hlasy[poradi]
+        })
+        sirka = self.sirka
+        hlasy = self.hlasy[poradi * sirka:(poradi + 1) * sirka]
+        for strana in self.registr.sloupce():
+            id_strany = self.registr.id_strany(strana)
+            if id_strany < sirka and hlasy[id_strany] != self.CHYBI:
+                radek[strana] = hlasy[id_strany]
+        return radek
+
+    @property
+    def strany(self) -> List[str]:
+        """Názvy stran v pořadí sloupců (viz 'RegistrStran.sloupce')."""
+        return self.registr.sloupce()
+
+    def __iter__(self) -> Iterator[dict]:
+        for poradi in range(len(self)):
+            yield self[poradi]
+
+    def _rozsir(self, sirka: int) -> None:
+        # Přeskládání matice na šířku nového počtu stran
+        puvodni = self.sirka
+        doplneni = array('i', [self.CHYBI]) * (sirka - puvodni)
+        hlasy = array('i')
+        for poradi in range(len(self)):
+            hlasy.extend(self.hlasy[poradi * puvodni:(poradi + 1) * puvodni])
+            hlasy.extend(doplneni)
+        self.hlasy = hlasy
+        self.sirka = sirka
+
+    def _hlasy_radku(self, radek: dict) -> array:
+        registr = self.registr
+        if self._vlastni_registr:
+            for klic in radek:
+                if klic not in registr and klic not in POPISNE_SLOUPCE:
+                    registr.zaregistruj(klic)
+        if len(registr) > self.sirka:
+            self._rozsir(len(registr))
+        hlasy = array('i', [self.CHYBI]) * self.sirka
+        for klic, hodnota in radek.items():
+            id_strany = registr.id_strany(klic)
+            if id_strany is not None:
+                hlasy[id_strany] = hodnota
+        return hlasy
+
+    def pridej(self, radek: dict) -> None:
+        """
+        Přidá výstupní řádek obce na konec tabulky.
+
+        Args:
+            radek (dict): Řádek ve tvaru, jaký vytváří 'sestav_radek'.
+        """
+        hlasy = self._hlasy_radku(radek)
+        self.okresy.append(radek.get(SLOUPEC_OKRES))
+        self.cisla_obci.append(radek['Číslo obce'])
+        self.nazvy_obci.append(radek['Název obce'])
+        self.okrsky.append(radek.get(SLOUPEC_OKRSEK))
+        self.volici.append(radek['Voliči'])
+        self.vydane_obalky.append(radek['Vydané obálky'])
+        self.platne_hlasy.append(radek['Platné hlasy'])
+        self.hlasy.extend(hlasy)
+
+    def nahrad(self, poradi: int, radek: dict) -> None:
+        """
+        Nahradí řádek na pozici 'poradi' novým řádkem téže obce
+        (např. po změně výsledků při sledování).
+
+        Args:
+            poradi (int): Pozice řádku v tabulce.
+            radek (dict): Nový řádek obce.
+        """
+        hlasy = self._hlasy_radku(radek)
+        self.okresy[poradi] = radek.get(SLOUPEC_OKRES)
+        self.cisla_obci[poradi] = radek['Číslo obce']
+        self.nazvy_obci[poradi] = radek['Název obce']
+        self.okrsky[poradi] = radek.get(SLOUPEC_OKRSEK)
+        self.volici[poradi] = radek['Voliči']
+        self.vydane_obalky[poradi] = radek['Vydané obálky']
+        self.platne_hlasy[poradi] = radek['Platné hlasy']
+        sirka = self.sirka
+        self.hlasy[poradi * sirka:(poradi + 1) * sirka] = hlasy
+
+    def souhrn(self) -> dict:
+        """
+        Spočítá ze sloupců počet obcí, voličů a platných hlasů.
+
+        Returns:
+            dict: Klíče 'zpracovane_obce', 'celkem_volicu'
+                  a 'celkem_platnych_hlasu' (viz 'vypis_statistiky').
+        """
+        return {
+            'zpracovane_obce': len(self),
+            'celkem_volicu': sum(self.volici),
+            'celkem_platnych_hlasu': sum(self.platne_hlasy)
+        }
+
+    def statistiky(self, pocet_obci: int = POCET_V_SOUHRNU) -> dict:
+        """
+        Spočítá souhrnné statistiky všech obcí najednou pomocí NumPy
+        nad sloupci tabulky (bez průchodu řádky): součty a podíly
+        hlasů stran, rozdělení volební účasti v obcích, největší
+        a nejmenší obce a podíl vydaných obálek bez platného hlasu.
+        Volební účast obce je podíl vydaných obálek a voličů, obce
+        bez voličů se do rozdělení nezapočítají. I pro celé volby
+        trvá výpočet jednotky milisekund. Vyžaduje knihovnu numpy.
+
+        Args:
+            pocet_obci (int, optional): Počet největších a nejmenších
+                                        obcí podle počtu voličů.
+
+        Returns:
+            dict: Statistiky připravené k uložení do JSON, procenta
+                  jsou zaokrouhlena na 4 desetinná místa:
+                  - 'obce', 'volici', 'vydane_obalky', 'platne_hlasy'
+                  - 'ucast': 'min', 'median', 'max' v obcích
+                    a 'vazena' (za všechny obce)
+                  - 'obalky_bez_platneho_hlasu': 'pocet', 'podil'
+                    a 'median' a 'max' podílu v obcích
+                  - 'nejvetsi_obce', 'nejmensi_obce': seznamy obcí
+                    ('cislo', 'nazev', 'okres', 'volici')
+                  - 'strany': strany sestupně podle hlasů ('nazev',
+                    'cislo', 'hlasy', 'podil' z platných hlasů
+                    a 'obce', ve kterých strana kandidovala)
+
+        Example:
+            >>> vysledky.statistiky()['ucast']
+                {'min': 45.735, 'median': 58.1419, 'max': 67.0466,
+                 'vazena': 51.3808}
+        """
+        pocet = len(self)
+        # Kopie do int64, pole 'array' pak lze dál rozšiřovat
+        volici = np.frombuffer(self.volici, dtype=np.intc).astype(np.int64)
+        obalky = np.frombuffer(
+            self.vydane_obalky, dtype=np.intc
+        ).astype(np.int64)
+        platne = np.frombuffer(
+            self.platne_hlasy, dtype=np.intc
+        ).astype(np.int64)
+        hlasy = np.frombuffer(self.hlasy, dtype=np.intc).reshape(
+            pocet, self.sirka
+        ).copy()
+        # Strany zaregistrované až po posledním rozšíření matice
+        # (sdílený registr) v žádné přidané obci nekandidovaly
+        chybi = len(self.registr) - self.sirka
+        if chybi > 0:
+            hlasy = np.pad(
+                hlasy, ((0, 0), (0, chybi)), constant_values=self.CHYBI
+            )
+        kandidovala = hlasy != self.CHYBI
+        soucty = np.where(kandidovala, hlasy, 0).sum(axis=0, dtype=np.int64)
+        obce_stran = kandidovala.sum(axis=0)
+
+        celkem_volicu = int(volici.sum())
+        celkem_obalek = int(obalky.sum())
+        celkem_platnych = int(platne.sum())
+
+        def procenta(citatel, jmenovatel) -> float:
+            if not jmenovatel:
+                return 0.0
+            return round(float(citatel) / jmenovatel * 100, 4)
+
+        def rozdeleni(hodnoty) -> dict:
+            if not len(hodnoty):
+                return {'min': 0.0, 'median': 0.0, 'max': 0.0}
+            return {
+                'min': round(float(hodnoty.min()), 4),
+                'median': round(float(np.median(hodnoty)), 4),
+                'max': round(float(hodnoty.max()), 4)
+            }
+
+        def obec(poradi: int) -> dict:
+            obec = {
+                'cislo': self.cisla_obci[poradi],
+                'nazev': self.nazvy_obci[poradi],
+                'okres': self.okresy[poradi],
+                'volici': int(volici[poradi])
+            }
+            if self.okrsky[poradi] is not None:
+                obec['okrsek'] = self.okrsky[poradi]
+            return obec
+
+        s_volici = volici > 0
+        ucast = obalky[s_volici] / volici[s_volici] * 100
+        s_obalkami = obalky > 0
+        ztrata = rozdeleni(
+            (obalky - platne)[s_obalkami] / obalky[s_obalkami] * 100
+        )
+        podle_velikosti = np.argsort(volici, kind='stable')
+        strany = [
+            {
+                'nazev': self.registr.nazvy[id_strany],
+                'cislo': self.registr.cisla[id_strany],
+                'hlasy': int(soucty[id_strany]),
+                'podil': procenta(soucty[id_strany], celkem_platnych),
+                'obce': int(obce_stran[id_strany])
+            }
+            for id_strany in np.argsort(-soucty, kind='stable')
+        ]
+        return {
+            'obce': pocet,
+            'volici': celkem_volicu,
+            'vydane_obalky': celkem_obalek,
+            'platne_hlasy': celkem_platnych,
+            'ucast': {
+                **rozdeleni(ucast),
+                'vazena': procenta(celkem_obalek, celkem_volicu)
+            },
+            'obalky_bez_platneho_hlasu': {
+                'pocet': celkem_obalek - celkem_platnych,
+                'podil': procenta(
+                    celkem_obalek - celkem_platnych, celkem_obalek
+                ),
+                'median': ztrata['median'],
+                'max': ztrata['max']
+            },
+            'nejvetsi_obce': [
+                obec(i) for i in podle_velikosti[::-1][:pocet_obci]
+            ],
+            'nejmensi_obce': [
+                obec(i) for i in podle_velikosti[:pocet_obci]
+            ],
+            'strany': strany
+        }
+
+
+class SouhrnyUzemi:
+    """
+    Průběžné souhrny výsledků za okresy, kraje a celý stát.
+    Každý výstupní řádek obce se hned po zpracování připočte
+    k součtům svého okresu, kraje i státu (voliči, vydané obálky,
+    platné hlasy a hlasy stran), takže souhrny všech úrovní jsou
+    k dispozici kdykoli během běhu, při průběžném zápisu i při
+    sledování změn, kde se změněný řádek obce nejprve odečte
+    a pak se připočte nový ('nahrad'). Okres a kraj obce určí
+    parametry URL její stránky (viz 'uzemi_obce'). Metoda
+    'vystup' vrátí všechny úrovně najednou.
+
+    Args:
+        registr (RegistrStran, optional): Registr stran, podle
+                                kterého se řadí strany ve výstupu.
+
+    Example:
+        >>> souhrny = SouhrnyUzemi(registr)
+        >>> souhrny.ocekavej(obce)
+        >>> souhrny.pridej(obec, radek)
+        >>> souhrny.vystup()['kraje'][0]['volici']
+            210743
+    """
+
+    def __init__(self, registr: RegistrStran = None) -> None:
+        self.registr = registr
+        self.okresy: Dict[str, dict] = {}
+        self.kraje: Dict[str, dict] = {}
+        self.stat = self._uzel(None, None)
+        self._ocekavane: Dict[str, int] = {}
+        self._url_vysledku: Dict[str, str] = {}
+
+    @staticmethod
+    def _uzel(kod: str, nazev: str) -> dict:
+        return {
+            'kod': kod,
+            'nazev': nazev,
+            'obce': 0,
+            'volici': 0,
+            'vydane_obalky': 0,
+            'platne_hlasy': 0,
+            'strany': {}
+        }
+
+    def _okres(self, obec: Okrsek) -> Tuple[dict, dict]:
+        kraj, okres = uzemi_obce(obec['url'])
+        if kraj not in self.kraje:
+            self.kraje[kraj] = self._uzel(
+                kraj, KRAJE.get(kraj, f"Kraj {kraj}")
+            )
+        uzel = self.okresy.get(okres)
+        if uzel is None:
+            uzel = self.okresy[okres] = self._uzel(okres, obec.get('okres'))
+            uzel['kraj'] = kraj
+            self._url_vysledku[okres] = urljoin(
+                obec['url'], f"{STRANKA_VYSLEDKU_OKRESU}?xjazyk=CZ"
+                f"&xkraj={kraj}&xnumnuts={okres}"
+            )
+        return self.kraje[kraj], uzel
+
+    def ocekavej(self, obce: Iterable[Okrsek]) -> None:
+        """
+        Zaznamená seznam obcí ke zpracování. Okresy a kraje pak
+        mají ve výstupu pořadí jako na stránkách voleb a podle
+        počtu obcí se pozná, který okres je úplný (viz
+        'zkontroluj_souhrny').
+
+        Args:
+            obce (Iterable[Okrsek]): Obce z 'ziskej_obce'.
+        """
+        for obec in obce:
+            _, okres = self._okres(obec)
+            self._ocekavane[okres['kod']] = (
+                self._ocekavane.get(okres['kod'], 0) + 1
+            )
+
+    def _pripocti(self, obec: Okrsek, radek: dict, znamenko: int) -> None:
+        kraj, okres = self._okres(obec)
+        for uzel in (okres, kraj, self.stat):
+            uzel['obce'] += znamenko
+            uzel['volici'] += znamenko * radek['Voliči']
+            uzel['vydane_obalky'] += znamenko * radek['Vydané obálky']
+            uzel['platne_hlasy'] += znamenko * radek['Platné hlasy']
+            strany = uzel['strany']
+            for nazev, hlasy in radek.items():
+                if nazev not in POPISNE_SLOUPCE:
+                    strany[nazev] = strany.get(nazev, 0) + znamenko * hlasy
+
+    def pridej(self, obec: Okrsek, radek: dict) -> None:
+        """
+        Připočte řádek obce k souhrnům jejího okresu, kraje a státu.
+
+        Args:
+            obec (Okrsek): Obec ze seznamu obcí (kvůli URL).
+            radek (dict): Výstupní řádek obce (viz 'sestav_radek').
+        """
+        self._pripocti(obec, radek, 1)
+
+    def nahrad(self, obec: Okrsek, puvodni: dict, radek: dict) -> None:
+        """
+        Nahradí v souhrnech původní řádek obce novým (sledování
+        změn). Je-li 'puvodni' None, řádek se jen připočte.
+        """
+        if puvodni is not None:
+            self._pripocti(obec, puvodni, -1)
+        self._pripocti(obec, radek, 1)
+
+    def uplne_okresy(self) -> List[dict]:
+        """Vrátí okresy, ve kterých byly zpracovány všechny obce."""
+        return [
+            okres for kod, okres in self.okresy.items()
+            if okres['obce'] and okres['obce'] == self._ocekavane.get(kod)
+        ]
+
+    def url_vysledku(self, okres: dict) -> str:
+        """Vrátí URL zveřejněných výsledků okresu (ps33)."""
+        return self._url_vysledku[okres['kod']]
+
+    def _vystup_uzlu(self, uzel: dict, sloupce: Iterable[str]) -> dict:
+        vystup = {
+            klic: hodnota for klic, hodnota in uzel.items()
+            if klic != 'strany'
+        }
+        vystup['ucast'] = round(
+            uzel['vydane_obalky'] / uzel['volici'] * 100, 4
+        ) if uzel['volici'] else 0.0
+        vystup['strany'] = {
+            nazev: uzel['strany'][nazev]
+            for nazev in sloupce if nazev in uzel['strany']
+        }
+        return vystup
+
+    def vystup(self) -> dict:
+        """
+        Vrátí souhrny všech úrovní připravené k uložení do JSON.
+
+        Returns:
+            dict: 'stat' (souhrn za všechny obce), 'kraje' a 'okresy'
+                  (seznamy souhrnů v pořadí stránek voleb). Každý
+                  souhrn má klíče 'kod', 'nazev', 'obce', 'volici',
+                  'vydane_obalky', 'platne_hlasy', 'ucast' (v %)
+                  a 'strany' {název strany: hlasy} v pořadí sloupců
+                  výstupu. Okres má navíc 'kraj' (kód kraje)
+                  a po kontrole 'kontrola' (viz 'zkontroluj_souhrny').
+        """
+        sloupce = dict.fromkeys(self.registr.sloupce() if self.registr else ())
+        # Strany mimo registr (např. bez sdíleného registru) na konec
+        sloupce.update(dict.fromkeys(self.stat['strany']))
+        return {
+            'stat': self._vystup_uzlu(self.stat, sloupce),
+            'kraje': [
+                self._vystup_uzlu(uzel, sloupce)
+                for uzel in self.kraje.values() if uzel['obce']
+            ],
+            'okresy': [
+                self._vystup_uzlu(uzel, sloupce)
+                for uzel in self.okresy.values() if uzel['obce']
+            ]
+        }
+
+
+def serializuj_json(hodnota, odsazeni: bool = True) -> str:
+    """
+    Převede hodnotu na text JSON. Je-li nainstalována knihovna
+    orjson, použije se ona (serializace řádku je několikanásobně
+    rychlejší), jinak standardní modul 'json'. Výstup obou cest
+    je totožný: znaky mimo ASCII se neescapují, s odsazením
+    se odsazuje 2 mezerami, bez odsazení je text kompaktní
+    (bez mezer za ',' a ':').
+
+    Args:
+        hodnota: Hodnota k serializaci (řádek, záznam žurnálu).
+        odsazeni (bool, optional): Odsadit 2 mezerami (výchozí),
+                                   nebo zapsat kompaktně na jeden
+                                   řádek.
+
+    Returns:
+        str: Text JSON.
+
+    Example:
+        >>> serializuj_json({'Voliči': 3173}, odsazeni=False)
+            '{"Voliči":3173}'
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            hodnota, option=orjson.OPT_INDENT_2 if odsazeni else 0
+        ).decode('utf-8')
+    if odsazeni:
+        return json.dumps(hodnota, ensure_ascii=False, indent=2)
+    return json.dumps(hodnota, ensure_ascii=False, separators=(',', ':'))
+
+
+class ZapisovacVysledku:
+    """
+    Průběžný zápis výsledků do souboru, řádek po řádku.
+    Každý řádek se zapíše a vyprázdní na disk hned, jak je obec
+    zpracována, takže si zapisovač řádky nedrží. Zápis probíhá
+    do dočasného souboru '<soubor>.part' a teprve metoda
+    'dokonci' ho atomicky přejmenuje na cílový soubor. Cílový
+    soubor tak vždy obsahuje úplný a platný dokument.
+    Formáty, jejichž každý zapsaný řádek je sám platný záznam
+    ('primy_zapis = True', JSON Lines), se bez komprese zapisují
+    rovnou do cílového souboru, aby ho šlo číst už během běhu.
+    Končí-li název souboru příponou komprese ('.gz', '.zst', viz
+    'rozloz_priponu'), textové formáty se komprimují průběžně
+    při zápisu řádků; komprimovaný proud se pak nevyprazdňuje
+    po každém řádku, ale až při dokončení.
+    Potomci implementují '_zacni', '_zapis_radek' a '_ukonci',
+    binární formáty nastaví 'binarni = True' a formáty, které
+    kompresi nepodporují, 'komprimovatelny = False'.
+
+    Args:
+        vystupni_soubor (str): Cesta k cílovému souboru.
+        registr (RegistrStran, optional): Registr stran, ze kterého
+                                zapisovač převezme sloupce stran.
+        volby (str, optional): Označení voleb (viz 'oznaceni_voleb')
+                                pro formáty, které mohou v jednom
+                                souboru držet více voleb.
+        kompaktni (bool, optional): Zapsat JSON bez odsazení
+                                (ostatní formáty ho ignorují).
+
+    Example:
+        >>> with CsvZapisovac('vysledky.csv') as zapisovac:
+        ...     for radek in vysledky:
+        ...         zapisovac.zapis(radek)
+    """
+
+    format_typ = None
+    kodovani = 'utf-8'
+    binarni = False
+    komprimovatelny = True
+    primy_zapis = False
+
+    def __init__(
+        self, vystupni_soubor: str, registr: RegistrStran = None,
+        volby: str = None, kompaktni: bool = False
+    ) -> None:
+        self.vystupni_soubor = vystupni_soubor
+        self.volby = volby
+        self.kompaktni = kompaktni
+        self._vlastni_registr = registr is None
+        self.registr = RegistrStran() if registr is None else registr
+        self.pocet = 0
+        self.komprese = (
+            rozloz_priponu(vystupni_soubor)[1]
+            if self.komprimovatelny else None
+        )
+        # Komprimovaný proud je čitelný až po uzavření, píše se přes .part
+        self.docasny_soubor = (
+            vystupni_soubor if self.primy_zapis and not self.komprese
+            else vystupni_soubor + '.part'
+        )
+        self._f = self._otevri(self.docasny_soubor, 'w')
+        self._zacni()
+
+    def _otevri(self, soubor: str, rezim: str):
+        """
+        Otevře soubor pro čtení ('r') nebo zápis ('w') jako text
+        v kódování zapisovače, binárně ('binarni'), případně
+        s kompresí podle přípony výstupního souboru.
+        """
+        if self.binarni:
+            return open(soubor, rezim + 'b')
+        if self.komprese == 'gzip':
+            return gzip.open(
+                soubor, rezim + 't', encoding=self.kodovani, newline=''
+            )
+        if self.komprese == 'zstd':
+            return zstandard.open(
+                soubor, rezim + 't', encoding=self.kodovani, newline=''
+            )
+        return open(soubor, rezim, newline='', encoding=self.kodovani)
+
+    def zapis(self, radek: dict) -> None:
+        """
+        Zapíše jeden výstupní řádek (obec) a vyprázdní ho na disk.
+
+        Args:
+            radek (dict): Řádek ve tvaru, jaký vytváří 'vyhodnot_obec'.
+        """
+        self._zapis_radek(radek)
+        self.pocet += 1
+        if not self.komprese:
+            self._f.flush()
+
+    def dokonci(self) -> None:
+        """Uzavře dokument a atomicky ho přejmenuje na cílový soubor."""
+        self._ukonci()
+        self._f.close()
+        if self.docasny_soubor != self.vystupni_soubor:
+            os.replace(self.docasny_soubor, self.vystupni_soubor)
+
+    def zrus(self) -> None:
+        """Zavře a odstraní dočasný soubor, cílový soubor nevytvoří."""
+        self._f.close()
+        try:
+            os.remove(self.docasny_soubor)
+        except OSError:
+            pass
+
+    def ukonci_po_chybe(self) -> None:
+        """
+        Po přerušení zpracování uloží již zapsané řádky jako platný
+        dokument. Pokud se nic nezapsalo, dočasný soubor odstraní.
+        """
+        if self.uzavreny:
+            return
+        if self.pocet:
+            self.dokonci()
+        else:
+            self.zrus()
+
+    def __enter__(self) -> "ZapisovacVysledku":
+        return self
+
+    @property
+    def uzavreny(self) -> bool:
+        """True po dokončení nebo zrušení zápisu."""
+        return self._f.closed
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.uzavreny:
+            return
+        if exc_type is None:
+            self.dokonci()
+        else:
+            self.zrus()
+
+    def _zaregistruj_strany(self, radek: dict) -> None:
+        # Bez sdíleného registru se strany registrují z klíčů řádku
+        if self._vlastni_registr:
+            for klic in radek:
+                if klic not in self.registr and klic not in POPISNE_SLOUPCE:
+                    self.registr.zaregistruj(klic)
+
+    def _zacni(self) -> None:
+        pass
+
+    def _zapis_radek(self, radek: dict) -> None:
+        raise NotImplementedError
+
+    def _ukonci(self) -> None:
+        pass
+
+
+class CsvZapisovac(ZapisovacVysledku):
+    """
+    Průběžný zápis do CSV.
+    Sloupce stran se berou přímo z registru stran (viz
+    'RegistrStran'), do kterého se strany zaregistrují už při
+    získání dat obce, takže se řádky neprohledávají kvůli novým
+    stranám. Hlavička se zapíše s prvním řádkem: pevné sloupce
+    a strany registru podle čísla na lístku. Všechny obce jednoho
+    okresu mají stejný seznam stran, takže hlavička obvykle
+    zůstane beze změny. Přibude-li v registru strana, přidá se
+    sloupec na konec a při dokončení se soubor jedním průchodem
+    přepíše s úplnou hlavičkou v pořadí registru (dřívější řádky
+    se doplní prázdnými hodnotami). Bez sdíleného registru si
+    zapisovač vede vlastní a strany registruje z klíčů řádků.
+    Výsledek je stejný jako z 'uloz_do_csv'.
+    """
+
+    format_typ = 'csv'
+    kodovani = 'utf-8-sig'
+
+    def _zacni(self) -> None:
+        self._writer = csv.writer(self._f)
+        self._pevne = None
+        self._strany: List[str] = []
+        self._sloupce: List[str] = None
+        self._pocet_v_hlavicce = 0
+
+    def _zapis_radek(self, radek: dict) -> None:
+        if self._pevne is None:
+            self._pevne = pevne_sloupce(radek)
+            self._sloupce = self._pevne
+        self._zaregistruj_strany(radek)
+        registr = self.registr
+        if len(registr) > len(self._strany):
+            # Nové strany na konec, zapsané řádky si drží pozice
+            znama = set(self._strany)
+            self._strany += [
+                s for s in registr.sloupce() if s not in znama
+            ]
+            self._sloupce = self._pevne + self._strany
+        if not self._pocet_v_hlavicce:
+            self._writer.writerow(self._sloupce)
+            self._pocet_v_hlavicce = len(self._sloupce)
+        self._writer.writerow([radek.get(s, '') for s in self._sloupce])
+
+    def _ukonci(self) -> None:
+        if self._sloupce is None:
+            return
+        znama = set(self._strany)
+        konecne = self._pevne + [
+            s for s in self.registr.sloupce() if s in znama
+        ]
+        if konecne == self._sloupce and (
+            len(konecne) == self._pocet_v_hlavicce
+        ):
+            return
+        # Přibyly sloupce: přepiš soubor s úplnou hlavičkou
+        self._f.close()
+        puvodni = self.docasny_soubor + '.old'
+        os.replace(self.docasny_soubor, puvodni)
+        pozice = {s: i for i, s in enumerate(self._sloupce)}
+        pozice = [pozice[s] for s in konecne]
+        with self._otevri(puvodni, 'r') as vstup:
+            # Nový soubor zavře až 'dokonci'
+            self._f = self._otevri(self.docasny_soubor, 'w')
+            ctenar = csv.reader(vstup)
+            writer = csv.writer(self._f)
+            next(ctenar)  # Původní hlavička
+            writer.writerow(konecne)
+            doplneni = len(self._sloupce)
+            for radek in ctenar:
+                radek += [''] * (doplneni - len(radek))
+                writer.writerow([radek[i] for i in pozice])
+        os.remove(puvodni)
+
+
+class JsonZapisovac(ZapisovacVysledku):
+    """
+    Průběžný zápis do JSON jako pole, které se uzavře při dokončení.
+    Výstup je stejný jako z 'uloz_do_json' (odsazení 2 mezery).
+    S 'kompaktni' se každá obec zapíše bez odsazení na vlastní
+    řádek pole. Řádky serializuje 'serializuj_json'.
+    """
+
+    format_typ = 'json'
+
+    def _zacni(self) -> None:
+        self._f.write('[')
+
+    def _zapis_radek(self, radek: dict) -> None:
+        oddelovac = '\n' if not self.pocet else ',\n'
+        if self.kompaktni:
+            self._f.write(oddelovac + serializuj_json(radek, odsazeni=False))
+            return
+        text = serializuj_json(radek)
+        self._f.write(oddelovac + '  ' + text.replace('\n', '\n  '))
+
+    def _ukonci(self) -> None:
+        self._f.write('\n]' if self.pocet else ']')
+
+
+class JsonlZapisovac(ZapisovacVysledku):
+    """
+    Průběžný zápis do JSON Lines ('.jsonl', '.ndjson'): každá
+    obec je jeden kompaktní objekt JSON na vlastním řádku. Soubor
+    nemá obalující pole, takže každý zapsaný řádek je hned
+    platný záznam a soubor lze číst po řádcích bez načtení
+    celého dokumentu (např. 'jq', 'pandas.read_json(lines=True)').
+    Bez komprese se proto zapisuje přímo do cílového souboru
+    a lze ho číst (např. 'tail -f') už během běhu; komprimovaný
+    výstup vzniká přes '<soubor>.part' jako u ostatních formátů.
+    """
+
+    format_typ = 'jsonl'
+    primy_zapis = True
+
+    def _zapis_radek(self, radek: dict) -> None:
+        self._f.write(serializuj_json(radek, odsazeni=False) + '\n')
+
+
+class XmlZapisovac(ZapisovacVysledku):
+    """
+    Průběžný zápis do XML bez stavby stromu elementů: každá obec
+    se hned zapíše jako text a paměť zůstává stálá i pro celé
+    volby. Názvy elementů jsou pevné a platné v XML, názvy obcí,
+    okresů a stran jsou v atributech:
+
+      <vysledky volby="ps2017nss">
+        <obec cislo="598925" nazev="Albrechtice">
+          <volici>3173</volici>
+          <vydane_obalky>1957</vydane_obalky>
+          <platne_hlasy>1944</platne_hlasy>
+          <strana cislo="1" nazev="Občanská demokratická strana">109</strana>
+        </obec>
+      </vysledky>
+
+    Atribut 'okres' má obec jen ve výstupu celých voleb, 'cislo'
+    strany (číslo na lístku) se doplní z registru stran, pokud je
+    známé, a 'volby' jen při zadaném označení voleb. Počáteční
+    značky elementů stran se escapují jen jednou a ukládají se.
+    """
+
+    format_typ = 'xml'
+
+    # Pevné sloupce jako atributy elementu <obec> a jako elementy
+    ATRIBUTY_OBCE = {
+        'Číslo obce': 'cislo',
+        'Název obce': 'nazev',
+        SLOUPEC_OKRES: 'okres',
+        SLOUPEC_OKRSEK: 'okrsek'
+    }
+    ELEMENTY_OBCE = {
+        'Voliči': 'volici',
+        'Vydané obálky': 'vydane_obalky',
+        'Platné hlasy': 'platne_hlasy'
+    }
+
+    def _zacni(self) -> None:
+        self._znacky = {
+            sloupec: (f'\n    <{element}>', f'</{element}>')
+            for sloupec, element in self.ELEMENTY_OBCE.items()
+        }
+        volby = f' volby={quoteattr(self.volby)}' if self.volby else ''
+        self._f.write(
+            f'<?xml version="1.0" encoding="{self.kodovani}"?>\n'
+            f'<vysledky{volby}>'
+        )
+
+    def _znacka_strany(self, nazev: str) -> tuple:
+        id_strany = self.registr.id_strany(nazev)
+        cislo = (
+            self.registr.cisla[id_strany] if id_strany is not None
+            else None
+        )
+        if cislo is None:
+            # Bez čísla se neukládá, číslo se může doplnit později
+            return f'\n    <strana nazev={quoteattr(nazev)}>', '</strana>'
+        self._znacky[nazev] = (
+            f'\n    <strana cislo="{cislo}" nazev={quoteattr(nazev)}>',
+            '</strana>'
+        )
+        return self._znacky[nazev]
+
+    def _zapis_radek(self, radek: dict) -> None:
+        casti = ['\n  <obec']
+        for sloupec, atribut in self.ATRIBUTY_OBCE.items():
+            if sloupec in radek:
+                casti.append(f' {atribut}={quoteattr(str(radek[sloupec]))}')
+        casti.append('>')
+        znacky = self._znacky
+        for klic, hodnota in radek.items():
+            if klic in self.ATRIBUTY_OBCE:
+                continue
+            zacatek, konec = znacky.get(klic) or self._znacka_strany(klic)
+            casti += (zacatek, escape(str(hodnota)), konec)
+        casti.append('\n  </obec>')
+        self._f.write(''.join(casti))
+
+    def _ukonci(self) -> None:
+        self._f.write('\n</vysledky>\n' if self.pocet else '</vysledky>\n')
+
+
+class ArrowZapisovac(ZapisovacVysledku):
+    """
+    Průběžný zápis do souboru Arrow IPC ('.arrow').
+    Řádky se hromadí po 'VELIKOST_DAVKY' obcích a každá dávka
+    se zapíše jako jeden record batch, takže zapisovač drží
+    nejvýše jednu dávku. Pevné číselné sloupce včetně 'Číslo obce' mají
+    typ int32, názvy okresů a obcí jsou slovníkově kódované.
+    Sloupce stran (int32) se berou z registru stran stejně jako
+    v 'CsvZapisovac'; strana, která v obci nekandidovala, má
+    hodnotu null. Přibude-li v registru strana až po zápisu první
+    dávky, dosud zapsané dávky se jedním průchodem přepíšou
+    do souboru s rozšířeným schématem. Slovníky se mezi dávkami
+    jen rozšiřují (dictionary delta), jak vyžaduje souborový
+    formát Arrow IPC. Vyžaduje knihovnu 'pyarrow'.
+    """
+
+    format_typ = 'arrow'
+    binarni = True
+    komprimovatelny = False
+
+    # Počet obcí v jednom record batchi (row group u Parquetu)
+    VELIKOST_DAVKY = 1024
+
+    # Slovníkově kódované textové sloupce
+    SLOVNIKOVE_SLOUPCE = (SLOUPEC_OKRES, 'Název obce')
+
+    # Čísla uložená v řádcích jako text
+    TEXTOVA_CISLA = ('Číslo obce', SLOUPEC_OKRSEK)
+
+    def _zacni(self) -> None:
+        self._davka: List[dict] = []
+        self._writer = None
+        self._schema = None
+        self._slovniky: Dict[str, tuple] = {}
+
+    def _zapis_radek(self, radek: dict) -> None:
+        self._zaregistruj_strany(radek)
+        self._davka.append(radek)
+        if len(self._davka) >= self.VELIKOST_DAVKY:
+            self._zapis_davku()
+
+    def _ukonci(self) -> None:
+        self._zapis_davku()
+        if self._writer is not None:
+            self._writer.close()
+
+    def _sestav_schema(self, radek: dict) -> "pa.Schema":
+        slovnik = pa.dictionary(pa.int32(), pa.string())
+        pevne = [
+            (s, slovnik if s in self.SLOVNIKOVE_SLOUPCE else pa.int32())
+            for s in pevne_sloupce(radek)
+        ]
+        return pa.schema(
+            pevne + [(s, pa.int32()) for s in self.registr.sloupce()]
+        )
+
+    def _slovnikove_pole(self, sloupec: str, hodnoty: list) -> "pa.Array":
+        # Společný slovník pro všechny dávky, nové hodnoty na konec
+        indexy_hodnot, slovnik = self._slovniky.setdefault(sloupec, ({}, []))
+        indexy = []
+        for hodnota in hodnoty:
+            index = indexy_hodnot.get(hodnota)
+            if index is None:
+                index = indexy_hodnot[hodnota] = len(slovnik)
+                slovnik.append(hodnota)
+            indexy.append(index)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indexy, pa.int32()), pa.array(slovnik, pa.string())
+        )
+
+    def _sestav_davku(self) -> "pa.RecordBatch":
+        sloupce = []
+        for pole in self._schema:
+            if pole.name in self.SLOVNIKOVE_SLOUPCE:
+                sloupce.append(self._slovnikove_pole(
+                    pole.name, [radek[pole.name] for radek in self._davka]
+                ))
+            elif pole.name in self.TEXTOVA_CISLA:
+                sloupce.append(pa.array(
+                    [int(radek[pole.name]) for radek in self._davka],
+                    pole.type
+                ))
+            else:
+                sloupce.append(pa.array(
+                    [radek.get(pole.name) for radek in self._davka],
+                    pole.type
+                ))
+        return pa.record_batch(sloupce, schema=self._schema)
+
+    def _zapis_davku(self) -> None:
+        if not self._davka:
+            return
+        schema = self._sestav_schema(self._davka[0])
+        if self._writer is None:
+            self._schema = schema
+            self._writer = self._otevri_writer(self._f, schema)
+        elif schema.names != self._schema.names:
+            self._rozsir_schema(schema)
+        self._writer.write_batch(self._sestav_davku())
+        self._davka = []
+
+    def _rozsir_schema(self, schema: "pa.Schema") -> None:
+        # Přepis zapsaných dávek se sloupci nových stran (null)
+        self._writer.close()
+        self._f.close()
+        puvodni = self.docasny_soubor + '.old'
+        os.replace(self.docasny_soubor, puvodni)
+        self._f = self._otevri(self.docasny_soubor, 'w')
+        self._schema = schema
+        self._writer = self._otevri_writer(self._f, schema)
+        for davka in self._precti_davky(puvodni):
+            self._writer.write_batch(pa.record_batch([
+                davka.column(pole.name)
+                if pole.name in davka.schema.names
+                else pa.nulls(davka.num_rows, pole.type)
+                for pole in schema
+            ], schema=schema))
+        os.remove(puvodni)
+
+    def _otevri_writer(self, f, schema: "pa.Schema"):
+        return pa.ipc.new_file(
+            f, schema,
+            options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        )
+
+    def _precti_davky(self, soubor: str) -> Iterator["pa.RecordBatch"]:
+        with pa.ipc.open_file(soubor) as ctenar:
+            for i in range(ctenar.num_record_batches):
+                yield ctenar.get_batch(i)
+
+
+class ParquetZapisovac(ArrowZapisovac):
+    """
+    Průběžný zápis do Apache Parquet. Každá dávka obcí
+    (viz 'ArrowZapisovac') se zapíše jako jedna row group
+    se stejnými typy sloupců. Slovníky si Parquet ukládá
+    v každé row group zvlášť, proto se mezi dávkami nesdílí.
+    Vyžaduje knihovnu 'pyarrow'.
+    """
+
+    format_typ = 'parquet'
+
+    def _slovnikove_pole(self, sloupec: str, hodnoty: list) -> "pa.Array":
+        return pa.array(hodnoty, pa.dictionary(pa.int32(), pa.string()))
+
+    def _otevri_writer(self, f, schema: "pa.Schema"):
+        return pa.parquet.ParquetWriter(f, schema)
+
+    def _precti_davky(self, soubor: str) -> Iterator["pa.RecordBatch"]:
+        parquet = pa.parquet.ParquetFile(soubor)
+        try:
+            for i in range(parquet.num_row_groups):
+                yield from parquet.read_row_group(i).to_batches()
+        finally:
+            parquet.close()
+
+
+class SqliteZapisovac(ZapisovacVysledku):
+    """
+    Zápis do databáze SQLite ('.sqlite', '.db') s normalizovaným
+    schématem: volby, obce, strany a hlasy (jeden řádek pro každou
+    stranu v obci), nad nimi pohled 'vysledky'. Do jedné databáze
+    lze postupně ukládat více okresů i voleb. Obec (v režimu
+    '--okrsky' okrsek obce), která už v databázi pro stejné volby
+    je, se nahradí novými údaji.
+    Databáze se nepřepisuje přes dočasný soubor, celé nahrání
+    ale probíhá v jediné transakci: 'dokonci' ji potvrdí, 'zrus'
+    odvolá (a nově vytvořený soubor smaže). Řádky se vkládají
+    po dávkách 'VELIKOST_DAVKY' obcí pomocí 'executemany'. Během
+    nahrávání jsou vypnuté synchronní zápisy na disk a indexy
+    velkých tabulek se zruší a sestaví až po vložení všech řádků.
+    Čísla na hlasovacím lístku se převezmou z registru stran.
+    """
+
+    format_typ = 'sqlite'
+    komprimovatelny = False
+
+    # Počet obcí vložených jedním voláním 'executemany'
+    VELIKOST_DAVKY = 1024
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS volby (
+            id INTEGER PRIMARY KEY,
+            nazev TEXT UNIQUE
+        )""",
+        """CREATE TABLE IF NOT EXISTS obce (
+            id INTEGER PRIMARY KEY,
+            volby_id INTEGER NOT NULL REFERENCES volby (id),
+            okres TEXT,
+            cislo_obce INTEGER NOT NULL,
+            nazev TEXT NOT NULL,
+            volici INTEGER NOT NULL,
+            vydane_obalky INTEGER NOT NULL,
+            platne_hlasy INTEGER NOT NULL,
+            okrsek INTEGER
+        )""",
+        """CREATE TABLE IF NOT EXISTS strany (
+            id INTEGER PRIMARY KEY,
+            volby_id INTEGER NOT NULL REFERENCES volby (id),
+            cislo INTEGER,
+            nazev TEXT NOT NULL,
+            UNIQUE (volby_id, nazev)
+        )""",
+        """CREATE TABLE IF NOT EXISTS hlasy (
+            obec_id INTEGER NOT NULL REFERENCES obce (id),
+            strana_id INTEGER NOT NULL REFERENCES strany (id),
+            hlasy INTEGER NOT NULL
+        )"""
+    )
+
+    # Pohled se vytváří znovu, až má tabulka obcí všechny sloupce
+    POHLED = (
+        "DROP VIEW IF EXISTS vysledky",
+        """CREATE VIEW vysledky AS
+            SELECT v.nazev AS volby, o.okres, o.cislo_obce,
+                   o.nazev AS obec, o.okrsek, s.cislo AS cislo_strany,
+                   s.nazev AS strana, h.hlasy
+            FROM hlasy h
+            JOIN obce o ON o.id = h.obec_id
+            JOIN strany s ON s.id = h.strana_id
+            JOIN volby v ON v.id = o.volby_id"""
+    )
+
+    # Indexy velkých tabulek, sestavují se po nahrání
+    INDEXY = {
+        'obce_volby_cislo':
+            "CREATE UNIQUE INDEX obce_volby_cislo "
+            "ON obce (volby_id, cislo_obce, okrsek)",
+        'hlasy_obec':
+            "CREATE UNIQUE INDEX hlasy_obec ON hlasy (obec_id, strana_id)",
+        'hlasy_strana':
+            "CREATE INDEX hlasy_strana ON hlasy (strana_id, hlasy)"
+    }
+
+    def __init__(
+        self, vystupni_soubor: str, registr: RegistrStran = None,
+        volby: str = None, kompaktni: bool = False
+    ) -> None:
+        self.vystupni_soubor = vystupni_soubor
+        self.volby = volby
+        self.kompaktni = kompaktni
+        self._vlastni_registr = registr is None
+        self.registr = RegistrStran() if registr is None else registr
+        self.pocet = 0
+        self.komprese = None
+        self._novy = not os.path.exists(vystupni_soubor)
+        self._db = sqlite3.connect(vystupni_soubor, isolation_level=None)
+        try:
+            self._zacni()
+        except sqlite3.Error:
+            self.zrus()
+            raise
+
+    def _zacni(self) -> None:
+        db = self._db
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute("PRAGMA temp_store = MEMORY")
+        db.execute("PRAGMA cache_size = -65536")  # 64 MB
+        if self._novy:
+            # Nová databáze nemá co ztratit, žurnál stačí v paměti
+            db.execute("PRAGMA journal_mode = MEMORY")
+        db.execute("BEGIN IMMEDIATE")
+        for prikaz in self.SCHEMA:
+            db.execute(prikaz)
+        # Databáze z dřívějších verzí nemá sloupec okrsku
+        sloupce = [r[1] for r in db.execute("PRAGMA table_info(obce)")]
+        if 'okrsek' not in sloupce:
+            db.execute("ALTER TABLE obce ADD COLUMN okrsek INTEGER")
+        for prikaz in self.POHLED:
+            db.execute(prikaz)
+        for index in self.INDEXY:
+            db.execute(f"DROP INDEX IF EXISTS {index}")
+
+        db.execute(
+            "INSERT OR IGNORE INTO volby (nazev) VALUES (?)", (self.volby,)
+        )
+        self._volby_id = db.execute(
+            "SELECT id FROM volby WHERE nazev IS ?", (self.volby,)
+        ).fetchone()[0]
+        self._strany = dict(db.execute(
+            "SELECT nazev, id FROM strany WHERE volby_id = ?",
+            (self._volby_id,)
+        ))
+        # ID nových obcí přiděluje zapisovač, aby na ně mohly
+        # odkazovat hlasy vkládané stejnou dávkou
+        self._prvni_id = self._dalsi_id = db.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM obce"
+        ).fetchone()[0]
+        self._obce: List[tuple] = []
+        self._hlasy: List[tuple] = []
+
+    def _id_strany(self, nazev: str) -> int:
+        id_v_registru = self.registr.id_strany(nazev)
+        cislo = (
+            self.registr.cisla[id_v_registru]
+            if id_v_registru is not None else None
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO strany (volby_id, cislo, nazev) "
+            "VALUES (?, ?, ?)", (self._volby_id, cislo, nazev)
+        )
+        id_strany = self._strany[nazev] = self._db.execute(
+            "SELECT id FROM strany WHERE volby_id = ? AND nazev = ?",
+            (self._volby_id, nazev)
+        ).fetchone()[0]
+        return id_strany
+
+    def _zapis_radek(self, radek: dict) -> None:
+        id_obce = self._dalsi_id
+        self._dalsi_id += 1
+        self._obce.append((
+            id_obce, self._volby_id, radek.get(SLOUPEC_OKRES),
+            int(radek['Číslo obce']), radek['Název obce'],
+            radek['Voliči'], radek['Vydané obálky'], radek['Platné hlasy'],
+            int(radek[SLOUPEC_OKRSEK]) if SLOUPEC_OKRSEK in radek else None
+        ))
+        for klic, hodnota in radek.items():
+            id_strany = self._strany.get(klic)
+            if id_strany is None:
+                if klic in POPISNE_SLOUPCE:
+                    continue
+                id_strany = self._id_strany(klic)
+            self._hlasy.append((id_obce, id_strany, hodnota))
+        if len(self._obce) >= self.VELIKOST_DAVKY:
+            self._zapis_davku()
+
+    def _zapis_davku(self) -> None:
+        self._db.executemany(
+            "INSERT INTO obce VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", self._obce
+        )
+        self._db.executemany(
+            "INSERT INTO hlasy VALUES (?, ?, ?)", self._hlasy
+        )
+        self._obce = []
+        self._hlasy = []
+
+    def _ukonci(self) -> None:
+        self._zapis_davku()
+        db = self._db
+        # Starší řádky znovu nahraných obcí (ponechá se nejnovější)
+        nahrazene = """
+            SELECT id FROM obce WHERE id NOT IN (
+                SELECT MAX(id) FROM obce
+                GROUP BY volby_id, cislo_obce, okrsek
+            )"""
+        if db.execute(f"SELECT EXISTS ({nahrazene})").fetchone()[0]:
+            db.execute(f"DELETE FROM hlasy WHERE obec_id IN ({nahrazene})")
+            db.execute(f"DELETE FROM obce WHERE id IN ({nahrazene})")
+        for prikaz in self.INDEXY.values():
+            db.execute(prikaz)
+        # Statistiky indexů, aby dotazy na stranu použily index
+        db.execute("ANALYZE")
+        db.execute("COMMIT")
+
+    def zapis(self, radek: dict) -> None:
+        self._zapis_radek(radek)
+        self.pocet += 1
+
+    def dokonci(self) -> None:
+        """Vloží zbylé řádky, sestaví indexy a potvrdí transakci."""
+        try:
+            self._ukonci()
+        except sqlite3.Error:
+            self.zrus()
+            raise
+        self._db.close()
+        self._db = None
+
+    def zrus(self) -> None:
+        """Odvolá transakci, nově vytvořenou databázi smaže."""
+        if self._db.in_transaction:
+            self._db.execute("ROLLBACK")
+        self._db.close()
+        self._db = None
+        if self._novy:
+            for soubor in (self.vystupni_soubor,
+                           self.vystupni_soubor + '-journal'):
+                try:
+                    os.remove(soubor)
+                except OSError:
+                    pass
+
+    @property
+    def uzavreny(self) -> bool:
+        return self._db is None
+
+
+# Komprese výstupu podle poslední přípony souboru ('.csv.gz')
+KOMPRESE = {
+    'gz': 'gzip',
+    'zst': 'zstd'
+}
+
+# Zapisovače podle přípony výstupního souboru
+ZAPISOVACE = {
+    'csv': CsvZapisovac,
+    'json': JsonZapisovac,
+    'jsonl': JsonlZapisovac,
+    'ndjson': JsonlZapisovac,
+    'xml': XmlZapisovac,
+    'parquet': ParquetZapisovac,
+    'arrow': ArrowZapisovac,
+    'sqlite': SqliteZapisovac,
+    'db': SqliteZapisovac
+}
+
+
+def rozloz_priponu(vystupni_soubor: str) -> Tuple[str, str]:
+    """
+    Rozloží název výstupního souboru na příponu formátu
+    a kompresi. Přípona komprese ('.gz', '.zst') může být jen
+    poslední a formát se pak určí z přípony před ní.
+
+    Args:
+        vystupni_soubor (str): Název výstupního souboru.
+
+    Returns:
+        Tuple[str, str]: Přípona formátu malými písmeny a komprese
+                         ('gzip', 'zstd'), nebo None bez komprese.
+
+    Example:
+        >>> rozloz_priponu('data/karvina.json.gz')
+            ('json', 'gzip')
+        >>> rozloz_priponu('karvina.csv')
+            ('csv', None)
+    """
+    pripony = os.path.basename(vystupni_soubor).lower().split('.')[1:]
+    komprese = None
+    if len(pripony) > 1 and pripony[-1] in KOMPRESE:
+        komprese = KOMPRESE[pripony.pop()]
+    return (pripony[-1] if pripony else ''), komprese
+
+
+def vyber_zapisovac(vystupni_soubor: str) -> type:
+    """
+    Podle přípony souboru vybere třídu zapisovače, včetně
+    dvojité přípony komprimovaného výstupu ('.csv.gz').
+    Při nepodporované příponě nebo kompresi vypíše chybovou
+    hlášku a vyvolá UnsupportedFormatError.
+
+    Args:
+        vystupni_soubor (str): Název výstupního souboru.
+
+    Returns:
+        type: Třída zapisovače (potomek 'ZapisovacVysledku').
+
+    Raises:
+        UnsupportedFormatError: Pokud přípona není podporována.
+
+    Example:
+        >>> vyber_zapisovac('karvina.json')
+            <class 'JsonZapisovac'>
+        >>> vyber_zapisovac('karvina.xml.zst')
+            <class 'XmlZapisovac'>
+    """
+    # Automatické rozpoznání přípony
+    pripona, komprese = rozloz_priponu(vystupni_soubor)
+    if pripona in ZAPISOVACE and komprese and (
+        not ZAPISOVACE[pripona].komprimovatelny
+    ):
+        # Binární formáty se dále nekomprimují
+        pripona = '.'.join(
+            os.path.basename(vystupni_soubor).lower().split('.')[-2:]
+        )
+    if pripona not in ZAPISOVACE:
+        print("\n" + SEPARATOR)
+        print(
+            Fore.LIGHTYELLOW_EX + 
+            MSG_ERROR_UNSUPPORTED_FORMAT.format(format_typ=pripona)
+        )
+        print(SEPARATOR + "\n")
+        raise UnsupportedFormatError(
+            LOG_ERROR_UNSUPPORTED_FORMAT.format(format_typ=pripona)
+        )
+    if issubclass(ZAPISOVACE[pripona], ArrowZapisovac) and pa is None:
+        print("\n" + SEPARATOR)
+        print(
+            Fore.LIGHTYELLOW_EX +
+            MSG_ERROR_PYARROW_MISSING.format(format_typ=pripona)
+        )
+        print(SEPARATOR + "\n")
+        raise UnsupportedFormatError(
+            LOG_ERROR_PYARROW_MISSING.format(format_typ=pripona)
+        )
+    if komprese == 'zstd' and zstandard is None:
+        print("\n" + SEPARATOR)
+        print(Fore.LIGHTYELLOW_EX + MSG_ERROR_ZSTANDARD_MISSING)
+        print(SEPARATOR + "\n")
+        raise UnsupportedFormatError(LOG_ERROR_ZSTANDARD_MISSING)
+    return ZAPISOVACE[pripona]
+
+
+def otevri_zapisovac(
+    vystupni_soubor: str, registr: RegistrStran = None, volby: str = None,
+    kompaktni: bool = False
+) -> ZapisovacVysledku:
+    """
+    Otevře průběžný zápis výsledků do souboru ve formátu
+    podle přípony. Volá se před stahováním, takže chybná přípona
+    nebo nezapisovatelné umístění se zjistí hned na začátku.
+
+    Args:
+        vystupni_soubor (str): Název výstupního souboru.
+        registr (RegistrStran, optional): Registr stran běhu.
+        volby (str, optional): Označení voleb (viz 'oznaceni_voleb').
+        kompaktni (bool, optional): JSON bez odsazení ('--compact').
 
     Returns:
-        tuple: Dvojice, kde:
-            - list: Seznam výsledků volebních dat pro každou obec;
-                    každý výsledek obsahuje informace jako 
-                    číslo obce, název obce, voliče, vydané obálky, 
-                    platné hlasy a hlasy pro jednotlivé strany.
-            
-            - dict: Statistiky zpracování, obsahující:
-                - 'zpracovane_obce': Počet zpracovaných obcí
-                - 'chyby': Počet chyb při zpracování obcí
-                - 'celkem_volicu': Celkový počet voličů pro všechny
-                                   zpracované obce
-                - 'celkem_platnych_hlasu': Celkový počet platných hlasů
-                                           pro všechny zpracované obce
+        ZapisovacVysledku: Otevřený zapisovač.
 
-    Examples:
-        obce = (
-            [{'url': 'https://www.volby.cz/pls/ps2021nss/
-            ps311?xjazyk=CZ&xkraj=14&xobec=598925',
-            'cislo_obce': '598925', 
-            'nazev_obce': 'Albrechtice'}, ...
-            ]
-        )
-        >>> vysledky, stats = zpracuj_obce(obce)
-        vysledky
-        [{'Číslo obce': '598925', 'Název obce': 'Albrechtice',
-          'Voliči': 3173,'Vydané obálky': 1957, 
-          'Platné hlasy': 1944, 'ANO 2011': 635, ...}, ...
-        ]
-        stats
-        {'zpracovane_obce': 17, 'chyby': 0, 
-         'celkem_volicu': 106196,
-         'celkem_platnych_hlasu': 106196}
-    
-    Note:
-        Funkce používá knihovnu 'tqdm'.
-        Pokud není nainstalována, je třeba ji nainstalovat
-        pomocí 'pip install tqdm'
+    Raises:
+        UnsupportedFormatError: Pokud přípona není podporována.
+        FileSavingError: Pokud soubor nelze vytvořit.
     """
-    
-    vysledky = []
-    # Přidáme statistiky
-    stats = {
-        'zpracovane_obce': 0,
-        'chyby': 0,
-        'celkem_volicu': 0,
-        'celkem_platnych_hlasu': 0
-    }
-
-    print("\n" + Fore.LIGHTCYAN_EX + MSG_INFO_PROCESSING_DATA + "\n")
-    logging.info(LOG_INFO_PROCESSING_OBCE)
-    
-    total_obce = len(obce)
+    trida = vyber_zapisovac(vystupni_soubor)
     print(
-        "\n" + Fore.LIGHTCYAN_EX + 
-        MSG_INFO_COUNT_OBCE.format(total=total_obce) + "\n"
+        Fore.LIGHTCYAN_EX + MSG_INFO_SAVING.format(
+            filename=vystupni_soubor, format=trida.format_typ.upper()
+        )
     )
-    
-    # Zpracování každé obce s progress barem
-    for i, obec in enumerate(
-        tqdm(obce, desc="Zpracovávám obce", unit="obec")
-    ):
-        obec_nazev = obec['nazev_obce']
-        obec_cislo = obec['cislo_obce']
-        # Výpis aktuální obce
-        print(
-            MSG_INFO_PROCESSING_OBCE.format(
-            cislo=i+1, total=total_obce, 
-            obec_nazev=obec_nazev, obec_cislo=obec_cislo
-            )
+    logging.info(
+        LOG_INFO_SAVING.format(
+            filename=vystupni_soubor, format=trida.format_typ.upper()
         )
-        
-        try:
-            logging.debug(
-                LOG_DEBUG_PROCESSING_OBCE.format(
-                    obec_nazev=obec_nazev,
-                    obec_cislo=obec_cislo,
-                    url=obec['url']
-                )
-            )
-            data = ziskej_data_obce(obec['url'])
-               
-            radek = {
-                'Číslo obce': obec_cislo,
-                'Název obce': data['obec'],
-                'Voliči': data['volici'],
-                'Vydané obálky': data['vydane_obalky'],
-                'Platné hlasy': data['platne_hlasy']
-            }
-               
-            for strana in data['strany']:
-                radek[strana['strana']] = strana['hlasy']
-                   
-            vysledky.append(radek)
-
-            # Aktualizace statistik
-            stats['zpracovane_obce'] += 1
-            stats['celkem_volicu'] += data['volici']
-            stats['celkem_platnych_hlasu'] += data['platne_hlasy']
-            logging.debug(
-                LOG_DEBUG_OBCE_PROCESSED.format(
-                    obec_nazev=obec_nazev,
-                    obec_cislo=obec_cislo
-                )   
-            )
-
-        except (ValueError, DataParsingError) as e:
-            vypis_chybu(
-                LOG_ERROR_PARSING_ERROR, obec_nazev, obec_cislo, e
-            )
-            stats['chyby'] += 1
-            continue # Pokračuj na další obec
-           
-        except requests.exceptions.RequestException as e:
-            vypis_chybu(
-                LOG_ERROR_REQUEST_OBCE_FAILED, obec_nazev, obec_cislo, e
-            )
-            stats['chyby'] += 1
-            continue # Pokračuj na další obec
-        
-        except Exception as e:
-            logging.error(
-                LOG_ERROR_UNEXPECTED_OBCE.format(
-                    obec_nazev=obec_nazev,
-                    obec_cislo=obec_cislo,
-                    error_detail=e
-                ), exc_info=True
-            )
-            print("\n" + SEPARATOR)
-            print(
-                Fore.LIGHTYELLOW_EX + MSG_ERROR_UNEXPECTED.format(
-                    operation=(
-                        f"zpracování obce {obec_nazev} ({obec_cislo}). "
-                        "Tato obec bude přeskočena."
-                    ),
-                    error_detail=e
-                )
-            )
-            print(SEPARATOR + "\n")
-            stats['chyby'] += 1
-            continue # Pokračuj na další obec
-    
-    print("\n")
-    logging.info(LOG_INFO_OBCE_PROCESSED)
-    return vysledky, stats
+    )
+    try:
+        return trida(vystupni_soubor, registr, volby, kompaktni)
+    except (OSError, sqlite3.Error) as e:
+        zpracuj_chybu_ukladani(vystupni_soubor, e)
 
 
-def vypis_chybu(
-    a: str, 
-    obec_nazev: str, 
-    obec_cislo: str, chyba: str
-) -> None:
+def dokonci_zapisovac(zapisovac: ZapisovacVysledku) -> None:
     """
-    Vypíše do logu a na konzoli chybové hlášení týkající se dané obce.
+    Dokončí průběžný zápis a vypíše výsledek uživateli.
+    Pokud se nezapsal žádný řádek, soubor se nevytvoří
+    a vyvolá se FileSavingError (stejně jako v 'uloz_soubor').
 
     Args:
-        a (str): Šablona formátovacího řetězce 
-                 pro logování chybové události.
-        obec_nazev (str): Název obce.
-        obec_cislo (str): Číslo obce.
-        chyba (str): Podrobnosti o chybě.
+        zapisovac (ZapisovacVysledku): Otevřený zapisovač.
 
-    Returns:
-        None: Funkce nevrací žádnou hodnotu při úspěchu.
+    Raises:
+        FileSavingError: Pokud nejsou data nebo zápis selže.
+    """
+    vystupni_soubor = zapisovac.vystupni_soubor
+    if not zapisovac.pocet:
+        zapisovac.zrus()
+        logging.warning(
+            LOG_WARNING_NO_DATA_TO_SAVE.format(filename=vystupni_soubor)
+        )
+        print("\n" + SEPARATOR)
+        print(Fore.LIGHTYELLOW_EX + MSG_WARNING_NO_DATA_SAVE)
+        print(SEPARATOR + "\n")
+        raise FileSavingError(LOG_ERROR_SAVING_FAILED)
 
-    Example:
-        >>> vypis_chybu(
-                LOG_ERROR_PARSING_ERROR, "Praha", "001", 
-                "Chyba při parsování dat"
-            )
+    try:
+        zapisovac.dokonci()
+    except (OSError, sqlite3.Error) as e:
+        zpracuj_chybu_ukladani(vystupni_soubor, e)
+    print(
+        Fore.LIGHTGREEN_EX + 
+        MSG_INFO_SUCCESS_SAVE.format(filename=vystupni_soubor)
+    )
+    logging.info(LOG_INFO_SAVE_SUCCESS.format(filename=vystupni_soubor))
+
+
+def zpracuj_chybu_ukladani(vystupni_soubor: str, e: OSError) -> None:
+    """
+    Zaloguje a vypíše chybu zápisu souboru a vyvolá FileSavingError.
+
+    Args:
+        vystupni_soubor (str): Název výstupního souboru.
+        e (OSError | sqlite3.Error): Zachycená chyba.
+
+    Raises:
+        FileSavingError: Vždy.
     """
     logging.error(
-        a.format(
-            obec_nazev=obec_nazev, 
-            obec_cislo=obec_cislo, 
-            error_detail=chyba
+        LOG_ERROR_SAVE_FAILED.format(
+            filename=vystupni_soubor, error_detail=e
         ), exc_info=True
     )
-    
     print("\n" + SEPARATOR)
     print(
         Fore.LIGHTYELLOW_EX + 
-        MSG_WARNING_PROCESSING_ERROR.format(
-            obec_nazev=obec_nazev, 
-            obec_cislo=obec_cislo, 
-            error_detail=chyba
+        MSG_ERROR_SAVE_FAILED.format(
+            filename=vystupni_soubor, error_detail=e
         )
     )
     print(SEPARATOR + "\n")
+    raise FileSavingError(LOG_ERROR_SAVING_FAILED) from e
 
 
 def uloz_soubor(
@@ -1331,21 +5915,8 @@ def uloz_soubor(
             LOG_INFO_SAVE_SUCCESS.format(filename=vystupni_soubor)
         )
     
-    except OSError as e:
-        logging.error(
-            LOG_ERROR_SAVE_FAILED.format(
-                filename=vystupni_soubor, error_detail=e
-            ), exc_info=True
-        )
-        print("\n" + SEPARATOR)
-        print(
-            Fore.LIGHTYELLOW_EX + 
-            MSG_ERROR_SAVE_FAILED.format(
-                filename=vystupni_soubor, error_detail=e
-            )
-        )
-        print(SEPARATOR + "\n")
-        raise FileSavingError(LOG_ERROR_SAVING_FAILED)
+    except (OSError, sqlite3.Error) as e:
+        zpracuj_chybu_ukladani(vystupni_soubor, e)
     
     except Exception as e:
         logging.error(
@@ -1368,10 +5939,12 @@ def uloz_soubor(
 
 def uloz_vysledky(vysledky, vystupni_soubor) -> None:
     """
-    Ukládá výsledky do souboru podle zadané přípony (CSV, JSON, XML).
+    Ukládá výsledky do souboru podle zadané přípony (CSV, JSON,
+    JSON Lines, XML, Parquet, Arrow, SQLite).
     Funkce rozpozná příponu souboru z názvu zadaného uživatelem a
     podle ní vybere správnou metodu pro uložení dat.
-    Podporované formáty jsou CSV, JSON a XML. V případě 
+    Podporované formáty jsou CSV, JSON, JSON Lines, XML, Parquet
+    a Arrow IPC (s knihovnou 'pyarrow') a databáze SQLite. V případě 
     nepodporovaného formátu funkce ukončí program s chybovou hláškou.
 
     Args:
@@ -1401,27 +5974,43 @@ def uloz_vysledky(vysledky, vystupni_soubor) -> None:
         Funkce podporuje následující formáty souborů:
         - CSV (.csv)
         - JSON (.json)
+        - JSON Lines (.jsonl, .ndjson)
         - XML (.xml)
+        - Apache Parquet (.parquet)
+        - Arrow IPC (.arrow)
+        - SQLite (.sqlite, .db)
     """
-    # Automatické rozpoznání přípony
-    pripona = vystupni_soubor.split('.')[-1].lower()
-
-    if pripona == 'csv':
-        uloz_soubor(vysledky, vystupni_soubor, 'csv', uloz_do_csv)
-    elif pripona == 'json':
-        uloz_soubor(vysledky, vystupni_soubor, 'json', uloz_do_json)
-    elif pripona == 'xml':
-        uloz_soubor(vysledky, vystupni_soubor, 'xml', uloz_do_xml)
-    else:
-        print("\n" + SEPARATOR)
-        print(
-            Fore.LIGHTYELLOW_EX + 
-            MSG_ERROR_UNSUPPORTED_FORMAT.format(format_typ=pripona)
-        )
-        print(SEPARATOR + "\n")
-        raise UnsupportedFormatError(
-            LOG_ERROR_UNSUPPORTED_FORMAT.format(format_typ=pripona)
-        )
+    trida = vyber_zapisovac(vystupni_soubor)
+    uloz_soubor(
+        vysledky, vystupni_soubor, trida.format_typ,
+        lambda vysledky, soubor: zapis_vse(trida, vysledky, soubor)
+    )
+
+
+def zapis_vse(
+    trida: type, vysledky: list, vystupni_soubor: str,
+    registr: RegistrStran = None, volby: str = None,
+    kompaktni: bool = False
+) -> None:
+    """
+    Zapíše celý seznam výsledků zapisovačem zadané třídy.
+
+    Args:
+        trida (type): Třída zapisovače (např. 'CsvZapisovac').
+        vysledky (list): Seznam výstupních řádků.
+        vystupni_soubor (str): Cesta k výstupnímu souboru.
+        registr (RegistrStran, optional): Registr stran pro sloupce
+                                 zapisovače. Výchozí je registr
+                                 tabulky, je-li 'vysledky'
+                                 TabulkaVysledku.
+        volby (str, optional): Označení voleb (viz 'oznaceni_voleb').
+        kompaktni (bool, optional): JSON bez odsazení ('--compact').
+    """
+    if registr is None:
+        registr = getattr(vysledky, 'registr', None)
+    with trida(vystupni_soubor, registr, volby, kompaktni) as zapisovac:
+        for vysledek in vysledky:
+            zapisovac.zapis(vysledek)
  
 
 def uloz_do_csv(vysledky, vystupni_soubor) -> None:
@@ -1475,24 +6064,7 @@ def uloz_do_csv(vysledky, vystupni_soubor) -> None:
         bude tento sloupec v CSV souboru prázdný.
     """
     
-    sloupce = [
-        'Číslo obce',
-        'Název obce',
-        'Voliči',
-        'Vydané obálky',
-        'Platné hlasy'
-    ]
-    for vysledek in vysledky:
-        for klic in vysledek.keys():
-            if klic not in sloupce:
-                sloupce.append(klic)
-            
-    with open(
-        vystupni_soubor, 'w', newline='', encoding='utf-8-sig'
-    ) as f:
-        writer = csv.DictWriter(f, fieldnames=sloupce)
-        writer.writeheader()
-        writer.writerows(vysledky)
+    zapis_vse(CsvZapisovac, vysledky, vystupni_soubor)
         
 
 def uloz_do_json(vysledky, vystupni_soubor) -> None:
@@ -1543,8 +6115,7 @@ def uloz_do_json(vysledky, vystupni_soubor) -> None:
         s volebními daty.
     """
     
-    with open(vystupni_soubor, 'w', encoding='utf-8') as f:
-        json.dump(vysledky, f, ensure_ascii=False, indent=2)
+    zapis_vse(JsonZapisovac, vysledky, vystupni_soubor)
        
 
 def uloz_do_xml(vysledky, vystupni_soubor) -> None:
@@ -1590,29 +6161,21 @@ def uloz_do_xml(vysledky, vystupni_soubor) -> None:
     Notes:
         Funkce vytváří XML soubor s deklarací UTF-8 a přidává do něj
         data ve formátu, kde každá obec je reprezentována jako
-        XML element `<obec>`. Každý volební údaj o obci je zapsán jako
-        podřízený element, např. `<Číslo obce>`. 
-        Funkce používá formátování s odsazením ET.indent, aby 
-        výstupní XML byl přehledný; tato funkce je dostupná 
-        od Pythonu 3.9+. Pokud se používá starší verze, bude potřeba 
-        odsazení implementovat ručně nebo použít jiný přístup.
-    """
-    
-    root = ET.Element('vysledky')
-    for vysledek in vysledky:
-        obec = ET.SubElement(root, 'obec')
-        for klic, hodnota in vysledek.items():
-            ET.SubElement(obec, klic).text = str(hodnota)
-    strom = ET.ElementTree(root)
-    
-    # Přidáme odsazení 
-    ET.indent(strom, space="  ")
-    
-    # Ulož strom do souboru
-    strom.write(vystupni_soubor, encoding='utf-8', xml_declaration=True)
+        XML element `<obec>` s atributy `cislo` a `nazev`. Voliči,
+        obálky a platné hlasy jsou podřízené elementy (`<volici>`,
+        ...), hlasy každé strany element `<strana nazev="...">`
+        (viz 'XmlZapisovac'). Výstup je odsazený 2 mezerami,
+        aby byl přehledný.
+    """
+    
+    zapis_vse(XmlZapisovac, vysledky, vystupni_soubor)
              
 
-def vypis_statistiky(stats: dict, cas_zacatku: float) -> None:
+def vypis_statistiky(
+    stats: dict,
+    cas_zacatku: float,
+    vysledky: TabulkaVysledku = None
+) -> None:
     """
     Vytvoří a vypíše statistiku zpracování volebních dat včetně
     doby zpracování a volební účasti.
@@ -1629,8 +6192,28 @@ def vypis_statistiky(stats: dict, cas_zacatku: float) -> None:
             - 'chyby': int - počet chyb při zpracování
             - 'celkem_volicu': int - celkový počet voličů
             - 'celkem_platnych_hlasu': int - celkový počet platných hlasů
+            Volitelné klíče:
+            - 'nova_spojeni': int - počet nově otevřených spojení
+            - 'znovupouzita_spojeni': int - počet znovu použitých spojení
+            - 'cache_zasahy', 'cache_revalidace', 'cache_minuti': int
+              - využití diskové mezipaměti (vypíše se jen s mezipamětí)
+            - 'omezovac_zpomaleni': int, 'omezovac_cekani': float
+              - zpomalení serverem a celkové čekání na omezovač
+              (vypíše se jen s '--max-rate' nebo po zpomalení)
+            - 'obce_ze_zurnalu': int - počet obcí převzatých ze žurnálu
+              (vypíše se jen při pokračování přerušeného běhu)
+            - 'archiv_zaznamenano' nebo 'archiv_prehrano': int - počet
+              stránek nahraných do archivu, nebo z něj přehraných
+            - 'sledovani_cyklu', 'sledovani_zmen': int - počet cyklů
+              a změn obcí při sledování ('--watch')
         cas_zacatku (float): Časová značka (epoch time) začátku zpracování.
                              Slouží k výpočtu doby zpracování.
+        vysledky (TabulkaVysledku, optional): Výsledky v paměti.
+                             Je-li zadána, počet obcí, voličů
+                             a platných hlasů se spočítá z jejích
+                             sloupců místo z 'stats' a s knihovnou
+                             numpy se vypíšou i statistiky výsledků
+                             (viz 'TabulkaVysledku.statistiky').
 
     Returns:
         None: Funkce nevrací žádnou hodnotu při úspěchu.
@@ -1651,6 +6234,7 @@ def vypis_statistiky(stats: dict, cas_zacatku: float) -> None:
         Celkový počet voličů: 1,000
         Celkový počet platných hlasů: 800
         Průměrná volební účast: 80.00%
+        Síťová spojení: 0 nových, 0 znovu použitých
 
     Notes:
         Funkce zobrazuje:
@@ -1659,8 +6243,16 @@ def vypis_statistiky(stats: dict, cas_zacatku: float) -> None:
         - Počet chyb, které nastaly při zpracování.
         - Celkový počet voličů a platných hlasů s formátováním čísel.
         - Vypočítanou průměrnou volební účast jako procento.
+        - Počet nově otevřených a znovu použitých síťových spojení.
+        - Počet zásahů a minutí diskové mezipaměti, pokud byla použita.
+        - Rozdělení volební účasti v obcích, obálky bez platného
+          hlasu, největší a nejmenší obec a strany s nejvíce hlasy
+          (jen s výsledky v paměti a knihovnou numpy).
 
     """
+    if vysledky is not None:
+        stats = {**stats, **vysledky.souhrn()}
+
     # Výpis statistik na konci
     cas_konce = time.time()
     celkovy_cas_zpracovani = cas_konce - cas_zacatku
@@ -1691,16 +6283,212 @@ def vypis_statistiky(stats: dict, cas_zacatku: float) -> None:
             stats['celkem_platnych_hlasu']/stats['celkem_volicu']*100
         )
         
+    zprava = MSG_STATISTICS
+    if 'cache_zasahy' in stats:
+        zprava += MSG_STATISTICS_CACHE.format(
+            zasahy=stats['cache_zasahy'],
+            revalidace=stats['cache_revalidace'],
+            minuti=stats['cache_minuti']
+        )
+    if 'omezovac_zpomaleni' in stats:
+        zprava += MSG_STATISTICS_OMEZOVAC.format(
+            zpomaleni=stats['omezovac_zpomaleni'],
+            cekani=stats['omezovac_cekani']
+        )
+    if 'obce_ze_zurnalu' in stats:
+        zprava += MSG_STATISTICS_ZURNAL.format(
+            pocet=stats['obce_ze_zurnalu']
+        )
+    if 'archiv_zaznamenano' in stats:
+        zprava += MSG_STATISTICS_ARCHIV_RECORD.format(
+            pocet=stats['archiv_zaznamenano']
+        )
+    if 'sledovani_cyklu' in stats:
+        zprava += MSG_STATISTICS_WATCH.format(
+            cykly=stats['sledovani_cyklu'], zmeny=stats['sledovani_zmen']
+        )
+    if 'archiv_prehrano' in stats:
+        zprava += MSG_STATISTICS_ARCHIV_REPLAY.format(
+            pocet=stats['archiv_prehrano']
+        )
+    # Statistiky výsledků se formátují zvlášť (názvy obcí a stran)
+    blok_vysledku = ''
+    if vysledky and np is not None:
+        statistiky = vysledky.statistiky()
+        nejvetsi = statistiky['nejvetsi_obce'][0]
+        nejmensi = statistiky['nejmensi_obce'][0]
+        blok_vysledku = MSG_STATISTICS_VYSLEDKY.format(
+            ucast_min=statistiky['ucast']['min'],
+            ucast_median=statistiky['ucast']['median'],
+            ucast_max=statistiky['ucast']['max'],
+            ucast_vazena=statistiky['ucast']['vazena'],
+            neplatne=statistiky['obalky_bez_platneho_hlasu']['pocet'],
+            neplatne_podil=statistiky['obalky_bez_platneho_hlasu']['podil'],
+            nejvetsi=nejvetsi['nazev'],
+            nejvetsi_volici=nejvetsi['volici'],
+            nejmensi=nejmensi['nazev'],
+            nejmensi_volici=nejmensi['volici'],
+            strany='\n'.join(
+                MSG_STATISTICS_VYSLEDKY_STRANA.format(poradi=i, **strana)
+                for i, strana in enumerate(
+                    statistiky['strany'][:POCET_V_SOUHRNU], 1
+                )
+            )
+        )
+
     print(
-        Fore.LIGHTCYAN_EX + MSG_STATISTICS.format(
+        Fore.LIGHTCYAN_EX + zprava.format(
             time=cas_string,
             pocet=stats['zpracovane_obce'],
             chyby=stats['chyby'],
             volici=stats['celkem_volicu'],
             hlasy=stats['celkem_platnych_hlasu'],
-            ucast=round(volebni_ucast, 2)
+            ucast=round(volebni_ucast, 2),
+            nova_spojeni=stats.get('nova_spojeni', 0),
+            znovupouzita_spojeni=stats.get('znovupouzita_spojeni', 0)
+        ) + blok_vysledku
+    )
+
+
+def uloz_statistiky(vysledky: TabulkaVysledku, soubor: str) -> None:
+    """
+    Uloží statistiky výsledků (viz 'TabulkaVysledku.statistiky')
+    do souboru JSON ('--stats'). Soubor se zapíše atomicky přes
+    dočasný soubor '<soubor>.part'.
+
+    Args:
+        vysledky (TabulkaVysledku): Výsledky všech obcí.
+        soubor (str): Cesta k souboru JSON.
+
+    Raises:
+        FileSavingError: Pokud soubor nelze zapsat.
+    """
+    docasny = soubor + '.part'
+    try:
+        with open(docasny, 'w', encoding='utf-8') as f:
+            f.write(serializuj_json(vysledky.statistiky()) + '\n')
+        os.replace(docasny, soubor)
+    except OSError as e:
+        zpracuj_chybu_ukladani(soubor, e)
+    print(Fore.LIGHTGREEN_EX + MSG_INFO_SUCCESS_STATS.format(filename=soubor))
+    logging.info(LOG_INFO_STATS_SUCCESS.format(filename=soubor))
+
+
+def zkontroluj_souhrny(
+    souhrny: SouhrnyUzemi,
+    session: requests.Session = None,
+    parser: str = VYCHOZI_PARSER,
+    workers: int = VYCHOZI_POCET_VLAKEN
+) -> None:
+    """
+    Porovná souhrny úplných okresů (zpracovány všechny obce) se
+    zveřejněnými výsledky okresů. Stránka okresu se seznamem obcí
+    (ps32) součty neobsahuje, stahuje se proto stránka výsledků
+    okresu (ps33), která má stejné tabulky jako stránka obce
+    (viz 'parsuj_data_obce' s 'NADPIS_OKRESU'). Stránky se stahují
+    souběžně v 'workers' vláknech. Výsledek se uloží do okresu
+    jako 'kontrola' {'shoda': bool, 'rozdily': {sloupec:
+    [spočteno, zveřejněno]}} a okres bez názvu převezme název
+    ze stránky. Rozdíly se vypíší a zalogují jako varování,
+    okres, jehož stránku nelze stáhnout, se přeskočí.
+
+    Args:
+        souhrny (SouhrnyUzemi): Souhrny po zpracování obcí.
+        session (requests.Session, optional): Sdílená session.
+        parser (str, optional): HTML parser (viz 'parsuj_html').
+        workers (int, optional): Počet souběžně stahovaných okresů.
+    """
+    def stahni(okres: dict) -> ObecData:
+        response = stahni_data(souhrny.url_vysledku(okres), session=session)
+        return parsuj_data_obce(
+            response.content, parser,
+            deklarovane_kodovani(response.headers.get('Content-Type')),
+            nadpis=NADPIS_OKRESU
+        )
+
+    shoda = zkontrolovano = 0
+    with contextlib.closing(spust_paralelne(
+        stahni, souhrny.uplne_okresy(), workers
+    )) as stahovani:
+        for okres, future in stahovani:
+            try:
+                data = future.result()
+            except (RequestException, DataParsingError, ValueError) as e:
+                logging.warning(
+                    LOG_WARNING_KONTROLA_OKRESU.format(
+                        okres=okres['nazev'] or okres['kod'],
+                        url=souhrny.url_vysledku(okres), error_detail=e
+                    )
+                )
+                continue
+            zkontrolovano += 1
+            if okres['nazev'] is None:
+                okres['nazev'] = data['obec']
+
+            zverejneno = {
+                'volici': data['volici'],
+                'vydane_obalky': data['vydane_obalky'],
+                'platne_hlasy': data['platne_hlasy']
+            }
+            zverejneno.update(
+                (strana['strana'], strana['hlasy'])
+                for strana in data['strany']
+            )
+            spocteno = {klic: okres[klic] for klic in (
+                'volici', 'vydane_obalky', 'platne_hlasy'
+            )}
+            spocteno.update(okres['strany'])
+            rozdily = {
+                klic: [spocteno.get(klic), zverejneno.get(klic)]
+                for klic in dict.fromkeys([*spocteno, *zverejneno])
+                if spocteno.get(klic, 0) != zverejneno.get(klic, 0)
+            }
+            okres['kontrola'] = {'shoda': not rozdily, 'rozdily': rozdily}
+            if rozdily:
+                print(
+                    Fore.LIGHTYELLOW_EX + MSG_WARNING_KONTROLA_SOUHRNU.format(
+                        okres=okres['nazev'], rozdily=rozdily
+                    )
+                )
+                logging.warning(
+                    LOG_WARNING_KONTROLA_SOUHRNU.format(
+                        okres=okres['nazev'], rozdily=rozdily
+                    )
+                )
+            else:
+                shoda += 1
+
+    print(
+        Fore.LIGHTCYAN_EX + MSG_INFO_KONTROLA_SOUHRNU.format(
+            shoda=shoda, celkem=zkontrolovano
         )
     )
+    logging.info(
+        LOG_INFO_KONTROLA_SOUHRNU.format(shoda=shoda, celkem=zkontrolovano)
+    )
+
+
+def uloz_souhrny(souhrny: SouhrnyUzemi, soubor: str) -> None:
+    """
+    Uloží souhrny za okresy, kraje a celý stát (viz
+    'SouhrnyUzemi.vystup') do souboru JSON ('--souhrny'). Soubor
+    se zapíše atomicky přes dočasný soubor '<soubor>.part'.
+
+    Args:
+        souhrny (SouhrnyUzemi): Souhrny výsledků.
+        soubor (str): Cesta k souboru JSON.
+
+    Raises:
+        FileSavingError: Pokud soubor nelze zapsat.
+    """
+    docasny = soubor + '.part'
+    try:
+        with open(docasny, 'w', encoding='utf-8') as f:
+            f.write(serializuj_json(souhrny.vystup()) + '\n')
+        os.replace(docasny, soubor)
+    except OSError as e:
+        zpracuj_chybu_ukladani(soubor, e)
+    logging.info(LOG_INFO_SOUHRNY_SUCCESS.format(filename=soubor))
 
 
 def zpracuj_data() -> None:
@@ -1710,13 +6498,17 @@ def zpracuj_data() -> None:
     - kontroly vstupních argumentů
     - získání seznamu obcí
     - zpracování dat jednotlivých obcí
-    - uložení výsledků do formátu CSV, JSON nebo XML
+    - průběžného ukládání výsledků do formátu CSV, JSON, XML,
+      Parquet, Arrow nebo do databáze SQLite
     - výpisu statistik zpracování
     Funkce automaticky zavolá další podfunkce pro kontrolu 
     argumentů, získání dat z webu, jejich zpracování, 
     uložení do souboru a zobrazení souhrnných statistik. 
     Pokud dojde k chybě, bude vypsána chybová zpráva a 
     program se ukončí s příslušným kódem.
+    Selže-li některá obec, okres nebo zjištění okrsků obce, výstup
+    se zapíše ze zbylých obcí, žurnál zůstane pro '--resume'
+    a program skončí s kódem 1.
 
     Args:
         None: Funkce nevyžaduje žádné argumenty.
@@ -1741,9 +6533,28 @@ def zpracuj_data() -> None:
 
     Notes:
         Tento skript očekává dva argumenty příkazové řádky:
-        - URL adresa okresu obsahující volební data.
+        - URL adresa okresu obsahující volební data, nebo přehledu
+          celých voleb (ps3), ze kterého se zpracují všechny okresy
+          do jednoho souboru se sloupcem 'Okres'.
         - Název výstupního souboru (včetně přípony), do kterého
-          budou uloženy výsledky (CSV, JSON, XML).
+          budou uloženy výsledky (CSV, JSON, XML, Parquet, Arrow,
+          SQLite).
+        Volitelně lze přepínačem '--workers N' nastavit počet
+        souběžně stahovaných obcí a přepínačem '--engine asyncio'
+        zvolit asynchronní stahování (knihovna aiohttp).
+        Přepínač '--cache ADRESAR' zapne diskovou mezipaměť stránek.
+        Přepínač '--parse-workers N' přesune parsování stránek obcí
+        do N procesů a '--max-rate N' omezí počet požadavků
+        za sekundu.
+        Dokončené obce se zapisují do žurnálu '<soubor>.zurnal'
+        a přepínač '--resume' po přerušení pokračuje tam, kde běh
+        skončil. Přepínač '--okrsky' zpracuje místo obcí jejich
+        okrsky (viz 'ziskej_okrsky').
+        Přepínač '--record ARCHIV' nahraje všechny stažené stránky
+        do jednoho archivu a '--replay ARCHIV' z něj běh zopakuje
+        bez přístupu k síti. Přepínač '--watch SEKUNDY' výsledky
+        průběžně sleduje (viz 'sleduj_volby') a '--souhrny SOUBOR'
+        uloží souhrny za okresy, kraje a stát (viz 'SouhrnyUzemi').
 
         Po úspěšném provedení skript vypíše statistiky, včetně:
         - doby zpracování,
@@ -1759,24 +6570,198 @@ def zpracuj_data() -> None:
         cas_zacatku = time.time()        
         
         # Kontrola vstupních argumentů
-        url_okresu, vystupni_soubor = zkontroluj_vstupy()
+        argumenty = zkontroluj_vstupy()
+        url_okresu = argumenty.url_okresu
+        vystupni_soubor = argumenty.vystupni_soubor
+
+        # Volitelná disková mezipaměť stažených stránek
+        cache = None
+        if argumenty.cache:
+            cache = DiskovaCache(
+                argumenty.cache,
+                max_velikost=argumenty.cache_max_mb * 1024 * 1024,
+                ttl=0 if argumenty.refresh else argumenty.cache_ttl
+            )
+
+        # Společný omezovač rychlosti požadavků
+        omezovac = OmezovacRychlosti(
+            argumenty.max_rate, soubeznost=argumenty.workers
+        )
 
-        # Získání seznamu obcí
-        obce = ziskej_obce(url_okresu)
+        # Sledování změn: opakované cykly až do přerušení (Ctrl+C)
+        if argumenty.watch:
+            vysledky, stats = sleduj_volby(
+                url_okresu, vystupni_soubor, argumenty.watch,
+                argumenty.workers, argumenty.parser,
+                argumenty.parse_workers, cache, omezovac,
+                kompaktni=argumenty.compact,
+                souhrny_soubor=argumenty.souhrny
+            )
+            if argumenty.stats and vysledky:
+                uloz_statistiky(vysledky, argumenty.stats)
+            if argumenty.souhrny and vysledky:
+                print(
+                    Fore.LIGHTGREEN_EX +
+                    MSG_INFO_SUCCESS_SOUHRNY.format(filename=argumenty.souhrny)
+                )
+            vypis_statistiky(stats, cas_zacatku, vysledky)
+            return
+
+        # Volitelný archiv pro nahrání nebo přehrání stránek
+        archiv = None
+        if argumenty.record or argumenty.replay:
+            archiv = ArchivStranek(
+                argumenty.replay or argumenty.record,
+                prehravani=bool(argumenty.replay)
+            )
 
-        # Zpracování obcí
-        vysledky, stats = zpracuj_obce(obce)
+        # Registr stran sdílený zpracováním obcí a zapisovačem
+        registr = RegistrStran()
 
-        # Uložení do CSV/JSON/XML souboru
-        uloz_vysledky(vysledky, vystupni_soubor)
+        # Průběžné souhrny za okresy, kraje a stát
+        souhrny = SouhrnyUzemi(registr) if argumenty.souhrny else None
+
+        # Průběžný zápis do CSV/JSON/XML souboru
+        zapisovac = otevri_zapisovac(
+            vystupni_soubor, registr, oznaceni_voleb(url_okresu),
+            argumenty.compact
+        )
+
+        # Žurnál dokončených obcí pro případné pokračování
+        zurnal = ZurnalObci(
+            vystupni_soubor + PRIPONA_ZURNALU, url_okresu,
+            obnovit=argumenty.resume
+        )
+
+        # Volitelný pool procesů pro parsování stránek obcí
+        parsovaci_pool = None
+        if argumenty.parse_workers:
+            parsovaci_pool = ProcessPoolExecutor(argumenty.parse_workers)
+
+        try:
+            # Jedna sdílená session s poolem spojení pro celý běh
+            with StahovaciSession(
+                argumenty.workers, cache=cache, omezovac=omezovac,
+                archiv=archiv
+            ) as session:
+                # Získání seznamu obcí, přeskočené okresy (a obce bez
+                # zjištěných okrsků) jsou chyby běhu
+                chyby_seznamu = {'chyby': 0}
+                obce = ziskej_obce(
+                    url_okresu, session, argumenty.parser,
+                    argumenty.workers, chyby_seznamu
+                )
+                # Režim okrsků: místo obcí se zpracují jejich okrsky
+                if argumenty.okrsky:
+                    obce = ziskej_okrsky(
+                        obce, session, argumenty.parser, argumenty.workers,
+                        chyby_seznamu
+                    )
+                ze_zurnalu = sum(
+                    klic_obce(obec) in zurnal.hotove for obec in obce
+                )
+                if souhrny:
+                    souhrny.ocekavej(obce)
+                if argumenty.resume:
+                    print(
+                        Fore.LIGHTCYAN_EX + MSG_INFO_RESUME.format(
+                            pocet=ze_zurnalu, soubor=zurnal.soubor
+                        )
+                    )
 
-        # Výpis statistik
-        vypis_statistiky(stats, cas_zacatku)
+                # Zpracování obcí, řádky se zapisují průběžně
+                if argumenty.engine == ENGINE_ASYNCIO:
+                    vysledky, stats = asyncio.run(
+                        zpracuj_obce_async(
+                            obce, argumenty.workers,
+                            cache=cache, parser=argumenty.parser,
+                            zapisovac=zapisovac, zurnal=zurnal,
+                            parsovaci_pool=parsovaci_pool,
+                            omezovac=omezovac, archiv=archiv,
+                            registr=registr, souhrny=souhrny
+                        )
+                    )
+                else:
+                    vysledky, stats = zpracuj_obce(
+                        obce, argumenty.workers, session,
+                        argumenty.parser, zapisovac, zurnal,
+                        parsovaci_pool, registr, souhrny
+                    )
+
+                stats['chyby'] += chyby_seznamu['chyby']
+
+                # Porovnání souhrnů se zveřejněnými výsledky okresů
+                if souhrny:
+                    zkontroluj_souhrny(
+                        souhrny, session, argumenty.parser,
+                        argumenty.workers
+                    )
+
+                # Připočti spojení sdílené session
+                for klic, pocet in session.statistiky_spojeni().items():
+                    stats[klic] = stats.get(klic, 0) + pocet
+                if cache:
+                    stats.update(cache.statistiky())
+                omezeni = omezovac.statistiky()
+                if argumenty.max_rate or omezeni['omezovac_zpomaleni']:
+                    stats.update(omezeni)
+                if argumenty.resume:
+                    stats['obce_ze_zurnalu'] = ze_zurnalu
+                if archiv:
+                    stats.update(archiv.statistiky())
+        except BaseException:
+            # Při přerušení ulož alespoň již zpracované obce
+            zapisovac.ukonci_po_chybe()
+            zurnal.zavri()
+            if zurnal.pocet:
+                print(
+                    Fore.LIGHTCYAN_EX +
+                    MSG_INFO_RESUME_HINT.format(soubor=zurnal.soubor)
+                )
+            raise
+        finally:
+            if parsovaci_pool:
+                parsovaci_pool.shutdown(cancel_futures=True)
+            if archiv:
+                archiv.zavri()
+
+        # Dokončení souboru (atomické přejmenování)
+        dokonci_zapisovac(zapisovac)
+
+        # Žurnál je potřeba jen pro opakování obcí, které selhaly
+        if stats['chyby']:
+            zurnal.zavri()
+            print(
+                Fore.LIGHTCYAN_EX +
+                MSG_INFO_RESUME_HINT.format(soubor=zurnal.soubor)
+            )
+        else:
+            zurnal.odstran()
+
+        # Statistiky výsledků do souboru a výpis statistik
+        if argumenty.stats:
+            uloz_statistiky(vysledky, argumenty.stats)
+        if souhrny:
+            uloz_souhrny(souhrny, argumenty.souhrny)
+            print(
+                Fore.LIGHTGREEN_EX +
+                MSG_INFO_SUCCESS_SOUHRNY.format(filename=argumenty.souhrny)
+            )
+        vypis_statistiky(stats, cas_zacatku, vysledky)
+
+        # Neúplné výsledky: výstup i žurnál zůstanou, běh skončí chybou
+        if stats['chyby']:
+            logging.error(
+                LOG_ERROR_NEUPLNE_VYSLEDKY.format(chyby=stats['chyby'])
+            )
+            sys.exit(1)
 
     except SystemExit as e:
-        # SystemExit je vyvolána našimi funkcemi při kritických chybách
-        logging.info(LOG_INFO_PROGRAM_EXIT.format(exit_code=e.code))
-        pass #sys.exit() byl vyvolán dříve
+        # SystemExit je vyvolána našimi funkcemi při kritických chybách,
+        # kód ukončení se předá dál (např. 1 pro neplatné argumenty)
+        if e.code not in (None, 0):
+            logging.info(LOG_INFO_PROGRAM_EXIT.format(exit_code=e.code))
+        raise
    
     except NoDataFoundError as e:
         # Zde zachytíme NoDataFoundError vyvolanou výše
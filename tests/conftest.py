@@ -0,0 +1,85 @@
+"""
+Společné fixtures testů: přehrávací server se stránkami okresu
+Karviná (viz 'benchmark.server') a spuštění celého běhu scraperu.
+"""
+
+import sys
+
+import pytest
+
+import main
+from benchmark.server import SADY, ReplayServer
+from benchmark.stranky import nacti_radky, stranky_karvine
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'asyncio_engine: test spouští asynchronní engine'
+    )
+
+
+def pytest_runtest_setup(item):
+    """Testy asynchronního enginu bez knihovny aiohttp přeskočí."""
+    callspec = getattr(item, 'callspec', None)
+    engine = callspec.params.get('engine') if callspec else None
+    if main.aiohttp is None and (
+        engine == main.ENGINE_ASYNCIO
+        or item.get_closest_marker('asyncio_engine')
+    ):
+        pytest.skip("asynchronní engine vyžaduje knihovnu 'aiohttp'")
+
+
+@pytest.fixture(scope='session')
+def stranky():
+    """Stránky okresu Karviná včetně okrsků a výsledků okresu."""
+    return stranky_karvine()
+
+
+@pytest.fixture
+def server(stranky):
+    """Přehrávací server se stránkami okresu Karviná."""
+    with ReplayServer(stranky) as server:
+        yield server
+
+
+@pytest.fixture
+def url_okresu(server):
+    """Adresa stránky okresu Karviná (ps32) na přehrávacím serveru."""
+    return server.url(SADY['karvina'][1])
+
+
+@pytest.fixture(scope='session')
+def karvina():
+    """Očekávané řádky obcí okresu Karviná (karvina.json)."""
+    return nacti_radky()
+
+
+@pytest.fixture
+def spust(monkeypatch):
+    """
+    Vrátí funkci, která spustí 'main.zpracuj_data' s danými
+    argumenty příkazové řádky a vrátí kód ukončení.
+    """
+    def spust(*argumenty) -> int:
+        monkeypatch.setattr(sys, 'argv', ['main.py', *map(str, argumenty)])
+        try:
+            main.zpracuj_data()
+        except SystemExit as e:
+            return e.code or 0
+        return 0
+    return spust
+
+
+@pytest.fixture
+def statistiky(monkeypatch):
+    """Statistiky posledního běhu (argument 'main.vypis_statistiky')."""
+    zachycene = {}
+    puvodni = main.vypis_statistiky
+
+    def vypis(stats, *args, **kwargs):
+        zachycene.clear()
+        zachycene.update(stats)
+        return puvodni(stats, *args, **kwargs)
+
+    monkeypatch.setattr(main, 'vypis_statistiky', vypis)
+    return zachycene
@@ -0,0 +1,38 @@
+"""Archiv stránek ('--record') a běh z něj bez sítě ('--replay')."""
+
+import zipfile
+
+from benchmark.server import SADY, ReplayServer
+
+
+def test_prehrani_bez_site(spust, stranky, tmp_path):
+    archiv = tmp_path / 'stranky.zip'
+    with ReplayServer(stranky) as server:
+        url = server.url(SADY['karvina'][1])
+        assert spust(url, tmp_path / 'zaznam.csv', '--record', archiv) == 0
+        pozadavky = server.pozadavky
+
+    # Server už neběží, stránky jsou jen v archivu
+    assert zipfile.is_zipfile(archiv)
+    assert len(zipfile.ZipFile(archiv).namelist()) == pozadavky
+    assert spust(url, tmp_path / 'prehrani.csv', '--replay', archiv) == 0
+    assert (tmp_path / 'prehrani.csv').read_bytes() == (
+        tmp_path / 'zaznam.csv'
+    ).read_bytes()
+
+
+def test_chybejici_stranka_v_archivu(
+    spust, url_okresu, tmp_path, statistiky
+):
+    archiv = tmp_path / 'stranky.zip'
+    assert spust(url_okresu, tmp_path / 'v.csv', '--record', archiv) == 0
+    with zipfile.ZipFile(archiv) as zdroj:
+        polozky = [(info, zdroj.read(info)) for info in zdroj.infolist()]
+    # Archiv bez stránky poslední obce
+    neuplny = tmp_path / 'neuplny.zip'
+    with zipfile.ZipFile(neuplny, 'w') as cil:
+        for info, obsah in polozky[:-1]:
+            cil.writestr(info, obsah)
+
+    assert spust(url_okresu, tmp_path / 'v.csv', '--replay', neuplny) == 1
+    assert statistiky['chyby'] == 1
@@ -0,0 +1,32 @@
+"""Kódy ukončení při neplatných argumentech a nápovědě."""
+
+import pytest
+
+import main
+
+URL = 'https://volby.cz/pls/ps2017nss/ps32?xjazyk=CZ&xkraj=14&xnumnuts=8103'
+
+
+@pytest.mark.parametrize('argumenty', [
+    ('--watch', '5', '--resume'),
+    ('--record', 'a.zip', '--replay', 'b.zip'),
+    ('--workers', '0'),
+    ('--engine', 'neznamy'),
+])
+def test_neplatna_kombinace_konci_chybou(spust, tmp_path, argumenty):
+    assert spust(URL, tmp_path / 'vysledky.csv', *argumenty) == 1
+
+
+def test_napoveda_konci_nulou(spust, capsys):
+    assert spust('--help') == 0
+    assert '--workers' in capsys.readouterr().out
+
+
+def test_stats_bez_numpy(spust, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'np', None)
+    assert spust(URL, tmp_path / 'v.csv', '--stats', tmp_path / 's.json') == 1
+
+
+def test_uspesny_beh_konci_nulou(spust, url_okresu, tmp_path):
+    assert spust(url_okresu, tmp_path / 'vysledky.csv') == 0
+    assert (tmp_path / 'vysledky.csv').exists()
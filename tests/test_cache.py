@@ -0,0 +1,60 @@
+"""Disková mezipaměť stránek: opakovaný běh a ověřování na serveru."""
+
+import pytest
+
+from benchmark.server import SADY, ReplayServer
+
+STRANEK = 18  # Stránka okresu a 17 stránek obcí
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_opakovany_beh_bez_site(
+    spust, server, url_okresu, tmp_path, statistiky, engine
+):
+    cache = tmp_path / 'cache'
+    prvni, druhy = tmp_path / 'prvni.csv', tmp_path / 'druhy.csv'
+    argumenty = ('--cache', cache, '--engine', engine, '--workers', 4)
+
+    assert spust(url_okresu, prvni, *argumenty) == 0
+    assert statistiky['cache_minuti'] == STRANEK
+    pozadavky = server.pozadavky
+
+    assert spust(url_okresu, druhy, *argumenty) == 0
+    assert statistiky['cache_zasahy'] == STRANEK
+    assert statistiky['cache_minuti'] == 0
+    assert server.pozadavky == pozadavky
+    assert druhy.read_bytes() == prvni.read_bytes()
+
+
+def test_refresh_bez_validatoru_stahne_znovu(
+    spust, url_okresu, tmp_path, statistiky
+):
+    cache = tmp_path / 'cache'
+    assert spust(url_okresu, tmp_path / 'a.csv', '--cache', cache) == 0
+    assert spust(
+        url_okresu, tmp_path / 'b.csv', '--cache', cache, '--refresh'
+    ) == 0
+    assert statistiky['cache_minuti'] == STRANEK
+    assert statistiky['cache_revalidace'] == 0
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_refresh_overi_etag(spust, stranky, tmp_path, statistiky, engine):
+    cache = tmp_path / 'cache'
+    with ReplayServer(stranky, etag=True) as server:
+        url = server.url(SADY['karvina'][1])
+        argumenty = ('--cache', cache, '--engine', engine)
+        assert spust(url, tmp_path / 'a.csv', *argumenty) == 0
+        assert spust(url, tmp_path / 'b.csv', *argumenty, '--refresh') == 0
+        assert server.nezmeneno == STRANEK
+    assert statistiky['cache_revalidace'] == STRANEK
+    assert statistiky['cache_minuti'] == 0
+    assert (tmp_path / 'b.csv').read_bytes() == (
+        tmp_path / 'a.csv'
+    ).read_bytes()
+
+
+def test_refresh_nelze_s_ttl(spust, url_okresu, tmp_path):
+    assert spust(
+        url_okresu, tmp_path / 'a.csv', '--cache-ttl', 60, '--refresh'
+    ) == 1
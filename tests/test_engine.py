@@ -0,0 +1,77 @@
+"""Shoda výstupu enginů stahování a poolu procesů parserů."""
+
+import asyncio
+import itertools
+import json
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize('pripona', ['csv', 'json', 'xml'])
+def test_enginy_stejny_vystup(spust, url_okresu, tmp_path, pripona):
+    vystupy = []
+    enginy = ['requests'] + (['asyncio'] if main.aiohttp else [])
+    for engine, workers in itertools.product(enginy, (1, 8)):
+        soubor = tmp_path / f'{engine}-{workers}.{pripona}'
+        assert spust(
+            url_okresu, soubor, '--engine', engine, '--workers', workers
+        ) == 0
+        vystupy.append(soubor.read_bytes())
+    assert all(vystup == vystupy[0] for vystup in vystupy)
+
+
+@pytest.mark.asyncio_engine
+def test_vystup_odpovida_strankam(spust, url_okresu, tmp_path, karvina):
+    soubor = tmp_path / 'vysledky.json'
+    assert spust(url_okresu, soubor, '--engine', 'asyncio') == 0
+    assert json.loads(soubor.read_text(encoding='utf-8')) == karvina
+
+
+def test_async_okno_je_omezene(monkeypatch):
+    # První obec se stahuje dlouho, ostatní hned. Úlohy za ní
+    # se smí spustit jen do velikosti okna, ne pro všechny obce.
+    workers = 4
+    spusteno = []
+    pri_prvnim_zapisu = []
+
+    async def ziskej(session, url, **_):
+        spusteno.append(url)
+        if url == 'obec-0':
+            await asyncio.sleep(0.2)
+        return {
+            'obec': url, 'volici': 10, 'vydane_obalky': 5,
+            'platne_hlasy': 5, 'strany': []
+        }
+
+    class Zapisovac:
+        def zapis(self, radek):
+            if not pri_prvnim_zapisu:
+                pri_prvnim_zapisu.append(len(spusteno))
+
+    monkeypatch.setattr(main, 'ziskej_data_obce_async', ziskej)
+    obce = [
+        {'url': f'obec-{i}', 'cislo_obce': str(i), 'nazev_obce': f'Obec {i}'}
+        for i in range(200)
+    ]
+    vysledky, stats = asyncio.run(
+        main.zpracuj_obce_async(
+            obce, workers, session=object(), zapisovac=Zapisovac()
+        )
+    )
+    assert stats['zpracovane_obce'] == 200 and len(vysledky) == 200
+    assert pri_prvnim_zapisu[0] <= 2 * workers + 1
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_pool_parseru_stejny_vystup(spust, url_okresu, tmp_path, engine):
+    vystupy = []
+    for argumenty in ((), ('--parse-workers', 2)):
+        soubor = tmp_path / f'vysledky{len(argumenty)}.csv'
+        assert spust(
+            url_okresu, soubor, '--engine', engine, '--workers', 4,
+            *argumenty
+        ) == 0
+        vystupy.append(soubor.read_bytes())
+    assert vystupy[0] == vystupy[1]
@@ -0,0 +1,64 @@
+"""Režim okrsků ('--okrsky') nad stránkami okresu Karviná."""
+
+import json
+from collections import defaultdict
+
+import main
+from benchmark.stranky import VOLICU_V_OKRSKU, url_vyberu_okrsku
+
+KRAJ, NUTS = 14, '8103'
+
+
+def secti_okrsky(radky: list) -> list:
+    """Sečte řádky okrsků zpět na řádky obcí (v pořadí obcí)."""
+    obce = defaultdict(dict)
+    for radek in radky:
+        obec = obce[radek['Číslo obce']]
+        for sloupec, hodnota in radek.items():
+            if sloupec == main.SLOUPEC_OKRSEK:
+                continue
+            if isinstance(hodnota, int):
+                hodnota += obec.get(sloupec, 0)
+            obec[sloupec] = hodnota
+    return list(obce.values())
+
+
+def test_okrsky_davaji_soucty_obci(spust, url_okresu, tmp_path, karvina):
+    soubor = tmp_path / 'okrsky.json'
+    assert spust(url_okresu, soubor, '--okrsky', '--workers', 4) == 0
+    radky = json.loads(soubor.read_text(encoding='utf-8'))
+    assert len(radky) > len(karvina)
+    assert all(radek[main.SLOUPEC_OKRSEK] for radek in radky)
+    assert secti_okrsky(radky) == karvina
+
+
+def test_obec_bez_okrsku_je_chyba(
+    spust, server, url_okresu, tmp_path, karvina, statistiky
+):
+    obec = next(
+        radek for radek in karvina
+        if radek['Voliči'] // VOLICU_V_OKRSKU > 1
+    )
+    stranka = '/volby.cz/pls/ps2017nss/' + url_vyberu_okrsku(
+        obec['Číslo obce'], KRAJ, NUTS
+    )
+    puvodni = server.stranky.pop(stranka)
+    soubor = tmp_path / 'okrsky.json'
+
+    # Výstup bez přeskočené obce, žurnál zůstane a běh skončí chybou
+    assert spust(url_okresu, soubor, '--okrsky', '--workers', 4) == 1
+    assert statistiky['chyby'] == 1
+    radky = json.loads(soubor.read_text(encoding='utf-8'))
+    assert obec['Číslo obce'] not in {r['Číslo obce'] for r in radky}
+    assert (tmp_path / 'okrsky.json.zurnal').exists()
+
+    # Pokračování doplní okrsky přeskočené obce
+    server.stranky[stranka] = puvodni
+    assert spust(
+        url_okresu, soubor, '--okrsky', '--workers', 4, '--resume'
+    ) == 0
+    assert statistiky['chyby'] == 0
+    assert statistiky['obce_ze_zurnalu'] == len(radky)
+    radky = json.loads(soubor.read_text(encoding='utf-8'))
+    assert secti_okrsky(radky) == karvina
+    assert not (tmp_path / 'okrsky.json.zurnal').exists()
@@ -0,0 +1,91 @@
+"""Přizpůsobení rychlosti 'OmezovacRychlosti' odpovědím 503."""
+
+import itertools
+import math
+import time
+
+import pytest
+
+import main
+from benchmark.server import SADY, ReplayServer
+
+
+@pytest.fixture
+def hodiny(monkeypatch):
+    # Každé zpomalení v jiné sekundě, aby se nesloučilo s předchozím
+    cas = itertools.count(0, 2.0)
+    monkeypatch.setattr(main.time, 'monotonic', lambda: next(cas))
+
+
+def zotav(omezovac) -> float:
+    """Vrátí, za kolik sekund úspěšných požadavků se rychlost vrátí."""
+    cil, sekundy = omezovac._cil, 0.0
+    while omezovac.rychlost < cil:
+        sekundy += 1 / omezovac.rychlost
+        omezovac.uspech()
+    return sekundy
+
+
+def test_vychozi_rychlost_podle_vlaken(hodiny):
+    omezovac = main.OmezovacRychlosti(soubeznost=4)
+    assert omezovac.rychlost is None
+    omezovac.zpomal(pauza=0)
+    assert omezovac.rychlost == 4 * main.RYCHLOST_NA_VLAKNO / 2
+
+
+def test_spodni_mez(hodiny):
+    omezovac = main.OmezovacRychlosti(rychlost=8)
+    omezovac.zpomal(pauza=0)
+    assert omezovac.rychlost == 4
+    for _ in range(10):
+        omezovac.zpomal(pauza=0)
+    # Ani opakované chyby nesníží rychlost pod čtvrtinu maxima
+    assert omezovac.rychlost == omezovac.spodni_mez == 2
+
+
+def test_rychlost_se_rychle_vrati(hodiny):
+    omezovac = main.OmezovacRychlosti(rychlost=40)
+    for _ in range(3):
+        omezovac.zpomal(pauza=0)
+    assert omezovac.rychlost == 10
+    # Zhruba dvojnásobek za sekundu: 10 → 40 za ~2 s
+    assert zotav(omezovac) <= math.log2(40 / 10) + 0.5
+    assert omezovac.rychlost == 40
+    for _ in range(100):
+        omezovac.uspech()
+    assert omezovac.rychlost == 40
+
+
+def test_beh_s_chybami_503(stranky, spust, statistiky, tmp_path):
+    # Zvolený seed vrací 503 hned na začátku běhu; původní omezovač
+    # pak zpomalil na 0,2 požadavku/s a běh trval přes 15 s
+    with ReplayServer(
+        stranky, chybovost=0.2, retry_after=0, seed=4
+    ) as server:
+        zacatek = time.perf_counter()
+        assert spust(
+            server.url(SADY['karvina'][1]), tmp_path / 'vysledky.csv',
+            '--workers', 4
+        ) == 0
+        doba = time.perf_counter() - zacatek
+    assert server.chyby and statistiky['omezovac_zpomaleni']
+    assert doba < 6
+
+
+def test_zotaveni_pri_odpovedich_304(stranky, tmp_path):
+    # Při sledování změn server na většinu stránek odpoví 304;
+    # i ty musí rychlost po zpomalení vrátit zpět
+    cache = main.DiskovaCache(tmp_path / 'cache', ttl=0)
+    omezovac = main.OmezovacRychlosti(rychlost=40)
+    with ReplayServer(stranky, etag=True) as server, \
+            main.StahovaciSession(cache=cache, omezovac=omezovac) as session:
+        url = server.url(SADY['karvina'][1])
+        main.stahni_data(url, session=session)
+        omezovac.zpomal(pauza=0)
+        assert omezovac.rychlost == 20
+        for _ in range(100):
+            main.stahni_data(url, session=session)
+            if omezovac.rychlost == 40:
+                break
+        assert omezovac.rychlost == 40
+        assert server.nezmeneno and server.chyby == 0
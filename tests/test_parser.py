@@ -0,0 +1,56 @@
+"""Shoda extraktoru stránek obcí s parsery BeautifulSoup."""
+
+import json
+
+import pytest
+
+import main
+
+PARSERY = [
+    parser for parser in main.PODPOROVANE_PARSERY
+    if parser != main.PARSER_LXML or main.lxml
+]
+
+
+@pytest.fixture(scope='module')
+def stranky_obci(stranky):
+    """Stránky obcí (ps311 bez okrsku) okresu Karviná."""
+    return [
+        obsah for url, obsah in stranky.items()
+        if url.startswith('ps311') and 'xokrsek' not in url
+    ]
+
+
+def vysledek(obsah: bytes, parser: str):
+    """Data obce, nebo typ a text výjimky, kterou parser vyvolal."""
+    try:
+        return main.parsuj_data_obce(obsah, parser)
+    except (main.DataParsingError, ValueError) as e:
+        return type(e), str(e)
+
+
+def test_parsery_vraci_stejna_data(stranky_obci):
+    for obsah in stranky_obci:
+        ocekavana = main.parsuj_data_obce(obsah, main.PARSER_HTML)
+        for parser in PARSERY:
+            assert main.parsuj_data_obce(obsah, parser) == ocekavana
+
+
+@pytest.mark.parametrize('poskozeni', [
+    lambda obsah: b'<html><body></body></html>',
+    lambda obsah: obsah.replace(b'<table', b'<tabl', 1),
+    lambda obsah: obsah[:len(obsah) // 2],
+])
+def test_poskozena_stranka(stranky_obci, poskozeni):
+    # Chybějící údaje: stejná data, nebo stejná chyba
+    obsah = poskozeni(stranky_obci[0])
+    ocekavany = vysledek(obsah, main.PARSER_HTML)
+    for parser in PARSERY:
+        assert vysledek(obsah, parser) == ocekavany
+
+
+@pytest.mark.parametrize('parser', PARSERY)
+def test_beh_s_parserem(spust, url_okresu, tmp_path, karvina, parser):
+    soubor = tmp_path / 'vysledky.json'
+    assert spust(url_okresu, soubor, '--parser', parser) == 0
+    assert json.loads(soubor.read_text(encoding='utf-8')) == karvina
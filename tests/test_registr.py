@@ -0,0 +1,38 @@
+"""Registr stran se stálými ID ('RegistrStran')."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import main
+
+
+def test_id_a_poradi_sloupcu():
+    registr = main.RegistrStran()
+    assert registr.zaregistruj('ANO 2011', 21) == 0
+    assert registr.zaregistruj('Bez čísla') == 1
+    assert registr.zaregistruj('Občanská demokratická strana', 1) == 2
+    assert registr.zaregistruj('ANO 2011', 21) == 0
+    # Podle čísla na lístku, strany bez čísla na konci
+    assert registr.sloupce() == [
+        'Občanská demokratická strana', 'ANO 2011', 'Bez čísla'
+    ]
+    # Číslo doplněné později (např. po obcích ze žurnálu) ID nemění
+    assert registr.zaregistruj('Bez čísla', 5) == 1
+    assert registr.sloupce() == [
+        'Občanská demokratická strana', 'Bez čísla', 'ANO 2011'
+    ]
+
+
+def test_soubezna_registrace():
+    registr = main.RegistrStran()
+    strany = [f'Strana {cislo}' for cislo in range(200)]
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(8):
+            list(pool.map(
+                lambda strana: registr.zaregistruj(
+                    strana, int(strana.split()[1])
+                ),
+                strany
+            ))
+    assert len(registr) == len(strany)
+    assert sorted(registr.id_strany(s) for s in strany) == list(range(200))
+    assert registr.sloupce() == strany
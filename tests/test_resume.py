@@ -0,0 +1,66 @@
+"""Pokračování přerušeného běhu ze žurnálu obcí ('--resume')."""
+
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import main
+
+HOTOVO = 6
+
+
+def sleduj_obce(monkeypatch, engine: str, preruseni: int = None) -> list:
+    """
+    Obalí stahování dat obce enginu a vrátí seznam, do kterého
+    se zapisuje každé volání. S 'preruseni' vyvolá po tolika
+    obcích Ctrl+C (KeyboardInterrupt).
+    """
+    jmeno = 'ziskej_data_obce' + ('_async' if engine == 'asyncio' else '')
+    puvodni = getattr(main, jmeno)
+    volani = []
+
+    def zaznamenej(url):
+        if len(volani) == preruseni:
+            raise KeyboardInterrupt
+        volani.append(url)
+
+    if engine == 'asyncio':
+        async def ziskej(session, url, *args, **kwargs):
+            zaznamenej(url)
+            return await puvodni(session, url, *args, **kwargs)
+    else:
+        def ziskej(url, *args, **kwargs):
+            zaznamenej(url)
+            return puvodni(url, *args, **kwargs)
+    monkeypatch.setattr(main, jmeno, ziskej)
+    return volani
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_preruseny_beh_pokracuje(
+    spust, url_okresu, tmp_path, karvina, statistiky, monkeypatch, engine
+):
+    soubor = tmp_path / 'vysledky.json'
+    zurnal = tmp_path / 'vysledky.json.zurnal'
+    with monkeypatch.context() as patch:
+        sleduj_obce(patch, engine, preruseni=HOTOVO)
+        with pytest.raises(KeyboardInterrupt):
+            spust(url_okresu, soubor, '--engine', engine)
+
+    # Přerušený běh zanechá platný výstup a žurnál hotových obcí
+    # (první řádek žurnálu je adresa okresu; asynchronní engine
+    # nemusí stihnout dokončit všechny rozpracované obce)
+    hotove = len(zurnal.read_text(encoding='utf-8').splitlines()) - 1
+    assert 0 < hotove <= HOTOVO
+    assert json.loads(soubor.read_text(encoding='utf-8')) == karvina[:hotove]
+
+    volani = sleduj_obce(monkeypatch, engine)
+    assert spust(url_okresu, soubor, '--engine', engine, '--resume') == 0
+    assert statistiky['obce_ze_zurnalu'] == hotove
+    assert json.loads(soubor.read_text(encoding='utf-8')) == karvina
+    assert not zurnal.exists()
+    # Obce ze žurnálu se znovu nestahují (stažení, které při přerušení
+    # už běželo, může doběhnout až během pokračování)
+    cisla = {parse_qs(urlparse(url).query)['xobec'][0] for url in volani}
+    assert cisla == {radek['Číslo obce'] for radek in karvina[hotove:]}
@@ -0,0 +1,22 @@
+"""Sdílená session: jedno stažení stránky okresu a znovupoužitá spojení."""
+
+import pytest
+
+
+@pytest.mark.parametrize('engine', ['requests', 'asyncio'])
+def test_kazda_stranka_jednou(
+    spust, server, url_okresu, tmp_path, karvina, engine
+):
+    assert spust(url_okresu, tmp_path / 'v.csv', '--engine', engine) == 0
+    # Stránka okresu (validace i seznam obcí) a stránky obcí
+    assert server.pozadavky == 1 + len(karvina)
+
+
+def test_spojeni_se_znovu_pouzivaji(
+    spust, url_okresu, tmp_path, karvina, statistiky
+):
+    assert spust(url_okresu, tmp_path / 'v.csv', '--workers', 4) == 0
+    assert statistiky['nova_spojeni'] <= 4
+    assert statistiky['nova_spojeni'] + statistiky[
+        'znovupouzita_spojeni'
+    ] == 1 + len(karvina)
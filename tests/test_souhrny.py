@@ -0,0 +1,89 @@
+"""Souhrny za okresy, kraje a stát ('--souhrny') a jejich kontrola."""
+
+import json
+
+import main
+from benchmark.server import SADY, ReplayServer
+from benchmark.stranky import (
+    KARVINA_KRAJ, KARVINA_NUTS, stranka_vysledku_okresu, stranky_voleb,
+    url_vysledku_okresu
+)
+
+CISLA = ('volici', 'vydane_obalky', 'platne_hlasy')
+SLOUPCE = dict(zip(CISLA, ('Voliči', 'Vydané obálky', 'Platné hlasy')))
+
+
+def secti(radky: list) -> dict:
+    """Součty výstupních řádků ve tvaru souhrnu územního celku."""
+    soucet = {'obce': len(radky), **{klic: 0 for klic in CISLA}}
+    strany = {}
+    for radek in radky:
+        for klic, sloupec in SLOUPCE.items():
+            soucet[klic] += radek[sloupec]
+        for sloupec, hodnota in radek.items():
+            if sloupec not in main.POPISNE_SLOUPCE:
+                strany[sloupec] = strany.get(sloupec, 0) + hodnota
+    soucet['strany'] = strany
+    return soucet
+
+
+def cisla(uzemi: dict) -> dict:
+    """Počet obcí, součty a hlasy stran souhrnu (bez popisu a účasti)."""
+    return {klic: uzemi[klic] for klic in ('obce', *CISLA, 'strany')}
+
+
+def test_souhrny_okresu(spust, url_okresu, tmp_path, karvina):
+    souhrny = tmp_path / 'souhrny.json'
+    assert spust(
+        url_okresu, tmp_path / 'vysledky.csv', '--souhrny', souhrny
+    ) == 0
+    data = json.loads(souhrny.read_text(encoding='utf-8'))
+    [okres] = data['okresy']
+    assert okres['kontrola'] == {'shoda': True, 'rozdily': {}}
+    assert cisla(okres) == cisla(data['stat']) == secti(karvina)
+
+
+def test_souhrny_voleb(spust, tmp_path):
+    vystup = tmp_path / 'vysledky.json'
+    souhrny = tmp_path / 'souhrny.json'
+    with ReplayServer(stranky_voleb(3, 5)) as server:
+        assert spust(
+            server.url(SADY['kraj'][1]), vystup, '--workers', 4,
+            '--souhrny', souhrny
+        ) == 0
+    radky = json.loads(vystup.read_text(encoding='utf-8'))
+    data = json.loads(souhrny.read_text(encoding='utf-8'))
+    assert cisla(data['stat']) == secti(radky)
+    for okres in data['okresy']:
+        assert okres['kontrola']['shoda']
+        assert cisla(okres) == secti(
+            [radek for radek in radky if radek['Okres'] == okres['nazev']]
+        )
+    # Kraj je součtem svých okresů
+    for kraj in data['kraje']:
+        assert cisla(kraj) == secti([
+            radek for radek in radky
+            for okres in data['okresy']
+            if okres['kraj'] == kraj['kod']
+            and radek['Okres'] == okres['nazev']
+        ])
+
+
+def test_rozdil_proti_zverejnenym(
+    spust, server, url_okresu, tmp_path, karvina
+):
+    # Zveřejněné výsledky okresu s jiným počtem voličů první obce
+    jine = [dict(karvina[0], **{'Voliči': karvina[0]['Voliči'] + 1})]
+    server.stranky[
+        '/volby.cz/pls/ps2017nss/'
+        + url_vysledku_okresu(KARVINA_KRAJ, KARVINA_NUTS)
+    ] = stranka_vysledku_okresu(jine + karvina[1:], 'Karviná')
+    souhrny = tmp_path / 'souhrny.json'
+    assert spust(
+        url_okresu, tmp_path / 'vysledky.csv', '--souhrny', souhrny
+    ) == 0
+    [okres] = json.loads(souhrny.read_text(encoding='utf-8'))['okresy']
+    volici = secti(karvina)['volici']
+    assert okres['kontrola'] == {
+        'shoda': False, 'rozdily': {'volici': [volici, volici + 1]}
+    }
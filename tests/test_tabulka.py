@@ -0,0 +1,59 @@
+"""Sloupcové úložiště výsledků 'TabulkaVysledku'."""
+
+import pytest
+
+import main
+
+
+def test_tabulka_vraci_stejne_radky(karvina):
+    tabulka = main.TabulkaVysledku(karvina)
+    assert len(tabulka) == len(karvina)
+    assert list(tabulka) == karvina
+
+
+def test_strana_pribyla_pozdeji():
+    tabulka = main.TabulkaVysledku()
+    prvni = {
+        'Číslo obce': '1', 'Název obce': 'A', 'Voliči': 10,
+        'Vydané obálky': 5, 'Platné hlasy': 5, 'Strana X': 5
+    }
+    druhy = dict(prvni, **{'Číslo obce': '2', 'Strana Y': 0})
+    tabulka.pridej(prvni)
+    tabulka.pridej(druhy)
+    # Strana, která v obci nekandidovala, v řádku chybí
+    assert list(tabulka) == [prvni, druhy]
+
+    treti = dict(druhy, **{'Strana X': 1, 'Strana Y': 4})
+    tabulka.nahrad(1, treti)
+    assert tabulka[1] == treti
+
+
+def test_tabulka_roste_s_poctem_obci(karvina):
+    # Tabulka řádky zhušťuje, paměť ale neomezuje
+    mala = main.TabulkaVysledku(karvina)
+    velka = main.TabulkaVysledku(karvina * 10)
+    assert len(velka.hlasy) == 10 * len(mala.hlasy)
+
+
+def test_statistiky_se_stranou_bez_obce(karvina):
+    pytest.importorskip('numpy')
+    registr = main.RegistrStran()
+    tabulka = main.TabulkaVysledku(registr=registr)
+    for radek in karvina:
+        for strana in radek:
+            if strana not in main.POPISNE_SLOUPCE:
+                registr.zaregistruj(strana)
+        tabulka.pridej(radek)
+    # Strana zaregistrovaná po posledním řádku (např. obec,
+    # jejíž data se ještě nepřidala) rozměry matice nerozbije
+    registr.zaregistruj('Nová strana', 99)
+    statistiky = tabulka.statistiky()
+    assert len(statistiky['strany']) == len(registr)
+    nova = statistiky['strany'][-1]
+    assert nova == {
+        'nazev': 'Nová strana', 'cislo': 99, 'hlasy': 0,
+        'podil': 0.0, 'obce': 0
+    }
+    assert statistiky['platne_hlasy'] == sum(
+        strana['hlasy'] for strana in statistiky['strany']
+    )
@@ -0,0 +1,52 @@
+"""Zpracování celých voleb z přehledu okresů (ps3)."""
+
+import json
+
+import pytest
+
+from benchmark.server import SADY, ReplayServer
+from benchmark.stranky import url_okresu, stranky_voleb
+
+OKRESU, OBCI = 3, 5
+
+
+@pytest.fixture
+def volby():
+    """Přehrávací server se syntetickými volbami o třech okresech."""
+    with ReplayServer(stranky_voleb(OKRESU, OBCI)) as server:
+        yield server
+
+
+def test_vsechny_okresy(spust, volby, tmp_path):
+    soubor = tmp_path / 'volby.json'
+    assert spust(volby.url(SADY['kraj'][1]), soubor, '--workers', 4) == 0
+    radky = json.loads(soubor.read_text(encoding='utf-8'))
+    assert len(radky) == OKRESU * OBCI
+    assert [radek['Okres'] for radek in radky[::OBCI]] == [
+        f'Okres {o + 1}' for o in range(OKRESU)
+    ]
+
+
+def test_chybny_okres_se_preskoci(spust, volby, tmp_path, statistiky):
+    soubor = tmp_path / 'volby.json'
+    stranka = '/volby.cz/pls/ps2017nss/' + url_okresu(2, '8001')
+    puvodni = volby.stranky.pop(stranka)
+
+    assert spust(volby.url(SADY['kraj'][1]), soubor, '--workers', 4) == 1
+    radky = json.loads(soubor.read_text(encoding='utf-8'))
+    assert len(radky) == (OKRESU - 1) * OBCI
+    assert 'Okres 2' not in {radek['Okres'] for radek in radky}
+    assert statistiky['chyby'] == 1
+    assert (tmp_path / 'volby.json.zurnal').exists()
+
+    # Pokračování doplní přeskočený okres
+    volby.stranky[stranka] = puvodni
+    assert spust(
+        volby.url(SADY['kraj'][1]), soubor, '--workers', 4, '--resume'
+    ) == 0
+    assert statistiky['chyby'] == 0
+    assert statistiky['obce_ze_zurnalu'] == (OKRESU - 1) * OBCI
+    assert len(json.loads(soubor.read_text(encoding='utf-8'))) == (
+        OKRESU * OBCI
+    )
+    assert not (tmp_path / 'volby.json.zurnal').exists()
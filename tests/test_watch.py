@@ -0,0 +1,50 @@
+"""Sledování změn výsledků během sčítání ('--watch')."""
+
+import json
+
+import main
+from benchmark.server import SADY, ReplayServer
+from benchmark.stranky import (
+    KARVINA_KRAJ, KARVINA_NUTS, stranka_obce, url_obce
+)
+
+
+def test_cyklus_zapise_jen_zmenu(stranky, tmp_path, karvina, monkeypatch):
+    soubor = tmp_path / 'vysledky.json'
+    obec = dict(karvina[0], **{'ANO 2011': karvina[0]['ANO 2011'] + 10})
+    with ReplayServer(stranky, etag=True) as server:
+        def zmen_stranku(_):
+            # Mezi cykly se změní výsledky první obce
+            server.stranky[
+                '/volby.cz/pls/ps2017nss/' + url_obce(
+                    obec['Číslo obce'], KARVINA_KRAJ, KARVINA_NUTS
+                )
+            ] = stranka_obce(obec)
+
+        monkeypatch.setattr(main.time, 'sleep', zmen_stranku)
+        vysledky, stats = main.sleduj_volby(
+            server.url(SADY['karvina'][1]), str(soubor), 0,
+            workers=4, max_cyklu=2
+        )
+        nezmeneno = server.nezmeneno
+
+    assert stats['sledovani_cyklu'] == 2 and stats['chyby'] == 0
+    # Druhý cyklus ověřil stránky podmíněně, změnila se jedna obec
+    assert nezmeneno == len(karvina) - 1
+    assert stats['sledovani_zmen'] == 1
+    assert json.loads(soubor.read_text(encoding='utf-8')) == (
+        [obec] + karvina[1:]
+    )
+    cykly = [
+        json.loads(radek) for radek in (
+            tmp_path / 'vysledky.json.zmeny.jsonl'
+        ).read_text(encoding='utf-8').splitlines()
+    ]
+    assert [cyklus['zmenene_stranky'] for cyklus in cykly] == [
+        len(karvina), 1
+    ]
+    assert cykly[1]['zmeny'] == [{
+        'Číslo obce': obec['Číslo obce'],
+        'Název obce': obec['Název obce'],
+        'zmeny': {'ANO 2011': [karvina[0]['ANO 2011'], obec['ANO 2011']]}
+    }]
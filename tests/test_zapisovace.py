@@ -0,0 +1,112 @@
+"""Průběžné zapisovače výsledků ('ZapisovacVysledku')."""
+
+import gzip
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+import main
+
+KOREN = Path(__file__).resolve().parent.parent
+
+
+def test_jsonl_zapisuje_primo_do_ciloveho_souboru(tmp_path, karvina):
+    soubor = tmp_path / 'vysledky.jsonl'
+    with main.JsonlZapisovac(str(soubor)) as zapisovac:
+        zapisovac.zapis(karvina[0])
+        # Zapsaný řádek je v cílovém souboru hned, bez '.part'
+        assert soubor.read_text(encoding='utf-8').count('\n') == 1
+        assert not (tmp_path / 'vysledky.jsonl.part').exists()
+        for radek in karvina[1:]:
+            zapisovac.zapis(radek)
+    radky = soubor.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(radek) for radek in radky] == karvina
+
+
+def test_komprimovany_jsonl_pres_part(tmp_path, karvina):
+    soubor = tmp_path / 'vysledky.jsonl.gz'
+    with main.JsonlZapisovac(str(soubor)) as zapisovac:
+        zapisovac.zapis(karvina[0])
+        assert (tmp_path / 'vysledky.jsonl.gz.part').exists()
+        assert not soubor.exists()
+    with gzip.open(soubor, 'rt', encoding='utf-8') as f:
+        assert [json.loads(radek) for radek in f] == karvina[:1]
+    assert not (tmp_path / 'vysledky.jsonl.gz.part').exists()
+
+
+@pytest.mark.parametrize('pripona', ['json', 'xml'])
+def test_vystup_odpovida_ukazce(spust, url_okresu, tmp_path, pripona):
+    # Ukázkové soubory v kořeni repozitáře odpovídají aktuálnímu zápisu
+    soubor = tmp_path / f'karvina.{pripona}'
+    assert spust(url_okresu, soubor) == 0
+    assert soubor.read_bytes() == (KOREN / f'karvina.{pripona}').read_bytes()
+
+
+@pytest.mark.parametrize('pripona', ['parquet', 'arrow'])
+def test_sloupcove_formaty(spust, url_okresu, tmp_path, karvina, pripona):
+    pa = pytest.importorskip('pyarrow')
+    soubor = tmp_path / f'vysledky.{pripona}'
+    assert spust(url_okresu, soubor) == 0
+    if pripona == 'parquet':
+        tabulka = pytest.importorskip('pyarrow.parquet').read_table(soubor)
+    else:
+        with pa.ipc.open_file(soubor) as ctenar:
+            tabulka = ctenar.read_all()
+    assert tabulka.column_names == list(karvina[0])
+    # Číslo obce je ve sloupcových formátech celé číslo
+    radky = [
+        dict(radek, **{'Číslo obce': str(radek['Číslo obce'])})
+        for radek in tabulka.to_pylist()
+    ]
+    assert radky == karvina
+
+
+def radky_z_databaze(soubor) -> list:
+    """Sestaví výstupní řádky z normalizovaných tabulek SQLite."""
+    with closing(sqlite3.connect(soubor)) as db:
+        obce = db.execute(
+            'SELECT id, cislo_obce, nazev, volici, vydane_obalky,'
+            ' platne_hlasy FROM obce ORDER BY id'
+        ).fetchall()
+        hlasy = db.execute(
+            'SELECT h.obec_id, s.nazev, h.hlasy FROM hlasy h'
+            ' JOIN strany s ON s.id = h.strana_id ORDER BY s.cislo'
+        ).fetchall()
+    radky = {
+        id_obce: {
+            'Číslo obce': str(cislo), 'Název obce': nazev, 'Voliči': volici,
+            'Vydané obálky': obalky, 'Platné hlasy': platne
+        }
+        for id_obce, cislo, nazev, volici, obalky, platne in obce
+    }
+    for id_obce, strana, pocet in hlasy:
+        radky[id_obce][strana] = pocet
+    return list(radky.values())
+
+
+def test_sqlite(spust, url_okresu, tmp_path, karvina):
+    soubor = tmp_path / 'vysledky.db'
+    assert spust(url_okresu, soubor) == 0
+    assert radky_z_databaze(soubor) == karvina
+    # Opakovaný běh obce téhož okresu nahradí, nezdvojí
+    assert spust(url_okresu, soubor) == 0
+    assert radky_z_databaze(soubor) == karvina
+
+
+@pytest.mark.parametrize('pripona', ['csv', 'json', 'jsonl', 'xml'])
+@pytest.mark.parametrize('komprese', ['gz', 'zst'])
+def test_komprese(spust, url_okresu, tmp_path, pripona, komprese):
+    if komprese == 'zst':
+        zstandard = pytest.importorskip('zstandard')
+        rozbal = zstandard.ZstdDecompressor().decompressobj().decompress
+    else:
+        rozbal = gzip.decompress
+    soubor = tmp_path / f'vysledky.{pripona}'
+    komprimovany = tmp_path / f'vysledky.{pripona}.{komprese}'
+    assert spust(url_okresu, soubor) == 0
+    assert spust(url_okresu, komprimovany) == 0
+    # Po rozbalení stejný obsah jako nekomprimovaný výstup
+    assert rozbal(komprimovany.read_bytes()) == soubor.read_bytes()